@@ -24,30 +24,18 @@ from PyQt6.QtWidgets import (
     QInputDialog,
     QScrollArea
 )
-# Import FigureCanvasQTAgg for embedding Matplotlib figures into PyQt6 applications
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-# Import Figure class from Matplotlib for creating plots
-from matplotlib.figure import Figure
-# Import Qt core for alignment and flags
-from PyQt6.QtCore import Qt
 # Import LoginMenu for the login screen
 from login_menu import LoginMenu
-# Import RouletteGame for the roulette game GUI
-from roulette import RouletteGame
-# Import Craps for the craps game GUI
-from craps import Craps
-# Import Blackjack for the blackjack game (Tkinter GUI)
-from blackjack import Blackjack
-# Import HighLowGame for the High/Low game
-from highlow import HighLowGame
-# Import SlotsGame for the Slots game
-from slots import SlotsGame
-# Import Poker for the Poker game
-from poker import Poker 
+# Import the game registry; each game module is imported when its button is first clicked
+from game_registry import game_class
 # Import the CasinoAdminPanel
 from casino_admin import CasinoAdminPanel
 # --- ADDED CODE: Import the stats update function ---
 from update_stats import update_player_stats
+# Import the session reload, run after the stats update rewrites the balance
+from session import refresh_session
+# Import the schema migrator, run once before any window opens
+from migrations import run_migrations
 
 
 # Define the database path
@@ -92,19 +80,19 @@ class AdminMainMenu(QWidget):
 # Define the MainMenu class inheriting from QWidget
 class MainMenu(QWidget):
     # Constructor for MainMenu
-    def __init__(self, player_id):
+    def __init__(self, session):
         # Initialize QWidget parent class
         super().__init__()
         # Set window title
         self.setWindowTitle("Casino Menu")
         # Set window size and position
         self.setGeometry(300, 300, 300, 250)
+        # Store the player's session, which every game is given
+        self.session = session
         # Store player ID
-        self.player_id = player_id
-
-        # Fetch the player's full name based on player_id
-        self.full_name = self.fetch_player_name(player_id)
-
+        self.player_id = session.player_id
+        # Store the player's full name
+        self.full_name = session.full_name
 
         # Create a vertical layout for the main menu
         layout = QVBoxLayout()
@@ -187,6 +175,8 @@ class MainMenu(QWidget):
         print("Returning to Main Menu. Refreshing player statistics...")
         # Call the update function from update_stats.py
         update_player_stats()
+        # update_player_stats rewrites PLAYERS.balance, so reload the session the games work from
+        refresh_session(self.session)
         print("Statistics refreshed. Displaying Main Menu.")
         print("---")
         # Call the original QWidget.show() method to make the window visible
@@ -225,23 +215,10 @@ class MainMenu(QWidget):
         msg_box.setText(rules_text)
         msg_box.show()
 
-    # Method to fetch the player's full name from the database
-    def fetch_player_name(self, player_id):
-        try:
-            with sqlite3.connect(DB_PATH) as conn:
-                conn.execute("PRAGMA journal_mode=WAL")
-                cur = conn.cursor()
-                cur.execute("SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?", (player_id,))
-                result = cur.fetchone()
-                return result[0] if result else str(player_id)
-        except Exception as e:
-            print(f"Error fetching player name: {e}")
-            return str(player_id)
-
     # Method to launch the Roulette game
     def launch_roulette(self):
-        # Create an instance of the RouletteGame, passing player ID and self (MainMenu) as parent
-        self.game_window = RouletteGame(self.player_id, self)
+        # Create an instance of the RouletteGame, passing the player's session and self (MainMenu) as parent
+        self.game_window = game_class("roulette")(self.session, self)
         # Show the roulette game window
         self.game_window.show()
         # Hide the current MainMenu window
@@ -249,8 +226,8 @@ class MainMenu(QWidget):
 
     # Method to launch the Craps game
     def launch_craps(self):
-        # Create an instance of the Craps game, passing player ID and self (MainMenu) as parent
-        self.game_window = Craps(self.player_id, self)
+        # Create an instance of the Craps game, passing the player's session and self (MainMenu) as parent
+        self.game_window = game_class("craps")(self.session, self)
         # Show the craps game window
         self.game_window.show()
         # Hide the current MainMenu window
@@ -260,29 +237,29 @@ class MainMenu(QWidget):
     def launch_blackjack(self):
         # Hide the MainMenu BEFORE launching Blackjack to prevent display issues
         self.hide()
-        # Create an instance of the Blackjack game, passing player ID and self (MainMenu) as parent
-        self.blackjack_game = Blackjack(self.player_id, self) # Keep reference to the game instance
+        # Create an instance of the Blackjack game, passing the player's session and self (MainMenu) as parent
+        self.blackjack_game = game_class("blackjack")(self.session, self) # Keep reference to the game instance
 
     # Method to launch the High/Low game
     def launch_highlow(self):
         # Hide the MainMenu BEFORE launching High/Low
         self.hide()
-        # Create an instance of the HighLowGame, passing player ID and self (MainMenu) as parent
-        self.highlow_game = HighLowGame(self.player_id, self) # Keep reference to the game instance
+        # Create an instance of the HighLowGame, passing the player's session and self (MainMenu) as parent
+        self.highlow_game = game_class("highlow")(self.session, self) # Keep reference to the game instance
 
     # Method to launch the Slots game
     def launch_slots(self):
         # Hide the MainMenu BEFORE launching Slots
         self.hide()
-        # Create an instance of the SlotsGame, passing player ID and self (MainMenu) as parent
-        self.slots_game = SlotsGame(self.player_id, self) # Keep reference to the game instance
+        # Create an instance of the SlotsGame, passing the player's session and self (MainMenu) as parent
+        self.slots_game = game_class("slots")(self.session, self) # Keep reference to the game instance
 
     # Method to launch the Poker game
     def launch_poker(self):
         # Hide the MainMenu BEFORE launching Poker
         self.hide()
-        # Create an instance of the Poker game, passing player ID and self (MainMenu) as parent
-        self.poker_game = Poker(self.player_id, self) # Keep reference to the game instance
+        # Create an instance of the Poker game, passing the player's session and self (MainMenu) as parent
+        self.poker_game = game_class("poker")(self.session, self) # Keep reference to the game instance
         self.poker_game.show() # Show the Poker game window
 
     # Method to handle cashing out when exiting the casino
@@ -329,6 +306,7 @@ class MainMenu(QWidget):
             
             # Update the player's balance in the PLAYERS table
             cur.execute("UPDATE PLAYERS SET balance=? WHERE ID=?", (new_balance, self.player_id))
+            self.session.balance = new_balance
             
             # Update the total_cashout in the CASINO table
             cur.execute("UPDATE CASINO SET total_cashout = total_cashout + ? WHERE id = ?", (cashout_amt, CASINO_ID))
@@ -346,129 +324,48 @@ class MainMenu(QWidget):
 
     # Method to plot total net winnings across all games for the logged-in player
     def plot_total_net_winnings(self):
-        # Connect to the SQLite database
-        conn = sqlite3.connect(DB_PATH)
-        # Create a cursor object
-        cur = conn.cursor()
-
-        # Get the player's full name for querying game tables
+        # Get the player's full name for the window titles
         player_name = self.full_name
+        # Imported here so numpy and matplotlib load only when a graph is requested
+        from net_winnings import NET_EXPRESSIONS
+        from net_winnings_window import NetWinningsWindow
 
-        # List of game tables to query for winnings data
-        game_tables = ["Blackjack", "Craps", "HighLow", "Poker", "Roulette", "Slots"]
-
-        # Initialize a list to store all individual session net winnings
-        all_session_data = []
-
-        # Iterate through each game table
-        for game_table in game_tables:
-            try:
-                # Query for session_number, money_won, and bet_amount for the current player
-                cur.execute(f"""
-                    SELECT session_number, money_won, bet_amount FROM {game_table}
-                    WHERE player_name=?
-                """, (player_name,))
-                rows = cur.fetchall()
-
-                # Collect session data, ensuring session number is valid
-                for session_num, money_won, bet_amount in rows:
-                    if session_num is not None:
-                        # Handle inconsistent money_won column
-                        if game_table in ["Slots", "HighLow"]:
-                            net_for_session = money_won - bet_amount
-                        else:
-                            net_for_session = money_won
-                        all_session_data.append((int(session_num), net_for_session))
-            except sqlite3.OperationalError:
-                # If a table doesn't exist, skip it
-                print(f"Table {game_table} not found or accessible. Skipping.")
-                continue
-            except Exception as e:
-                print(f"Error fetching data from {game_table}: {e}")
-                continue
-
-        # Close the database connection
-        conn.close()
+        try:
+            # Graph of every session of every game, following new sessions live
+            self.graph_window = NetWinningsWindow(
+                f"Total Net Winnings - {player_name}", f"Cumulative Net Winnings Across All Games for {player_name}",
+                self.player_id, list(NET_EXPRESSIONS.items()), color='blue',
+                xlabel="Session Number (across all games)", sequential=True,
+                total_text="Overall Net Winnings", size=(800, 500))
+        except sqlite3.Error as e:
+            print(f"Error fetching winnings data: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to load winnings history: {e}")
+            return
 
         # If no winnings data is available across all games for the player
-        if not all_session_data:
+        if not self.graph_window.has_data():
             QMessageBox.information(self, "No Data", "No total winnings history available for this player across all games.")
             return
 
-        # Sort all session data by session number to maintain the correct order for the plot
-        all_session_data.sort(key=lambda x: x[0])
-
-        # Extract sorted session numbers and net winnings
-        sorted_session_numbers = [item[0] for item in all_session_data]
-        sorted_net_winnings = [item[1] for item in all_session_data]
-
-        # Calculate cumulative net winnings
-        cumulative_winnings = []
-        current_sum = 0.0
-        for net_value in sorted_net_winnings:
-            current_sum += net_value
-            cumulative_winnings.append(current_sum)
-
-        # Generate session numbers for plotting (simple sequential numbers for the cumulative plot)
-        plot_session_numbers = list(range(1, len(cumulative_winnings) + 1))
-
-        # Create a new QWidget for the graph window
-        self.graph_window = QWidget()
-        self.graph_window.setWindowTitle(f"Total Net Winnings - {player_name}")
-        self.graph_window.setGeometry(150, 150, 800, 500)
-
-        # Create vertical layout for the graph window
-        layout = QVBoxLayout()
-        self.graph_window.setLayout(layout)
-
-        # Create a Matplotlib figure
-        fig = Figure(figsize=(8, 6))
-        canvas = FigureCanvas(fig)
-        ax = fig.add_subplot(111)
-
-        # Plot the cumulative net winnings
-        ax.plot(plot_session_numbers, cumulative_winnings, marker='o', linestyle='-', color='blue')
-        ax.set_title(f"Cumulative Net Winnings Across All Games for {player_name}")
-        ax.set_xlabel("Session Number (across all games)")
-        ax.set_ylabel("Net Winnings ($)")
-        ax.grid(True)
-        
-        # Set x-axis ticks to show all session numbers if not too many
-        if len(plot_session_numbers) <= 20:
-            ax.set_xticks(plot_session_numbers)
-        else:
-            step = max(1, len(plot_session_numbers) // 10)
-            ax.set_xticks(plot_session_numbers[::step])
-
-
-        # Create label for total net winnings (final value of the cumulative sum)
-        total_label = QLabel(f"Overall Net Winnings: ${cumulative_winnings[-1]:.2f}")
-        total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        total_label.setStyleSheet("font-size: 18px; font-weight: bold; margin-top: 10px;")
-
-        # Add canvas and label to layout
-        layout.addWidget(canvas)
-        layout.addWidget(total_label)
-
-        # Ensure widget is deleted when closed to free up resources
-        self.graph_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         # Show the graph window
         self.graph_window.show()
 
 # Define the DepositWindow class inheriting from QWidget
 class DepositWindow(QWidget):
     # Constructor for DepositWindow
-    def __init__(self, player_id, full_name):
+    def __init__(self, session):
         # Initialize QWidget parent class
         super().__init__()
         # Set the window title
         self.setWindowTitle("Deposit")
         # Set the window size and position
         self.setGeometry(300, 300, 350, 250)
+        # Store the player's session
+        self.session = session
         # Store the player ID
-        self.player_id = player_id
+        self.player_id = session.player_id
         # Store the player's full name
-        self.full_name = full_name
+        self.full_name = session.full_name
 
         # Create a vertical layout
         self.layout = QVBoxLayout()
@@ -529,6 +426,8 @@ class DepositWindow(QWidget):
             conn.commit()
             # Close the database connection
             conn.close()
+            # Keep the session's balance in step with the database
+            self.session.balance += amount
             # Enable the start button after successful deposit
             self.start_button.setEnabled(True)
             QMessageBox.information(self, "Success", f"${amount:.2f} has been added to your balance.")
@@ -544,7 +443,7 @@ class DepositWindow(QWidget):
     # Method to navigate to the main menu
     def go_to_main_menu(self):
         # Create an instance of the MainMenu
-        self.main_menu = MainMenu(self.player_id)
+        self.main_menu = MainMenu(self.session)
         # Show the main menu window
         self.main_menu.show()
         # Close the current DepositWindow
@@ -552,6 +451,8 @@ class DepositWindow(QWidget):
 
 # Only launch the application if the script is run directly (not imported as a module)
 if __name__ == "__main__":
+    # Bring the database schema up to date before anything touches it
+    run_migrations()
     # Create a QApplication instance
     app = QApplication(sys.argv)
     # Create an instance of the LoginMenu
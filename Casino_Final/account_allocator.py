@@ -0,0 +1,116 @@
+# account_allocator.py
+
+"""
+Player ID and password allocation.
+
+New accounts used to draw random 4-digit IDs and passwords and retry until a
+SELECT found no match, which slows down as the space fills and never ends once
+it is full. Here each kind of value has a sequence row in ACCOUNT_SEQUENCES:
+a counter and a random 16-byte key. The n-th value handed out is
+
+    base + P(n)
+
+where P is a keyed permutation of [0, size): a four-round Feistel network over
+the smallest even number of bits that covers the space, with cycle walking to
+stay inside it. A permutation never repeats, so every value is unique without
+looking anything up; the key keeps values from being guessable from each other.
+Allocation is O(1) per value: one UPDATE of the counter (which also takes the
+write lock, so concurrent allocations cannot overlap) plus the arithmetic.
+
+The sequences are created by migration 6: IDs and passwords are 8 digits,
+90 million of each, well clear of the old 4-digit accounts and the admin
+login. create_accounts() provisions any number of players in the caller's
+transaction.
+"""
+
+# Feistel rounds per permutation (each takes 4 bytes of the sequence key)
+ROUNDS = 4
+
+
+class KeyedPermutation:
+    """A keyed bijection of [0, size) onto itself."""
+    def __init__(self, key, size):
+        self.size = size
+        # Smallest even bit width covering the space, split into two halves
+        bits = max(2, (size - 1).bit_length())
+        self.half = (bits + 1) // 2
+        self.round_keys = [int.from_bytes(key[4 * i:4 * i + 4], "little") for i in range(ROUNDS)]
+
+    def apply(self, values):
+        """Returns P(value) for an array of values in [0, size), as a uint64 numpy array."""
+        # numpy is imported with the first allocation, not at startup
+        import numpy as np
+        out = self._encrypt(np, np.asarray(values, dtype=np.uint64))
+        # Cycle walking: re-encrypt anything that landed outside the space
+        outside = out >= self.size
+        while outside.any():
+            out[outside] = self._encrypt(np, out[outside])
+            outside = out >= self.size
+        return out
+
+    def _encrypt(self, np, x):
+        half = np.uint64(self.half)
+        mask = np.uint64((1 << self.half) - 1)
+        left, right = x >> half, x & mask
+        for round_key in self.round_keys:
+            left, right = right, left ^ (self._mix(np, right, round_key) & mask)
+        return (left << half) | right
+
+    @staticmethod
+    def _mix(np, value, round_key):
+        """Keyed 32-bit integer hash used as the Feistel round function."""
+        word = np.uint64(0xFFFFFFFF)
+        value = (value ^ np.uint64(round_key)) & word
+        value = (value * np.uint64(0x9E3779B1)) & word
+        value ^= value >> np.uint64(16)
+        value = (value * np.uint64(0x85EBCA6B)) & word
+        value ^= value >> np.uint64(13)
+        return value
+
+
+def allocate(cur, sequence, count=1):
+    """
+    Hands out the next `count` values of a sequence as a list of ints. Runs in
+    the caller's transaction; the caller commits. Raises ValueError when the
+    sequence does not have `count` values left.
+    """
+    if count <= 0:
+        return []
+    updated = cur.execute("""
+        UPDATE ACCOUNT_SEQUENCES SET next_value = next_value + ?
+        WHERE name = ? AND next_value + ? <= size
+    """, (count, sequence, count))
+    if updated.rowcount == 0:
+        raise ValueError(f"The {sequence} sequence cannot hand out {count} more values")
+    base, size, next_value, key = cur.execute(
+        "SELECT base, size, next_value, key FROM ACCOUNT_SEQUENCES WHERE name = ?", (sequence,)).fetchone()
+    import numpy as np
+    values = KeyedPermutation(key, size).apply(np.arange(next_value - count, next_value, dtype=np.uint64))
+    return [base + int(value) for value in values]
+
+
+def create_accounts(cur, names, balance=0.0):
+    """
+    Creates a PLAYERS row and a Login row for every (first name, last name) or
+    (first name, last name, starting balance) in names; players without their
+    own balance start with `balance`. The starting balance counts as the first
+    deposit. Returns [(player ID, password)] in the same order. Runs in the
+    caller's transaction, so thousands of accounts can be committed at once.
+    """
+    names = list(names)
+    ids = allocate(cur, "player_id", len(names))
+    passwords = allocate(cur, "password", len(names))
+    rows = []
+    for player_id, player in zip(ids, names):
+        start = player[2] if len(player) > 2 else balance
+        rows.append((player_id, start, player[0], player[1], start))
+    cur.executemany("""
+        INSERT INTO PLAYERS (ID, balance, first_name, last_name, total_deposit) VALUES (?, ?, ?, ?, ?)
+    """, rows)
+    cur.executemany("INSERT INTO Login (ID, Password) VALUES (?, ?)", list(zip(ids, passwords)))
+    return list(zip(ids, passwords))
+
+
+def create_account(cur, first_name, last_name):
+    """Creates one account and returns its (player ID, password)."""
+    return create_accounts(cur, [(first_name, last_name)])[0]
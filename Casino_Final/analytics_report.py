@@ -0,0 +1,192 @@
+# analytics_report.py
+
+"""
+Per-game and per-player hold / RTP report streamed from the ROUNDS journal.
+
+The journal is read in id order with fetchmany, so memory stays constant in
+the number of rounds (only one accumulator per game, per player and per open
+session is kept). For every game, and optionally every player in every game,
+the report gives:
+
+    handle, payouts     money staked and returned
+    hold_pct, rtp_pct   (handle - payouts) / handle and payouts / handle
+    round_net_std       volatility: standard deviation of a round's net result
+    session_net_std     standard deviation of a session's net result
+    sessions, session_rounds_mean and a histogram of rounds per session
+
+High/Low pays its pot out on cash-out rather than on the winning guess, so its
+per-round volatility is understated; its session figures are the ones to use.
+
+Example:
+    python analytics_report.py --format json --out report.json
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+
+# Import the Welford accumulator
+from running_stats import RunningStats
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Rows fetched from SQLite per chunk
+DEFAULT_CHUNK = 10000
+# Upper edges of the rounds-per-session histogram (the last bin is open-ended)
+SESSION_BINS = (1, 5, 10, 25, 50, 100, 250, 500)
+SESSION_BIN_LABELS = [
+    f"{low + 1}-{high}" if high > low + 1 else str(high)
+    for low, high in zip((0,) + SESSION_BINS, SESSION_BINS)
+] + [f"{SESSION_BINS[-1] + 1}+"]
+
+
+def session_bin(rounds):
+    """Returns the histogram bin of a session with `rounds` rounds."""
+    for index, high in enumerate(SESSION_BINS):
+        if rounds <= high:
+            return index
+    return len(SESSION_BINS)
+
+
+class ScopeTotals:
+    """Streaming totals of one game or one player in one game."""
+    __slots__ = ("handle", "payouts", "round_net", "session_rounds", "session_net", "histogram")
+
+    def __init__(self):
+        self.handle = 0.0
+        self.payouts = 0.0
+        self.round_net = RunningStats()
+        self.session_rounds = RunningStats()
+        self.session_net = RunningStats()
+        self.histogram = [0] * (len(SESSION_BINS) + 1)
+
+    def add_round(self, bet, payout, won):
+        self.handle += bet
+        self.payouts += payout
+        # Cash-outs only pay a pot out; they are not a round of their own
+        if won is not None:
+            self.round_net.update(payout - bet)
+
+    def add_session(self, rounds, net):
+        self.session_rounds.update(rounds)
+        self.session_net.update(net)
+        self.histogram[session_bin(rounds)] += 1
+
+    def row(self):
+        """Returns the report columns of this scope."""
+        handle = self.handle
+        return {
+            "rounds": self.round_net.n,
+            "handle": round(handle, 2),
+            "payouts": round(self.payouts, 2),
+            "hold_pct": round((handle - self.payouts) / handle * 100, 3) if handle else None,
+            "rtp_pct": round(self.payouts / handle * 100, 3) if handle else None,
+            "round_net_mean": round(self.round_net.mean, 4),
+            "round_net_std": round(self.round_net.std, 4),
+            "sessions": self.session_rounds.n,
+            "session_rounds_mean": round(self.session_rounds.mean, 2),
+            "session_net_std": round(self.session_net.std, 2),
+            **{f"sessions_{label}": count for label, count in zip(SESSION_BIN_LABELS, self.histogram)},
+        }
+
+
+def stream_report(db_path=DB_PATH, chunk=DEFAULT_CHUNK, per_player=True):
+    """
+    Reads the whole journal once and returns (game totals, player totals, player names),
+    where game totals are keyed by game and player totals by (game, player_id).
+    """
+    games = {}
+    players = {}
+    names = {}
+    # (game, player_id) -> [session number, rounds, net] of the session being read
+    open_sessions = {}
+
+    def close_session(key, state):
+        _, rounds, net = state
+        games[key[0]].add_session(rounds, net)
+        if per_player:
+            players[key].add_session(rounds, net)
+
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cur = conn.execute("""
+            SELECT game, player_id, player_name, session_number, bet, payout, won
+            FROM ROUNDS
+            ORDER BY id
+        """)
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            for game, player_id, player_name, session_number, bet, payout, won in rows:
+                key = (game, player_id)
+                totals = games.get(game)
+                if totals is None:
+                    totals = games[game] = ScopeTotals()
+                totals.add_round(bet, payout, won)
+                if per_player:
+                    player = players.get(key)
+                    if player is None:
+                        player = players[key] = ScopeTotals()
+                    player.add_round(bet, payout, won)
+                    if player_name:
+                        names[player_id] = player_name
+
+                # A new session number closes the player's previous session in this game
+                state = open_sessions.get(key)
+                if state is None or state[0] != session_number:
+                    if state is not None:
+                        close_session(key, state)
+                    state = open_sessions[key] = [session_number, 0, 0.0]
+                if won is not None:
+                    state[1] += 1
+                state[2] += payout - bet
+    finally:
+        conn.close()
+
+    for key, state in open_sessions.items():
+        close_session(key, state)
+    return games, players, names
+
+
+def report_rows(games, players, names):
+    """Flattens the totals into report rows, games first."""
+    rows = []
+    for game in sorted(games):
+        rows.append({"scope": "game", "game": game, "player_id": None, "player_name": None, **games[game].row()})
+    for game, player_id in sorted(players, key=lambda key: (key[0], key[1] if key[1] is not None else -1)):
+        rows.append({"scope": "player", "game": game, "player_id": player_id,
+                     "player_name": names.get(player_id), **players[(game, player_id)].row()})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream per-game and per-player hold/RTP analytics from the rounds journal.")
+    parser.add_argument("--db", default=DB_PATH, help="Database to read (default CasinoDB.db)")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv", help="Output format")
+    parser.add_argument("--out", default=None, help="Output file (default stdout)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Rows fetched per chunk")
+    parser.add_argument("--games-only", action="store_true", help="Skip the per-player rows")
+    args = parser.parse_args()
+
+    games, players, names = stream_report(args.db, args.chunk, not args.games_only)
+    rows = report_rows(games, players, names)
+
+    out = open(args.out, "w", newline="", encoding="utf-8") if args.out else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(rows, out, indent=2)
+            out.write("\n")
+        elif rows:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
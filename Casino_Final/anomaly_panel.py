@@ -0,0 +1,190 @@
+# anomaly_panel.py
+
+"""
+Live anomaly panel for the casino admin.
+
+Polls the ROUNDS journal (see round_journal.py) on a timer through an
+AnomalyTracker (see anomaly_tracker.py), which keeps rolling win-rate
+statistics per game, per player and per session over one open connection and
+only reads rows newer than the last id seen. After each poll only the game rows
+whose statistics changed are rewritten, and the flagged sessions table is only
+redrawn when a flag or a flagged session's numbers changed.
+
+A session is highlighted when its recent win count deviates from the game's
+honest win probability (cheat_detector.GAME_WIN_PROBABILITY) by more than the
+chosen z-score in either direction: an unusually lucky session may be a cheat,
+an unusually unlucky one may be a broken game.
+"""
+
+import sqlite3
+import sys
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
+    QTableWidget, QTableWidgetItem, QDoubleSpinBox, QSpinBox, QHeaderView
+)
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QColor
+# Import the honest win probability of each game
+from cheat_detector import GAME_WIN_PROBABILITY
+# Import the rolling statistics tracker
+from anomaly_tracker import (
+    AnomalyTracker, DEFAULT_Z_THRESHOLD, DEFAULT_MIN_ROUNDS, POLL_BATCH, GAME_WINDOW, SESSION_WINDOW
+)
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# How often the journal is polled, in milliseconds
+POLL_INTERVAL_MS = 2000
+
+
+class AnomalyPanel(QWidget):
+    """
+    Shows per-game win statistics and the sessions whose win rate is out of line
+    with the game's theoretical win rate, updated as rounds are committed.
+    """
+    def __init__(self, db_path=DB_PATH):
+        super().__init__()
+        self.setWindowTitle("Live Anomalies")
+        self.setGeometry(450, 150, 760, 560)
+        self.db_path = db_path
+
+        # Rolling statistics and flagged sessions
+        self.tracker = AnomalyTracker()
+        # Game -> its row in the game table
+        self.game_rows = {}
+        # One connection for every poll
+        self.conn = None
+
+        self.setup_ui()
+        try:
+            self.conn = sqlite3.connect(self.db_path)
+            self.tracker.warm_up(self.conn)
+        except sqlite3.Error as e:
+            print(f"Anomaly panel could not read ROUNDS: {e}")
+        self.poll()
+
+        # Poll the journal for newly committed rounds
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.timer.start(POLL_INTERVAL_MS)
+
+    def setup_ui(self):
+        """Builds the threshold controls and the two tables."""
+        layout = QVBoxLayout()
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Highlight |z| above:"))
+        self.z_input = QDoubleSpinBox()
+        self.z_input.setRange(1.0, 10.0)
+        self.z_input.setSingleStep(0.5)
+        self.z_input.setValue(DEFAULT_Z_THRESHOLD)
+        self.z_input.valueChanged.connect(self.thresholds_changed)
+        controls.addWidget(self.z_input)
+        controls.addWidget(QLabel("Min rounds:"))
+        self.min_rounds_input = QSpinBox()
+        self.min_rounds_input.setRange(1, SESSION_WINDOW)
+        self.min_rounds_input.setValue(DEFAULT_MIN_ROUNDS)
+        self.min_rounds_input.valueChanged.connect(self.thresholds_changed)
+        controls.addWidget(self.min_rounds_input)
+        controls.addStretch()
+        self.status_label = QLabel("")
+        controls.addWidget(self.status_label)
+        layout.addLayout(controls)
+
+        # Per-game summary over each game's last GAME_WINDOW rounds
+        layout.addWidget(QLabel(f"<b>Games</b> (rates over the last {GAME_WINDOW} rounds)"))
+        self.game_table = QTableWidget(0, 6)
+        self.game_table.setHorizontalHeaderLabels(["Game", "Rounds", "Win Rate", "Expected", "Net/Round", "Net Std"])
+        self.game_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.game_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.game_table)
+
+        # Sessions beyond the threshold, most extreme first
+        layout.addWidget(QLabel(f"<b>Flagged Sessions</b> (over each session's last {SESSION_WINDOW} rounds)"))
+        self.session_table = QTableWidget(0, 7)
+        self.session_table.setHorizontalHeaderLabels(
+            ["Game", "Player", "Session", "Rounds", "Win Rate", "Player Win Rate", "z"])
+        self.session_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.session_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.session_table)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close)
+        layout.addWidget(close_button)
+
+        self.setLayout(layout)
+
+    def poll(self):
+        """Folds the rounds committed since the last poll into the statistics."""
+        if self.conn is None:
+            return
+        try:
+            read = self.tracker.poll(self.conn)
+        except sqlite3.Error as e:
+            self.status_label.setText(f"Journal unavailable: {e}")
+            return
+        # A full batch means more rounds are waiting; read them right after the UI catches up
+        if read == POLL_BATCH:
+            QTimer.singleShot(0, self.poll)
+        games, flagged_changed = self.tracker.take_changes()
+        for game in games:
+            self.update_game_row(game)
+        if flagged_changed:
+            self.refresh_sessions()
+        if read or not self.status_label.text():
+            self.status_label.setText(f"{self.tracker.rounds_tracked()} rounds tracked")
+
+    def update_game_row(self, game):
+        """Rewrites the summary row of one game, adding it if it is new."""
+        row = self.game_rows.get(game)
+        if row is None:
+            row = self.game_rows[game] = self.game_table.rowCount()
+            self.game_table.insertRow(row)
+        stats = self.tracker.game_stats[game]
+        expected = GAME_WIN_PROBABILITY.get(game)
+        values = [
+            game, str(stats.rounds), f"{stats.wins.mean * 100:.1f}%",
+            f"{expected * 100:.1f}%" if expected is not None else "N/A",
+            f"${stats.net.mean:.2f}", f"${stats.net.std:.2f}"
+        ]
+        for column, value in enumerate(values):
+            self.game_table.setItem(row, column, QTableWidgetItem(value))
+
+    def thresholds_changed(self):
+        """Re-checks every tracked session against the new thresholds."""
+        if self.tracker.set_thresholds(self.z_input.value(), self.min_rounds_input.value()):
+            self.refresh_sessions()
+
+    def refresh_sessions(self):
+        """Redraws the flagged sessions table."""
+        flagged = self.tracker.flagged_sessions()
+        self.session_table.setRowCount(len(flagged))
+        for row, (z, game, player_id, session_number, stats) in enumerate(flagged):
+            player = self.tracker.player_stats.get((game, player_id))
+            values = [
+                game, self.tracker.player_label(player_id), str(session_number), str(stats.rounds),
+                f"{stats.wins.mean * 100:.1f}%",
+                f"{player.wins.mean * 100:.1f}%" if player is not None else "N/A", f"{z:+.2f}"
+            ]
+            # Red for suspiciously lucky sessions, amber for suspiciously unlucky ones
+            color = QColor(255, 170, 170) if z > 0 else QColor(255, 220, 150)
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setBackground(color)
+                self.session_table.setItem(row, column, item)
+
+    def closeEvent(self, event):
+        """Stops polling and closes the connection when the panel is closed."""
+        self.timer.stop()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        super().closeEvent(event)
+
+
+# This allows the script to be run directly for testing
+if __name__ == '__main__':
+    app = QApplication(sys.argv)
+    panel = AnomalyPanel()
+    panel.show()
+    sys.exit(app.exec())
@@ -0,0 +1,190 @@
+# anomaly_tracker.py
+
+"""
+Rolling win-rate statistics behind the live anomaly panel.
+
+The tracker tails the ROUNDS journal (see round_journal.py) over one open
+connection, reading only rows past the last id it has seen. Every game, player
+and session keeps rolling statistics over its most recent rounds (see
+running_stats.WindowedStats), so a round costs O(1) and old results age out.
+
+A session is flagged when its win count over its window deviates from the
+game's honest win probability (cheat_detector.GAME_WIN_PROBABILITY) by more
+than the chosen z-score in either direction: an unusually lucky session may be
+a cheat, an unusually unlucky one may be a broken game. Only the sessions a
+poll touched are re-checked; the rest keep their verdict until they play again.
+"""
+
+import math
+from collections import OrderedDict
+
+# Import the honest win probability of each game
+from cheat_detector import GAME_WIN_PROBABILITY
+# Import the sliding-window accumulator
+from running_stats import WindowedStats
+
+# Most journal rows read per poll, so a large backlog never stalls the UI
+POLL_BATCH = 5000
+# Rounds of history loaded when the tracker starts
+WARMUP_ROUNDS = 20000
+# Rounds each statistic is computed over
+GAME_WINDOW = 5000
+PLAYER_WINDOW = 1000
+SESSION_WINDOW = 500
+# Players and sessions kept in memory; the least recently played are dropped
+MAX_PLAYERS = 5000
+MAX_SESSIONS = 5000
+# Default |z| above which a session is flagged
+DEFAULT_Z_THRESHOLD = 3.0
+# Rounds a session needs before it can be flagged
+DEFAULT_MIN_ROUNDS = 20
+
+
+class RoundStats:
+    """Rolling win rate and net result per round of one game, player or session."""
+    __slots__ = ("rounds", "wins", "net")
+
+    def __init__(self, window):
+        self.rounds = 0                   # Every decided round seen
+        self.wins = WindowedStats(window) # 1 per win, 0 otherwise
+        self.net = WindowedStats(window)  # payout - bet per round
+
+    def update(self, won, net):
+        self.rounds += 1
+        self.wins.update(won)
+        self.net.update(net)
+
+    def z_score(self, p):
+        """How many standard deviations the window's win count is from an honest player's."""
+        n = self.wins.n
+        if n == 0 or p <= 0 or p >= 1:
+            return 0.0
+        return (self.wins.mean - p) * math.sqrt(n / (p * (1 - p)))
+
+
+class AnomalyTracker:
+    """Rolling per-game, per-player and per-session statistics fed from the journal."""
+    def __init__(self, z_threshold=DEFAULT_Z_THRESHOLD, min_rounds=DEFAULT_MIN_ROUNDS):
+        self.z_threshold = z_threshold
+        self.min_rounds = min_rounds
+        # Statistics keyed by game, (game, player) and (game, player, session);
+        # players and sessions are kept least recently played first
+        self.game_stats = {}
+        self.player_stats = OrderedDict()
+        self.session_stats = OrderedDict()
+        # Latest display name seen for each player id
+        self.player_names = {}
+        # Flagged session -> z-score
+        self.flagged = {}
+        # Highest journal id already folded into the statistics
+        self.last_id = 0
+        # Games and sessions updated since the last take_changes()
+        self.changed_games = set()
+        self.changed_sessions = set()
+        # Whether a flagged session was dropped from memory since then
+        self.flagged_dropped = False
+
+    def warm_up(self, conn):
+        """Starts the statistics from the most recent WARMUP_ROUNDS rounds of history."""
+        newest = conn.execute("SELECT MAX(id) FROM ROUNDS").fetchone()[0]
+        if newest is not None:
+            self.last_id = max(self.last_id, newest - WARMUP_ROUNDS)
+
+    def poll(self, conn, limit=POLL_BATCH):
+        """
+        Folds up to `limit` rounds committed since the last poll into the
+        statistics (a range scan of the primary key). Returns the number read;
+        `limit` means more are waiting.
+        """
+        rows = conn.execute("""
+            SELECT id, game, player_id, player_name, session_number, payout - bet, won
+            FROM ROUNDS
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (self.last_id, limit)).fetchall()
+        for row in rows:
+            self.add_round(*row)
+        return len(rows)
+
+    def add_round(self, round_id, game, player_id, player_name, session_number, net, won):
+        """Updates the game, player and session statistics with one round (O(1))."""
+        self.last_id = round_id
+        # Cash-outs and other non-round entries carry no win/loss result
+        if won is None:
+            return
+        if player_name:
+            self.player_names[player_id] = player_name
+        self._entry(self.game_stats, game, GAME_WINDOW).update(won, net)
+        self._recent(self.player_stats, (game, player_id), PLAYER_WINDOW, MAX_PLAYERS).update(won, net)
+        session = (game, player_id, session_number)
+        self._recent(self.session_stats, session, SESSION_WINDOW, MAX_SESSIONS).update(won, net)
+        self.changed_games.add(game)
+        self.changed_sessions.add(session)
+
+    @staticmethod
+    def _entry(stats, key, window):
+        entry = stats.get(key)
+        if entry is None:
+            entry = stats[key] = RoundStats(window)
+        return entry
+
+    def _recent(self, stats, key, window, limit):
+        """Returns a player's or session's entry, marking it the most recently played."""
+        entry = self._entry(stats, key, window)
+        stats.move_to_end(key)
+        if len(stats) > limit:
+            dropped, _ = stats.popitem(last=False)
+            if self.flagged.pop(dropped, None) is not None:
+                self.flagged_dropped = True
+        return entry
+
+    def check(self, session):
+        """Re-evaluates one session; returns True if its flag or z-score changed."""
+        stats = self.session_stats.get(session)
+        p = GAME_WIN_PROBABILITY.get(session[0])
+        z = None
+        if stats is not None and p is not None and stats.wins.n >= self.min_rounds:
+            z = stats.z_score(p)
+            if abs(z) < self.z_threshold:
+                z = None
+        if z is None:
+            return self.flagged.pop(session, None) is not None
+        changed = self.flagged.get(session) != z
+        self.flagged[session] = z
+        return changed
+
+    def take_changes(self):
+        """
+        Re-checks the sessions updated since the last call. Returns (games whose
+        statistics changed, whether the flagged sessions changed).
+        """
+        games, sessions = self.changed_games, self.changed_sessions
+        self.changed_games, self.changed_sessions = set(), set()
+        flagged_changed, self.flagged_dropped = self.flagged_dropped, False
+        for session in sessions:
+            flagged_changed |= self.check(session)
+        return games, flagged_changed
+
+    def set_thresholds(self, z_threshold, min_rounds):
+        """Applies new thresholds to every tracked session. Returns True if the flagged sessions changed."""
+        self.z_threshold = z_threshold
+        self.min_rounds = min_rounds
+        changed = False
+        for session in self.session_stats:
+            changed |= self.check(session)
+        return changed
+
+    def flagged_sessions(self):
+        """Returns [(z, game, player_id, session_number, stats)] of the flagged sessions, most extreme first."""
+        rows = [(z,) + session + (self.session_stats[session],) for session, z in self.flagged.items()]
+        rows.sort(key=lambda row: abs(row[0]), reverse=True)
+        return rows
+
+    def player_label(self, player_id):
+        """Name of a player, or their ID when no name has been journaled."""
+        return self.player_names.get(player_id) or f"#{player_id}"
+
+    def rounds_tracked(self):
+        """Decided rounds folded into the statistics so far."""
+        return sum(stats.rounds for stats in self.game_stats.values())
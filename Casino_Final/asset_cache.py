@@ -0,0 +1,192 @@
+# asset_cache.py
+
+"""
+Shared cache of ready-to-paint dice and card images.
+
+After login the cache is filled in the background: every die face and card
+face is decoded and scaled on a worker thread, then turned into a QPixmap on
+the GUI thread. Images come from the memory-mapped assets.zip pack; an image
+in a loose Cards/ or dice_images/ folder (e.g. an extracted copy being edited)
+takes precedence over the packed one. Games ask for pixmaps by (asset, size),
+so no disk read or image scaling happens while a round is being played.
+"""
+
+import os
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+from asset_pack import asset_pack, ASSET_PACK_PATH
+
+# Folder where the dice images are stored
+DICE_IMAGE_FOLDER = os.path.join(os.path.dirname(__file__), "dice_images")
+# Folder where the card images are stored
+CARD_IMAGE_FOLDER = os.path.join(os.path.dirname(__file__), "Cards")
+
+# Size the Craps window paints each die at
+DICE_SIZE = (64, 64)
+# Size the High/Low window paints the current card at
+CARD_SIZE = (150, 220)
+
+# Card ranks and suits as they appear in the image filenames (e.g. "A_of_spades")
+CARD_RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+CARD_SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
+
+# Every asset that is preloaded after login, with the size it is painted at
+PRELOAD_ASSETS = (
+    [(f"dice{face}", DICE_SIZE) for face in range(1, 7)] +
+    [(f"{rank}_of_{suit}", CARD_SIZE) for suit in CARD_SUITS for rank in CARD_RANKS]
+)
+# Fast membership check for preloaded (asset, size) keys
+PRELOAD_KEYS = frozenset(PRELOAD_ASSETS)
+
+# How many pixmaps at other sizes are kept before the oldest is dropped
+MAX_EXTRA_PIXMAPS = 64
+
+
+def _index_folder(folder):
+    """Maps lower-case asset names (filename without .png) to their paths."""
+    index = {}
+    try:
+        for fname in os.listdir(folder):
+            name, ext = os.path.splitext(fname)
+            if ext.lower() == ".png":
+                index[name.lower()] = os.path.join(folder, fname)
+    except OSError:
+        # A missing folder simply means no assets from it
+        pass
+    return index
+
+
+def scale_image(image, size):
+    """Scales an image to fit `size`, keeping its aspect ratio."""
+    if image.isNull():
+        return image
+    return image.scaled(size[0], size[1], Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+class _PreloadSignals(QObject):
+    """Signals used by the preload worker to hand images back to the GUI thread."""
+    image_ready = pyqtSignal(str, int, int, QImage)
+
+
+class _PreloadTask(QRunnable):
+    """Worker that decodes and scales every preloaded asset off the GUI thread."""
+    def __init__(self, cache, assets):
+        super().__init__()
+        self.cache = cache
+        self.assets = assets
+        self.signals = _PreloadSignals()
+        self.signals.image_ready.connect(cache._store_preloaded)
+
+    def run(self):
+        for name, size in self.assets:
+            image = scale_image(self.cache.load_image(name), size)
+            if not image.isNull():
+                self.signals.image_ready.emit(name, size[0], size[1], image)
+
+
+class AssetCache(QObject):
+    """
+    Holds scaled pixmaps keyed by (asset, size).
+
+    Preloaded assets are kept for the lifetime of the application; pixmaps
+    requested at any other size live in a small LRU.
+    """
+    def __init__(self):
+        super().__init__()
+        # Asset name -> file path, built once for both folders
+        self._paths = None
+        # Preloaded pixmaps, keyed by (asset, (width, height))
+        self._preloaded = {}
+        # Pixmaps at other sizes, least recently used first
+        self._extra = OrderedDict()
+        # Whether the background preload has been started
+        self._preload_started = False
+
+    def asset_path(self, name):
+        """Returns the loose file path of an asset (e.g. 'dice3', 'card_back'), or None."""
+        if self._paths is None:
+            paths = _index_folder(CARD_IMAGE_FOLDER)
+            paths.update(_index_folder(DICE_IMAGE_FOLDER))
+            self._paths = paths
+        return self._paths.get(name.lower())
+
+    def asset_bytes(self, name):
+        """Returns the encoded bytes of an asset from its loose file or the pack, or None."""
+        path = self.asset_path(name)
+        if path is not None:
+            with open(path, "rb") as f:
+                return f.read()
+        pack = asset_pack()
+        if pack is not None and name in pack:
+            return pack.read(name)
+        return None
+
+    def load_image(self, name):
+        """Decodes an asset at its original size; returns a null QImage if it is missing."""
+        # A loose file overrides the packed copy
+        path = self.asset_path(name)
+        if path is not None:
+            return QImage(path)
+        pack = asset_pack()
+        if pack is not None and name in pack:
+            # Decode straight from the memory-mapped archive
+            return QImage.fromData(pack.read(name))
+        return QImage()
+
+    def preload(self):
+        """Starts filling the cache in the background. Safe to call more than once."""
+        if self._preload_started:
+            return
+        self._preload_started = True
+        # Open the pack and build the path index before the worker starts
+        asset_pack()
+        self.asset_path("")
+        self._preload_task = _PreloadTask(self, PRELOAD_ASSETS)
+        QThreadPool.globalInstance().start(self._preload_task)
+
+    def _store_preloaded(self, name, width, height, image):
+        """Turns a preloaded image into a pixmap; runs on the GUI thread."""
+        key = (name, (width, height))
+        if key not in self._preloaded:
+            self._preloaded[key] = QPixmap.fromImage(image)
+
+    def pixmap(self, name, size):
+        """
+        Returns the pixmap for an asset scaled to fit `size` (width, height).
+        Assets that are not cached yet are loaded on the spot; a null pixmap is
+        returned if the asset does not exist.
+        """
+        size = (int(size[0]), int(size[1]))
+        key = (name, size)
+        pixmap = self._preloaded.get(key)
+        if pixmap is not None:
+            return pixmap
+        pixmap = self._extra.get(key)
+        if pixmap is not None:
+            self._extra.move_to_end(key)
+            return pixmap
+
+        # Not cached yet: load it now
+        pixmap = QPixmap.fromImage(scale_image(self.load_image(name), size))
+        if pixmap.isNull():
+            return pixmap
+        if key in PRELOAD_KEYS:
+            self._preloaded[key] = pixmap
+        else:
+            self._extra[key] = pixmap
+            if len(self._extra) > MAX_EXTRA_PIXMAPS:
+                self._extra.popitem(last=False)
+        return pixmap
+
+
+# The single cache shared by every game window
+_asset_cache = None
+
+
+def asset_cache():
+    """Returns the shared AssetCache, creating it on first use."""
+    global _asset_cache
+    if _asset_cache is None:
+        _asset_cache = AssetCache()
+    return _asset_cache
@@ -0,0 +1,145 @@
+# asset_pack.py
+
+"""
+Reads game images straight out of a single packed archive.
+
+The archive (assets.zip) is opened once and memory-mapped. The zip central
+directory is read a single time to build an index of where each member's bytes
+start inside the mapping, so loading an image is a slice of the mapped file
+instead of opening a file on disk.
+
+assets.zip is the only copy of the images in the repository. To change one,
+extract the pack (which recreates the Cards/ and dice_images/ folders) and edit
+the image; the games use loose images in those folders ahead of the pack (see
+asset_cache.py). Run this module to rebuild assets.zip from the folders.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import zipfile
+import zlib
+
+# Folder this module lives in
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# The packed archive every game image is loaded from
+ASSET_PACK_PATH = os.path.join(BASE_DIR, "assets.zip")
+# Folders (or archives) the pack is built from, in order
+PACK_SOURCES = ("Cards", "dice_images")
+
+# Layout of a zip local file header (see the zip APPNOTE, section 4.3.7)
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+def asset_name(member_name):
+    """Returns the lookup name of an archive member (e.g. 'Cards/A_of_spades.png' -> 'a_of_spades')."""
+    return os.path.splitext(os.path.basename(member_name))[0].lower()
+
+
+class AssetPack:
+    """
+    A memory-mapped zip archive with an index of member offsets.
+    Members stored without compression are returned as a direct slice of the
+    mapping; deflated members are inflated from the mapped bytes.
+    """
+    def __init__(self, path=ASSET_PACK_PATH):
+        self.path = path
+        # One open and one mmap for the whole archive
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Asset name -> (data offset, compressed size, compression method)
+        self._index = self._build_index()
+
+    def _build_index(self):
+        """Reads the central directory once and records where each member's data starts."""
+        index = {}
+        with zipfile.ZipFile(self._map) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(".png"):
+                    continue
+                # The local header has its own name and extra field lengths
+                header = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+                if header[0] != _LOCAL_HEADER_SIGNATURE:
+                    raise zipfile.BadZipFile(f"Bad local header for {info.filename} in {self.path}")
+                name_length, extra_length = header[9], header[10]
+                offset = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+                index[asset_name(info.filename)] = (offset, info.compress_size, info.compress_type)
+        return index
+
+    def __contains__(self, name):
+        return name.lower() in self._index
+
+    def names(self):
+        """Returns the names of every asset in the pack."""
+        return list(self._index)
+
+    def read(self, name):
+        """Returns the raw (still encoded) bytes of an asset, or None if it is not in the pack."""
+        entry = self._index.get(name.lower())
+        if entry is None:
+            return None
+        offset, size, method = entry
+        data = self._map[offset:offset + size]
+        if method == zipfile.ZIP_STORED:
+            return data
+        if method == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+        raise zipfile.BadZipFile(f"Unsupported compression for {name} in {self.path}")
+
+    def close(self):
+        """Releases the memory mapping."""
+        self._map.close()
+
+
+# The single pack shared by the whole application (False when no pack exists)
+_asset_pack = None
+
+
+def asset_pack():
+    """Returns the shared AssetPack, or None if assets.zip is not installed."""
+    global _asset_pack
+    if _asset_pack is None:
+        try:
+            _asset_pack = AssetPack()
+        except (OSError, ValueError, zipfile.BadZipFile) as e:
+            # ValueError is raised when mapping an empty file
+            if os.path.exists(ASSET_PACK_PATH):
+                print(f"Error opening asset pack {ASSET_PACK_PATH}: {e}")
+            _asset_pack = False
+    return _asset_pack or None
+
+
+def build_pack(output=ASSET_PACK_PATH, sources=PACK_SOURCES):
+    """
+    Writes every PNG found in `sources` (zip archives or folders, relative to
+    this module) into one uncompressed archive. PNGs are already compressed, so
+    storing them keeps members sliceable straight from the memory mapping.
+    Returns the number of images written.
+    """
+    written = {}
+    for source in sources:
+        path = os.path.join(BASE_DIR, source)
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir() and info.filename.lower().endswith(".png"):
+                        written.setdefault(asset_name(info.filename), (info.filename, archive.read(info)))
+        elif os.path.isdir(path):
+            for fname in sorted(os.listdir(path)):
+                if fname.lower().endswith(".png"):
+                    with open(os.path.join(path, fname), "rb") as f:
+                        written.setdefault(asset_name(fname), (f"{source}/{fname}", f.read()))
+
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_STORED) as pack:
+        for member_name, data in sorted(written.values()):
+            # Fixed timestamps keep rebuilt packs byte-for-byte identical
+            pack.writestr(zipfile.ZipInfo(member_name, date_time=(1980, 1, 1, 0, 0, 0)), data)
+    return len(written)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else ASSET_PACK_PATH
+    count = build_pack(target)
+    print(f"Wrote {count} images to {target}")
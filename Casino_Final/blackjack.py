@@ -4,25 +4,35 @@ import os
 # Import random module to shuffle and deal cards
 import random
 
+# Import base64 to hand image bytes to Tkinter
+import base64
+
 # Import tkinter for GUI components
 import tkinter as tk
 
 # Import sqlite3 to interact with the database
 import sqlite3
 
-# Import matplotlib components for graphing
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-# Import Figure class to create plots
-from matplotlib.figure import Figure
-
 # Import messagebox for popup alerts
 from tkinter import messagebox
 
 # Import the function to flag suspected cheaters
 from cheaters import log_cheater
+# Import the shared rolling-window cheat detector
+from cheat_detector import CheatDetector
+# Import the per-round journal writer
+from round_journal import record_rounds
+# Import the shared cached winnings series, in-place plot and change watcher
+from net_winnings import series_cache, NetWinningsPlot, DataVersionWatcher
+# Import the shared asset cache to locate card images
+from asset_cache import asset_cache
 
 # Define the database path
 DB_PATH = os.path.join(os.path.dirname(__file__), "CasinoDB.db")
+# Net winnings graph source: the Blackjack table, net = money_won - bet_amount per session
+BLACKJACK_SOURCES = [("Blackjack", "money_won - bet_amount")]
+# How often an open net winnings graph checks for new commits, in milliseconds
+GRAPH_REFRESH_MS = 1000
 
 # Function to build a numeric Blackjack deck
 def build_deck_numeric(num_decks=4):
@@ -72,29 +82,8 @@ def compare(player_score, dealer_score):
     else:
         return "Dealer wins.", -1
 
-# Set card image folder path
-CARD_IMAGE_FOLDER = os.path.join(os.path.dirname(__file__), "Cards")
-# Define the filename for the card back image
-CARD_BACK_FILENAME = "card_back.png"
-
-# Initialize a variable to hold the Tkinter PhotoImage for the card back
-TK_BACK_IMAGE = None
-# Try to load the card back image
-try:
-    # Iterate through files in the card image folder
-    for fname in os.listdir(CARD_IMAGE_FOLDER):
-        # Check if the current filename matches the card back filename (case-insensitive)
-        if fname.lower() == CARD_BACK_FILENAME.lower():
-            # Construct the full path to the image file
-            path = os.path.join(CARD_IMAGE_FOLDER, fname)
-            # Load the image as a Tkinter PhotoImage
-            TK_BACK_IMAGE = tk.PhotoImage(file=path)
-            # Exit the loop once the image is found
-            break
-# Catch any exceptions that occur during image loading (e.g., file not found)
-except:
-    # Pass silently if an error occurs, TK_BACK_IMAGE will remain None
-    pass
+# Asset name of the card back image (card_back.png in the Cards folder)
+CARD_BACK_NAME = "card_back"
 
 # Map numeric card values to their common rank symbols
 NUMERIC_TO_RANK = {1:"A", 2:"2", 3:"3", 4:"4", 5:"5", 6:"6", 7:"7", 8:"8", 9:"9", 10:"10", 11:"A"}
@@ -107,9 +96,11 @@ SUITS = ["clubs","diamonds","hearts","spades"]
 # Main Blackjack game class
 class Blackjack:
     # Constructor for the Blackjack game
-    def __init__(self, player_id, parent_menu=None):
+    def __init__(self, session, parent_menu=None):
+        # Store the player's session shared by every game
+        self.session = session
         # Store the player's ID
-        self.player_id = player_id
+        self.player_id = session.player_id
         # Store a reference to the parent menu (for returning)
         self.parent_menu = parent_menu
 
@@ -122,10 +113,10 @@ class Blackjack:
         # Set the background color of the window
         self.root.configure(bg="#2E7D32")
 
-        # Fetch the player's full name from the database
-        self.full_name = self.fetch_player_name()
-        # Fetch the player's current balance from the database
-        self.balance = self.fetch_balance_from_db()
+        # Player's full name, loaded once at login
+        self.full_name = session.full_name
+        # Start from the balance carried by the session
+        self.balance = session.balance
 
         # Initialize the current bet amount
         self.bet = 0.0
@@ -145,8 +136,8 @@ class Blackjack:
         self.can_double = False
 
 
-        # Get the next session number for this new game launch
-        self.session_number = self.get_next_session_number()
+        # Take the next session number for this new game launch from the session counters
+        self.session_number = session.next_session_number("Blackjack")
         # Reset cumulative statistics for this new game launch
         self.total_winnings = 0
         # Reset total money bet in this session
@@ -155,9 +146,13 @@ class Blackjack:
         self.wins = 0
         # Reset total losses in this session
         self.losses = 0
-        # Initialize session history for cheater detection
-        self.session_history = []
+        # Rolling window of recent results for cheater detection
+        self.cheat_detector = CheatDetector.for_game("Blackjack")
+        # Hands (bet, payout, won) waiting to be journaled with the next session log
+        self.pending_rounds = []
         self.num_decks = 4
+        # Card back image, loaded the first time the dealer's hole card is shown
+        self.tk_back_image = None
         # Set up the graphical user interface
         self.setup_ui()
         # Ensure the balance display is updated after UI setup
@@ -165,50 +160,6 @@ class Blackjack:
         # Start the Tkinter event loop
         self.root.mainloop()
 
-    # Method to fetch the player's full name from the database
-    def fetch_player_name(self):
-        try:
-            # Connect to the SQLite database
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode for better concurrency and performance
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor object to execute SQL queries
-                cur = conn.cursor()
-                # Execute a query to get the concatenated first and last name for the player ID
-                cur.execute("SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?", (self.player_id,))
-                # Fetch the first result
-                result = cur.fetchone()
-                # Return the full name if found, otherwise return the player ID as a string
-                return result[0] if result else str(self.player_id)
-        # Catch any exceptions during database operation
-        except Exception as e:
-            # Print the error to console
-            print(f"Error fetching player name: {e}")
-            # Return player ID as a string in case of error
-            return str(self.player_id)
-
-    # Method to fetch the player's balance from the database
-    def fetch_balance_from_db(self):
-        try:
-            # Connect to the SQLite database
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode for better concurrency and performance
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor object
-                cur = conn.cursor()
-                # Execute a query to get the balance for the player ID
-                cur.execute("SELECT balance FROM PLAYERS WHERE ID=?", (self.player_id,))
-                # Fetch the first result
-                result = cur.fetchone()
-                # Return the balance as a float if found, otherwise default to 100.0
-                return float(result[0]) if result else 100.0
-        # Catch any exceptions during database operation
-        except Exception as e:
-            # Print the error to console
-            print(f"Error fetching balance: {e}")
-            # Return default balance in case of error
-            return 100.0
-
     # Method to set up the user interface
     def setup_ui(self):
         # Create a top frame for controls (Net Winnings, Balance, Bet, Deal buttons)
@@ -560,8 +511,11 @@ class Blackjack:
             self.total_bets += self.bet + self.second_bet
             self.wins += (1 if net1 > 0 else 0) + (1 if net2 > 0 else 0)
             self.losses += (1 if net1 < 0 else 0) + (1 if net2 < 0 else 0)
-            self.session_history.append(True if net1 > 0 else False)
-            self.session_history.append(True if net2 > 0 else False)
+            self.cheat_detector.record(True if net1 > 0 else False)
+            self.cheat_detector.record(True if net2 > 0 else False)
+            # Journal each hand: the stake plus its net result comes back to the player
+            self.pending_rounds.append((self.bet, self.bet + net1, net1 > 0))
+            self.pending_rounds.append((self.second_bet, self.second_bet + net2, net2 > 0))
             
             self.status_var.set(f"Hand 1: {msg1} (${net1:.2f}), Hand 2: {msg2} (${net2:.2f})")
         else:
@@ -581,17 +535,19 @@ class Blackjack:
             # Update cumulative stats for the current session
             self.total_winnings += net
             self.total_bets += self.bet
+            # Journal the hand: the stake plus its net result comes back to the player
+            self.pending_rounds.append((self.bet, self.bet + net, net > 0))
             # If player won the round
             if net > 0:
                 self.wins += 1
-                self.session_history.append(True) # Record win for cheater detection
+                self.cheat_detector.record(True) # Record win for cheater detection
             # If player lost the round
             elif net < 0:
                 self.losses += 1
-                self.session_history.append(False) # Record loss for cheater detection
+                self.cheat_detector.record(False) # Record loss for cheater detection
             # If it's a push/tie
             else:
-                self.session_history.append(False) # Treat push as non-win for cheater detection
+                self.cheat_detector.record(False) # Treat push as non-win for cheater detection
 
 
         # Update balance display
@@ -616,25 +572,22 @@ class Blackjack:
         self.log_blackjack_session()
 
         # Cheater detection logic
-        # Check if there are at least 20 game results in session history
-        if len(self.session_history) >= 20:
-            # Get the last 20 game results
-            recent_results = self.session_history[-20:]
-            # Calculate the win rate over the last 20 games
-            win_rate = sum(recent_results) / 20.0
-            # If the win rate is 80% or higher
-            if win_rate >= 0.8:
-                # Log the player as a cheater
-                log_cheater(self.player_id, "Blackjack", win_rate)
-                # Display a warning message to the player
-                messagebox.warning(self.root, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last 20 games and have been flagged.")
-                # Destroy the current Blackjack window
-                self.root.destroy()
-                # If there's a parent menu, show it
-                if self.parent_menu:
-                    self.parent_menu.show()
-                # Exit the method to prevent further execution in this game instance
-                return
+        # Check whether the recent win count is too unlikely for an honest player
+        if self.cheat_detector.flagged:
+            # Win rate and number of games in the detector's window
+            win_rate = self.cheat_detector.win_rate
+            rounds = self.cheat_detector.rounds
+            # Log the player as a cheater
+            log_cheater(self.player_id, "Blackjack", win_rate, rounds)
+            # Display a warning message to the player
+            messagebox.warning(self.root, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last {rounds} games and have been flagged.")
+            # Destroy the current Blackjack window
+            self.root.destroy()
+            # If there's a parent menu, show it
+            if self.parent_menu:
+                self.parent_menu.show()
+            # Exit the method to prevent further execution in this game instance
+            return
 
     # Method to log Blackjack session data to the database
     def log_blackjack_session(self):
@@ -653,22 +606,23 @@ class Blackjack:
                         bet_amount = ?,
                         wins = ?,
                         money_won = ?
-                    WHERE player_name = ? AND session_number = ?
+                    WHERE player_id = ? AND session_number = ?
                 """, (
                     self.wins + self.losses, # total rounds played in this session
                     self.total_bets,
                     self.wins,
                     self.total_winnings,
-                    self.full_name,
+                    self.player_id,
                     self.session_number
                 ))
 
                 # If no rows were updated (meaning it's a new session record to insert)
                 if cur.rowcount == 0:
                     cur.execute("""
-                        INSERT INTO Blackjack (player_name, number_of_bets, bet_amount, wins, money_won, session_number)
-                        VALUES (?, ?, ?, ?, ?, ?)
+                        INSERT INTO Blackjack (player_id, player_name, number_of_bets, bet_amount, wins, money_won, session_number)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
                     """, (
+                        self.player_id,
                         self.full_name,
                         self.wins + self.losses,
                         self.total_bets,
@@ -679,8 +633,12 @@ class Blackjack:
 
                 # Always update the PLAYERS table balance
                 cur.execute("UPDATE PLAYERS SET balance = ? WHERE ID = ?", (self.balance, self.player_id))
+                # Journal the hands played since the last log in the same transaction
+                record_rounds(cur, "Blackjack", self.player_id, self.full_name, self.session_number, self.pending_rounds)
                 # Commit the changes to the database
                 conn.commit()
+                self.pending_rounds.clear()
+                self.session.balance = self.balance
         # Catch any exceptions during database operation
         except Exception as e:
             # Print the error to console
@@ -696,37 +654,6 @@ class Blackjack:
         if self.parent_menu:
             self.parent_menu.show()
 
-    # Method to determine the next session number for the player
-    def get_next_session_number(self):
-        """
-        Determines the next session number for the player.
-        This ensures a new session number for each game launch.
-        """
-        try:
-            # Connect to the SQLite database
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode for better concurrency and performance
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor object
-                cur = conn.cursor()
-                # Execute a query to get the maximum session number for the current player
-                cur.execute("""
-                    SELECT MAX(session_number)
-                    FROM Blackjack
-                    WHERE player_name=?
-                """, (self.full_name,))
-                # Fetch the result
-                result = cur.fetchone()
-                # If there are existing sessions, return the maximum session number + 1.
-                # Otherwise, start with session number 1.
-                return (result[0] or 0) + 1
-        # Catch any exceptions during database operation
-        except Exception as e:
-            # Print the error to console
-            print(f"Error fetching next session number: {e}")
-            # Fallback to session 1 if an error occurs
-            return 1
-
     # Method to plot the player's net winnings over sessions
     def plot_net_winnings(self):
         try:
@@ -734,75 +661,70 @@ class Blackjack:
             with sqlite3.connect(DB_PATH) as conn:
                 # Set journaling mode for better concurrency and performance
                 conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor object
-                cur = conn.cursor()
-                # Execute a query to get session number, money won, and bet amount, ordered by session number
-                cur.execute("SELECT session_number, money_won, bet_amount FROM Blackjack WHERE player_name=? ORDER BY session_number", (self.full_name,))
-                # Fetch all results
-                data = cur.fetchall()
-
-                # If there are no results, but we have played in the current session, show current session data
-                if not data and self.total_bets == 0:
-                    return messagebox.showinfo("No Data", "No session data available.")
-
-                # Aggregate data by session number
-                session_data = {}
-                for session_num, money_won, bet_amount in data:
-                    if session_num is None:
-                        continue
-                    if session_num not in session_data:
-                        session_data[session_num] = {'money_won': 0, 'bet_amount': 0}
-                    session_data[session_num]['money_won'] += money_won
-                    session_data[session_num]['bet_amount'] += bet_amount
-
-                # Add current session data to the aggregation
-                if self.total_bets > 0:
-                    if self.session_number not in session_data:
-                        session_data[self.session_number] = {'money_won': 0, 'bet_amount': 0}
-                    session_data[self.session_number]['money_won'] = self.total_winnings
-                    session_data[self.session_number]['bet_amount'] = self.total_bets
-
-                # Prepare data for plotting
-                sorted_sessions = sorted(session_data.keys())
-                sessions = []
-                net_winnings = []
-                cumulative_net = 0
-                
-                for session_num in sorted_sessions:
-                    s_data = session_data[session_num]
-                    net = s_data['money_won'] - s_data['bet_amount']
-                    cumulative_net += net
-                    sessions.append(session_num)
-                    net_winnings.append(cumulative_net)
-
-
-                # Create a Matplotlib figure
-                fig = Figure(figsize=(5, 4), dpi=100)
-                # Add a subplot to the figure
-                ax = fig.add_subplot(111)
-                # Plot the net winnings data with markers
-                ax.plot(sessions, net_winnings, marker='o')
-                # Set the title of the plot
-                ax.set_title("Cumulative Net Winnings Over Sessions")
-                # Set the label for the x-axis
-                ax.set_xlabel("Session")
-                # Set the label for the y-axis
-                ax.set_ylabel("Net Winnings ($)")
-                # Create a new Tkinter Toplevel window for the plot
-                win = tk.Toplevel(self.root)
-                # Set the title of the plot window
-                win.title("Net Winnings")
-                # Create a FigureCanvasTkAgg to embed the Matplotlib figure in the Tkinter window
-                canvas = FigureCanvasTkAgg(fig, master=win)
-                # Draw the canvas
-                canvas.draw()
-                # Pack the Tkinter widget of the canvas
-                canvas.get_tk_widget().pack()
+                # Cumulative net winnings per session from the shared cache; the current
+                # session replaces its saved rows until it is logged again
+                sessions, net_winnings = series_cache.series(
+                    conn, self.player_id, BLACKJACK_SOURCES, self.pending_session())
+
+            # If there are no results and nothing has been played this session
+            if len(net_winnings) == 0:
+                return messagebox.showinfo("No Data", "No session data available.")
+
+            # Import matplotlib components for graphing (only when a graph is requested)
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+            # Create a Matplotlib figure
+            fig = Figure(figsize=(5, 4), dpi=100)
+            # Create a new Tkinter Toplevel window for the plot
+            win = tk.Toplevel(self.root)
+            # Set the title of the plot window
+            win.title("Net Winnings")
+            # Create a FigureCanvasTkAgg to embed the Matplotlib figure in the Tkinter window
+            canvas = FigureCanvasTkAgg(fig, master=win)
+            # Pack the Tkinter widget of the canvas
+            canvas.get_tk_widget().pack()
+            # Line that is updated in place as new hands are logged
+            plot = NetWinningsPlot(fig, "Cumulative Net Winnings Over Sessions", "Session")
+            plot.update(sessions, net_winnings)
+            # Follow commits from any connection while the window is open
+            watcher = DataVersionWatcher(DB_PATH)
+
+            def follow():
+                # Stop once the plot window has been closed
+                if not win.winfo_exists():
+                    watcher.close()
+                    return
+                if watcher.changed():
+                    with sqlite3.connect(DB_PATH) as conn:
+                        plot.update(*series_cache.series(conn, self.player_id, BLACKJACK_SOURCES, self.pending_session()))
+                win.after(GRAPH_REFRESH_MS, follow)
+
+            win.after(GRAPH_REFRESH_MS, follow)
         # Catch any exceptions during plotting
         except Exception as e:
             # Show an error message box
             messagebox.showerror("Plot Error", str(e))
 
+    # Method returning the current session's (session number, net) for the graph, or None before the first hand
+    def pending_session(self):
+        if self.total_bets > 0:
+            return (self.session_number, self.total_winnings - self.total_bets)
+        return None
+
+    # Method to get the card back image, loaded once per game window
+    def card_back_image(self):
+        # Only try to load the image once
+        if self.tk_back_image is None:
+            # Get the encoded image from the asset pack (or the Cards folder)
+            data = asset_cache().asset_bytes(CARD_BACK_NAME)
+            try:
+                # Load the image as a Tkinter PhotoImage owned by this window
+                self.tk_back_image = tk.PhotoImage(master=self.root, data=base64.b64encode(data)) if data else False
+            # If the image cannot be loaded, fall back to the "?" placeholder
+            except tk.TclError:
+                self.tk_back_image = False
+        return self.tk_back_image
+
     # Helper method to display cards in a given frame
     def _display(self, frame, hand, hide_first):
         # Destroy all existing widgets (cards) in the frame
@@ -812,12 +734,14 @@ class Blackjack:
         for i, val in enumerate(hand):
             # If it's the first card and it needs to be hidden (for dealer's first card)
             if i == 0 and hide_first:
+                # Get the card back image (loaded once per window)
+                back_image = self.card_back_image()
                 # If a card back image is loaded
-                if TK_BACK_IMAGE:
+                if back_image:
                     # Create a label with the card back image
-                    lbl = tk.Label(frame, image=TK_BACK_IMAGE, bg="#2E7D32")
+                    lbl = tk.Label(frame, image=back_image, bg="#2E7D32")
                     # Keep a reference to the image to prevent garbage collection
-                    lbl.image = TK_BACK_IMAGE
+                    lbl.image = back_image
                 # If no card back image is loaded, use a "?" placeholder
                 else:
                     lbl = tk.Label(frame, text="?", font=("Arial",32), fg="red", bg="white", width=4, height=2, relief="raised", bd=2)
@@ -3,14 +3,51 @@
 import sys
 import sqlite3
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QMessageBox, QGridLayout
+    QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QMessageBox, QGridLayout,
+    QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTime, QTimer, pyqtSignal
+# Import the schema migrator (the schema is assumed, not checked, at runtime)
+from migrations import run_migrations
+# Import the live anomaly panel fed by the rounds journal
+from anomaly_panel import AnomalyPanel
+# Import the per-game rollup reader
+from rollups import hold_by_game
+# Import the incremental casino totals
+from casino_totals import merge_new_rounds
 
 # Define the database path
 DB_PATH = "CasinoDB.db"
-# Define the hardcoded ID for the casino stats row
-CASINO_ID = 7589
+# How often the panel checks whether another connection has committed, in milliseconds
+CHANGE_POLL_MS = 1000
+
+def todays_hold(db_path=DB_PATH):
+    """Returns today's per-game rollup rows (see rollups.hold_by_game)."""
+    with sqlite3.connect(db_path) as conn:
+        return hold_by_game(conn, "day", conn.execute("SELECT date('now')").fetchone()[0])
+
+
+class _StatsSignals(QObject):
+    """Signals used by the stats worker to hand results back to the GUI thread."""
+    stats_ready = pyqtSignal(tuple)
+    hold_ready = pyqtSignal(list)
+    failed = pyqtSignal(str)
+
+
+class _StatsTask(QRunnable):
+    """Worker that merges new rounds into the casino totals off the GUI thread."""
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        self.signals = _StatsSignals()
+
+    def run(self):
+        try:
+            self.signals.stats_ready.emit(merge_new_rounds(self.db_path))
+            self.signals.hold_ready.emit(todays_hold(self.db_path))
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
 
 class CasinoAdminPanel(QWidget):
     """
@@ -19,14 +56,23 @@ class CasinoAdminPanel(QWidget):
     def __init__(self, parent_menu=None):
         super().__init__()
         self.setWindowTitle("Casino Admin Panel")
-        self.setGeometry(400, 200, 500, 450)
+        self.setGeometry(400, 200, 560, 620)
         self.parent_menu = parent_menu
         
-        # Define the list of game tables to aggregate data from
-        self.game_tables = ["Blackjack", "Craps", "HighLow", "Poker", "Roulette", "Slots"]
+        # Background refresh in progress, if any
+        self.stats_task = None
+        # Connection kept open only to read PRAGMA data_version, which changes
+        # whenever any other connection commits to the database
+        self.watch_conn = sqlite3.connect(DB_PATH)
+        self.data_version = None
 
         self.setup_ui()
-        self.update_stats()
+        self.check_for_changes()
+
+        # Cheap change check; the totals are only recomputed after a commit elsewhere
+        self.change_timer = QTimer(self)
+        self.change_timer.timeout.connect(self.check_for_changes)
+        self.change_timer.start(CHANGE_POLL_MS)
 
     def setup_ui(self):
         """
@@ -66,10 +112,27 @@ class CasinoAdminPanel(QWidget):
 
         main_layout.addLayout(grid_layout)
 
+        # Today's handle, payouts and hold per game, read from the daily rollups
+        main_layout.addWidget(QLabel("<b>Today by Game:</b>"))
+        self.hold_table = QTableWidget(0, 6)
+        self.hold_table.setHorizontalHeaderLabels(["Game", "Handle", "Payouts", "Rounds", "Players", "Hold"])
+        self.hold_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.hold_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        main_layout.addWidget(self.hold_table)
+
+        # When the totals were last refreshed
+        self.status_label = QLabel("")
+        main_layout.addWidget(self.status_label)
+
         # Refresh button to update stats
         self.refresh_button = QPushButton("Refresh & Update Database")
         self.refresh_button.clicked.connect(self.update_stats)
         main_layout.addWidget(self.refresh_button)
+
+        # Live anomaly panel button
+        self.anomaly_button = QPushButton("Live Anomalies")
+        self.anomaly_button.clicked.connect(self.open_anomaly_panel)
+        main_layout.addWidget(self.anomaly_button)
         
         # Back button
         if self.parent_menu:
@@ -79,114 +142,88 @@ class CasinoAdminPanel(QWidget):
 
         self.setLayout(main_layout)
 
-    def update_stats(self):
+    def check_for_changes(self):
         """
-        Calculates stats from all game tables, updates the CASINO table in the database,
-        and then refreshes the display with the new data.
+        Starts a refresh when another connection has committed since the last one.
         """
+        # Let a running refresh finish; the next tick sees any commit made meanwhile
+        if self.stats_task is not None:
+            return
         try:
-            with sqlite3.connect(DB_PATH) as conn:
-                cur = conn.cursor()
-                
-                # Ensure necessary columns exist in CASINO table
-                cur.execute("PRAGMA table_info(CASINO)")
-                columns = [info[1] for info in cur.fetchall()]
-                if 'total_cashout' not in columns:
-                    cur.execute("ALTER TABLE CASINO ADD COLUMN total_cashout REAL DEFAULT 0")
-                if 'total_cash' not in columns:
-                    cur.execute("ALTER TABLE CASINO ADD COLUMN total_cash REAL DEFAULT 0")
-                conn.commit()
-
-
-                total_bets = 0
-                total_player_wins = 0
-                total_player_losses = 0
-                total_player_net_winnings = 0.0
-
-                # Aggregate data from all individual game tables
-                for table in self.game_tables:
-                    try:
-                        cur.execute(f"PRAGMA table_info({table})")
-                        columns = [info[1] for info in cur.fetchall()]
-                        
-                        query = "SELECT SUM(number_of_bets), SUM(wins), SUM(bet_amount), SUM(money_won)"
-                        if 'losses' in columns:
-                            query += ", SUM(losses)"
-                        else:
-                            query += ", 0"
-                            
-                        query += f" FROM {table}"
-                        
-                        cur.execute(query)
-                        result = cur.fetchone()
-                        
-                        if result and result[0] is not None:
-                            total_bets += result[0]
-                            total_player_wins += result[1]
-                            
-                            bet_amount = result[2] if result[2] is not None else 0.0
-                            money_won = result[3] if result[3] is not None else 0.0
-                            losses = result[4] if result[4] is not None else 0
-                            total_player_losses += losses
-
-                            if table in ["Slots", "HighLow"]:
-                                total_player_net_winnings += (money_won - bet_amount)
-                            else:
-                                total_player_net_winnings += money_won
-                    except sqlite3.OperationalError:
-                        print(f"Warning: Table '{table}' not found or query failed. Skipping.")
-                        continue
-                
-                # Get total deposits by summing from the PLAYERS table
-                cur.execute("SELECT SUM(total_deposit) FROM PLAYERS")
-                deposit_result = cur.fetchone()
-                total_deposits = deposit_result[0] if deposit_result and deposit_result[0] is not None else 0.0
-                
-                # Get total cashouts from CASINO table
-                cur.execute("SELECT total_cashout FROM CASINO WHERE id=?", (CASINO_ID,))
-                cashout_result = cur.fetchone()
-                total_cashouts = cashout_result[0] if cashout_result and cashout_result[0] is not None else 0.0
-
-                # Define casino stats
-                casino_profit = -total_player_net_winnings if total_player_net_winnings < 0 else 0
-                casino_loss = total_player_net_winnings if total_player_net_winnings > 0 else 0
-                casino_net_profit = casino_profit - casino_loss
-                
-                # New calculation for total_cash
-                casino_total_cash = max(0, total_deposits + casino_net_profit - total_cashouts)
-
-                
-                # Update the CASINO table
-                cur.execute("""
-                    UPDATE CASINO
-                    SET money_won = ?, Bets = ?, Won = ?, Lost = ?,
-                        money_loss = ?, net_profit = ?,
-                        total_cash = ?
-                    WHERE id = ?
-                """, (
-                    casino_profit, total_bets, total_player_losses,
-                    total_player_wins, casino_loss,
-                    casino_net_profit, casino_total_cash, CASINO_ID
-                ))
-                conn.commit()
-
-                # Fetch the newly updated data from the CASINO table to display it
-                cur.execute("SELECT id, money_won, Bets, Won, Lost, money_loss, net_profit, total_cash FROM CASINO WHERE id=?", (CASINO_ID,))
-                stats = cur.fetchone()
-                if stats:
-                    self.id_label.setText(str(stats[0]))
-                    self.money_won_label.setText(f"${stats[1]:.2f}")
-                    self.bets_label.setText(str(stats[2]))
-                    self.won_label.setText(str(stats[3]))
-                    self.lost_label.setText(str(stats[4]))
-                    self.money_loss_label.setText(f"${stats[5]:.2f}")
-                    self.net_profit_label.setText(f"${stats[6]:.2f}")
-                    self.total_cash_label.setText(f"${stats[7]:.2f}")
-                
-                QMessageBox.information(self, "Success", "Casino statistics have been updated.")
+            version = self.watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            self.status_label.setText(f"Change check failed: {e}")
+            return
+        if version != self.data_version:
+            self.data_version = version
+            self.update_stats()
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred while updating stats: {e}")
+    def update_stats(self):
+        """
+        Starts a background refresh: the worker merges the rounds played since the
+        last refresh into the CASINO totals and the labels update when it reports back.
+        """
+        # A refresh already running will pick up everything committed so far
+        if self.stats_task is not None:
+            return
+        self.refresh_button.setEnabled(False)
+        self.status_label.setText("Updating...")
+        self.stats_task = _StatsTask(DB_PATH)
+        self.stats_task.signals.stats_ready.connect(self.show_stats)
+        self.stats_task.signals.hold_ready.connect(self.show_hold)
+        self.stats_task.signals.failed.connect(self.show_stats_error)
+        QThreadPool.globalInstance().start(self.stats_task)
+
+    def show_stats(self, stats):
+        """
+        Displays the refreshed CASINO row; runs on the GUI thread.
+        """
+        self.stats_task = None
+        self.refresh_button.setEnabled(True)
+        self.id_label.setText(str(stats[0]))
+        self.money_won_label.setText(f"${stats[1]:.2f}")
+        self.bets_label.setText(str(stats[2]))
+        self.won_label.setText(str(stats[3]))
+        self.lost_label.setText(str(stats[4]))
+        self.money_loss_label.setText(f"${stats[5]:.2f}")
+        self.net_profit_label.setText(f"${stats[6]:.2f}")
+        self.total_cash_label.setText(f"${stats[7]:.2f}")
+        self.status_label.setText(f"Updated {QTime.currentTime().toString('hh:mm:ss')} ({stats[8]} new rounds)")
+
+    def show_hold(self, rows):
+        """
+        Fills the per-game table from today's rollup rows; runs on the GUI thread.
+        """
+        self.hold_table.setRowCount(len(rows))
+        for row, (_, game, handle, payouts, rounds, players, hold) in enumerate(rows):
+            values = [game, f"${handle:.2f}", f"${payouts:.2f}", str(rounds), str(players),
+                      f"{hold:.1f}%" if hold is not None else "N/A"]
+            for column, value in enumerate(values):
+                self.hold_table.setItem(row, column, QTableWidgetItem(value))
+
+    def show_stats_error(self, message):
+        """
+        Reports a failed refresh; runs on the GUI thread.
+        """
+        self.stats_task = None
+        self.refresh_button.setEnabled(True)
+        self.status_label.setText("Update failed")
+        QMessageBox.critical(self, "Error", f"An error occurred while updating stats: {message}")
+
+    def open_anomaly_panel(self):
+        """
+        Opens the live anomaly panel (kept on self so it is not garbage collected).
+        """
+        self.anomaly_panel = AnomalyPanel(DB_PATH)
+        self.anomaly_panel.show()
+
+    def closeEvent(self, event):
+        """
+        Stops watching for changes when the panel is closed.
+        """
+        self.change_timer.stop()
+        self.watch_conn.close()
+        super().closeEvent(event)
 
     def back_to_menu(self):
         """
@@ -198,6 +235,7 @@ class CasinoAdminPanel(QWidget):
 
 # This allows the script to be run directly for testing
 if __name__ == '__main__':
+    run_migrations()
     app = QApplication(sys.argv)
     admin_panel = CasinoAdminPanel()
     admin_panel.show()
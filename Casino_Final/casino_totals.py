@@ -0,0 +1,122 @@
+# casino_totals.py
+
+"""
+The casino-wide totals kept in the CASINO row.
+
+Every total is a frozen baseline plus the rounds journaled since. Migration 3
+computed the baseline from the game tables, which hold the history played
+before the ROUNDS journal (see round_journal.py), and stored it in the
+baseline_* columns with baseline_mark, the last ROUNDS id it already covers.
+Every round journaled after that mark is added the same way:
+
+    Bets        decided rounds (won is not NULL)
+    Lost / Won  the rounds the players won / lost
+    player_net  the players' net result, SUM(payout - bet)
+
+The money columns (money_won, money_loss, net_profit, total_cash) follow from
+player_net, the deposits in PLAYERS and CASINO.total_cashout.
+
+merge_new_rounds() only adds the rounds journaled after CASINO.rounds_mark;
+recompute_casino_totals() starts over from the baseline and every round after
+baseline_mark. Both give the same result.
+
+Recompute the totals from the baseline and the journal:
+    python casino_totals.py
+"""
+
+import sqlite3
+import sys
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Define the hardcoded ID for the casino stats row
+CASINO_ID = 7589
+
+
+def round_totals(conn, after=0):
+    """
+    Returns (decided rounds, rounds won by players, player net, last id) of the
+    rounds journaled after id `after` (a range scan of the primary key).
+    """
+    return conn.execute("""
+        SELECT COUNT(won), COALESCE(SUM(won), 0), COALESCE(SUM(payout - bet), 0), MAX(id)
+        FROM ROUNDS
+        WHERE id > ?
+    """, (after,)).fetchone()
+
+
+def merge_new_rounds(db_path=DB_PATH, full=False):
+    """
+    Merges every round journaled since CASINO.rounds_mark into the casino totals
+    and returns the refreshed stats row
+    (id, money_won, Bets, Won, Lost, money_loss, net_profit, total_cash, rounds merged).
+    Only the new ROUNDS rows are read, so the cost follows new activity, not history.
+    With full=True the totals are recomputed from the baseline and every round
+    journaled after it instead.
+    """
+    # Autocommit mode so the read-merge-write runs in one explicit write transaction
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        # Take the write lock first so two refreshes can never merge the same rounds
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = conn.execute("""
+                SELECT money_won, Bets, Won, Lost, money_loss, net_profit, total_cash, player_net, rounds_mark, total_cashout,
+                       baseline_bets, baseline_player_losses, baseline_player_wins, baseline_player_net, baseline_mark
+                FROM CASINO WHERE id = ?
+            """, (CASINO_ID,)).fetchone()
+            bets, player_losses, player_wins, player_net, mark, total_cashouts = (
+                current[1], current[2], current[3], current[7], current[8], current[9])
+            if full:
+                bets, player_losses, player_wins, player_net, mark = current[10:15]
+
+            # Aggregate only the rounds past the high-water mark
+            new_rounds, new_wins, new_net, new_mark = round_totals(conn, mark or 0)
+
+            bets = (bets or 0) + new_rounds
+            player_wins = (player_wins or 0) + new_wins
+            player_losses = (player_losses or 0) + new_rounds - new_wins
+            player_net = (player_net or 0.0) + new_net
+
+            # Get total deposits by summing from the PLAYERS table
+            total_deposits = conn.execute("SELECT COALESCE(SUM(total_deposit), 0) FROM PLAYERS").fetchone()[0]
+            total_cashouts = total_cashouts or 0.0
+
+            # Define casino stats
+            casino_profit = -player_net if player_net < 0 else 0
+            casino_loss = player_net if player_net > 0 else 0
+            casino_net_profit = casino_profit - casino_loss
+            casino_total_cash = max(0, total_deposits + casino_net_profit - total_cashouts)
+
+            updated = (casino_profit, bets, player_losses, player_wins, casino_loss,
+                       casino_net_profit, casino_total_cash, player_net,
+                       new_mark if new_mark is not None else mark)
+            # Only write when something changed: an empty write would still look like
+            # a new commit to every panel watching PRAGMA data_version
+            if updated != tuple(current[:9]):
+                # Update the CASINO table and move the high-water mark in the same transaction
+                conn.execute("""
+                    UPDATE CASINO
+                    SET money_won = ?, Bets = ?, Won = ?, Lost = ?,
+                        money_loss = ?, net_profit = ?,
+                        total_cash = ?, player_net = ?, rounds_mark = ?
+                    WHERE id = ?
+                """, updated + (CASINO_ID,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    return (CASINO_ID, casino_profit, bets, player_losses, player_wins,
+            casino_loss, casino_net_profit, casino_total_cash, new_rounds)
+
+
+def recompute_casino_totals(db_path=DB_PATH):
+    """Recomputes the casino totals from the baseline and the journal and returns the stats row."""
+    return merge_new_rounds(db_path, full=True)
+
+
+if __name__ == "__main__":
+    stats = recompute_casino_totals(sys.argv[1] if len(sys.argv) > 1 else DB_PATH)
+    print(f"Recomputed casino totals over {stats[2]} bets: net profit ${stats[6]:.2f}")
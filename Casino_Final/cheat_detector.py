@@ -0,0 +1,114 @@
+# cheat_detector.py
+
+"""
+Rolling-window cheat detector shared by every game.
+
+Each game records one result per round (won or not). The detector keeps the
+last `window` results in a fixed-size ring buffer with a running win count, so
+memory does not grow over a long session and every check is O(1).
+
+Instead of a fixed "80% of the last 20" rule, a player is flagged when their
+win count in the window would happen with probability at most `alpha` for an
+honest player, using the binomial tail for that game's real win probability.
+The smallest suspicious win count is precomputed for every window length, so
+the check itself is a single comparison. High-hit games (HighLow, Slots two of
+a kind) no longer trip the flag on ordinary runs, while games with rare wins
+are flagged sooner.
+"""
+
+import math
+from functools import lru_cache
+
+# Probability that an honest player wins a round, as each game records it.
+# These are the best legitimate strategies, so skilled play is not flagged.
+GAME_WIN_PROBABILITY = {
+    "Blackjack": 0.44,   # Basic strategy; pushes count as non-wins
+    "Craps": 244 / 495,  # Pass Line, the best bet offered; every bet decision is a round
+    "HighLow": 0.71,     # Always guessing the likelier direction
+    "Poker": 0.49,       # Heads-up showdown against the dealer; ties count as non-wins
+    "Roulette": 18 / 37, # One even-money bet, the best bet offered; every bet is a round
+    "Slots": 0.27        # Hit frequency of the 7s Frenzy machine (any two adjacent)
+}
+
+# Results kept per player and game
+DEFAULT_WINDOW = 50
+# Rounds needed before anyone can be flagged
+DEFAULT_MIN_ROUNDS = 20
+# Chance of an honest player's window being flagged on any one check
+DEFAULT_ALPHA = 1e-4
+
+
+def binomial_tail(wins, rounds, p):
+    """Returns P(X >= wins) for X ~ Binomial(rounds, p)."""
+    return sum(math.comb(rounds, k) * p ** k * (1 - p) ** (rounds - k) for k in range(wins, rounds + 1))
+
+
+@lru_cache(maxsize=None)
+def win_thresholds(p, window=DEFAULT_WINDOW, alpha=DEFAULT_ALPHA):
+    """
+    Returns a tuple where entry n is the smallest win count out of n rounds
+    whose binomial tail is at most alpha (n + 1 when no count is that unlikely).
+    """
+    thresholds = [1]
+    for rounds in range(1, window + 1):
+        threshold = rounds + 1
+        for wins in range(rounds, -1, -1):
+            if binomial_tail(wins, rounds, p) > alpha:
+                break
+            threshold = wins
+        thresholds.append(threshold)
+    return tuple(thresholds)
+
+
+class CheatDetector:
+    """Ring buffer of a player's recent results with a precomputed binomial-tail flag."""
+    def __init__(self, win_probability, window=DEFAULT_WINDOW, min_rounds=DEFAULT_MIN_ROUNDS, alpha=DEFAULT_ALPHA):
+        self.win_probability = win_probability
+        self.window = window
+        self.min_rounds = min_rounds
+        self.thresholds = win_thresholds(win_probability, window, alpha)
+        # Last `window` results (1 = win), oldest overwritten first
+        self._results = bytearray(window)
+        self._next = 0
+        # Results currently in the buffer and how many of them are wins
+        self.rounds = 0
+        self.wins = 0
+        # Set once the player has been flagged
+        self.flagged = False
+
+    @classmethod
+    def for_game(cls, game_name, win_probability=None, **kwargs):
+        """Creates a detector calibrated for a game (win_probability overrides the table)."""
+        if win_probability is None:
+            win_probability = GAME_WIN_PROBABILITY[game_name]
+        return cls(win_probability, **kwargs)
+
+    @property
+    def win_rate(self):
+        """Win rate over the results in the window."""
+        return self.wins / self.rounds if self.rounds else 0.0
+
+    def record(self, won):
+        """Adds one round's result. Returns True if the player is now flagged."""
+        won = 1 if won else 0
+        if self.rounds == self.window:
+            self.wins -= self._results[self._next]
+        else:
+            self.rounds += 1
+        self._results[self._next] = won
+        self.wins += won
+        self._next = (self._next + 1) % self.window
+        if self.rounds >= self.min_rounds and self.wins >= self.thresholds[self.rounds]:
+            self.flagged = True
+        return self.flagged
+
+    def record_many(self, results):
+        """Adds many results in order, stopping at the first flagged window."""
+        for won in results:
+            if self.record(won):
+                break
+        return self.flagged
+
+    def p_value(self):
+        """Probability that an honest player does at least this well over the current window."""
+        return binomial_tail(self.wins, self.rounds, self.win_probability)
@@ -0,0 +1,168 @@
+# cheat_scan.py
+
+"""
+Offline cheat scan over the full game history.
+
+The live detector only sees rounds played in an open game window. This job
+re-checks every player's history in every game table at once: per-session win
+and round counts are loaded with one query per game, rolling sums over the last
+1 to `window` sessions are taken with numpy cumulative sums, and each window's
+win count is turned into a z-score against the game's honest win probability
+(see cheat_detector.GAME_WIN_PROBABILITY). Trying every window length keeps a
+short burst of wins from being diluted by the sessions around it. Games are
+scanned in parallel, one per worker process, and all findings are written to
+CHEAT_LOG in a single transaction that replaces the previous scan's rows.
+
+Example:
+    python cheat_scan.py --window 10 --flag-players
+"""
+
+import argparse
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+from cheat_detector import GAME_WIN_PROBABILITY, DEFAULT_ALPHA, DEFAULT_MIN_ROUNDS
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Game tables scanned (CHEAT_LOG event_type uses the same names)
+GAMES = ("Blackjack", "Craps", "HighLow", "Poker", "Roulette", "Slots")
+# CHEAT_LOG rows written by this scan start with this text, so a re-scan can replace them
+SCAN_PREFIX = "Offline scan:"
+# Longest rolling window, in sessions
+DEFAULT_WINDOW = 10
+
+
+def load_sessions(db_path, game):
+    """
+    Returns (player IDs, per-row player index, wins, rounds, session numbers)
+    for every session of a game, ordered by player and session. Roulette logs a
+    cumulative row per spin, so each session's last (largest) counts are used.
+    Rows without a player ID (history of a name shared by several players) are
+    skipped.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(f"""
+            SELECT player_id, session_number, MAX(COALESCE(wins, 0)), MAX(COALESCE(number_of_bets, 0))
+            FROM {game}
+            WHERE player_id IS NOT NULL AND session_number IS NOT NULL
+            GROUP BY player_id, session_number
+            ORDER BY player_id, session_number
+        """).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return [], empty, empty, empty, empty
+    ids, sessions, wins, rounds = zip(*rows)
+    player_ids, player_index = np.unique(np.array(ids, dtype=np.int64), return_inverse=True)
+    return ([int(player_id) for player_id in player_ids], player_index.ravel(), np.array(wins, dtype=np.int64),
+            np.array(rounds, dtype=np.int64), np.array(sessions, dtype=np.int64))
+
+
+def scan_game(job):
+    """
+    Scans one game. Runs in a worker process.
+    Returns a list of (player ID, game, wins, rounds, first session, last session, z)
+    with the most suspicious window of each flagged player.
+    """
+    db_path, game, window, alpha, min_rounds = job
+    ids, player, wins, rounds, sessions = load_sessions(db_path, game)
+    if not ids:
+        return []
+    p = GAME_WIN_PROBABILITY[game]
+    z_critical = NormalDist().inv_cdf(1 - alpha)
+
+    # First row of each player's sessions, broadcast to every row
+    row = np.arange(len(player))
+    player_start = np.r_[0, np.flatnonzero(np.diff(player)) + 1]
+    first_row = player_start[player]
+    wins_total = np.r_[0, np.cumsum(wins)]
+    rounds_total = np.r_[0, np.cumsum(rounds)]
+
+    # Windows of 1 to `window` sessions of the same player end at each row;
+    # keep the one with the highest z-score so a short burst is not diluted
+    z = np.full(len(row), -np.inf)
+    window_start = row.copy()
+    window_wins = np.zeros(len(row), dtype=np.int64)
+    window_rounds = np.zeros(len(row), dtype=np.int64)
+    for length in range(1, window + 1):
+        start = np.maximum(first_row, row - length + 1)
+        # Rolling sums from cumulative sums
+        length_wins = wins_total[row + 1] - wins_total[start]
+        length_rounds = rounds_total[row + 1] - rounds_total[start]
+        # z-score of the window's win count for an honest player
+        spread = np.sqrt(np.maximum(length_rounds * p * (1 - p), 1e-12))
+        length_z = np.where(length_rounds >= min_rounds, (length_wins - length_rounds * p) / spread, -np.inf)
+        better = length_z > z
+        z = np.where(better, length_z, z)
+        window_start = np.where(better, start, window_start)
+        window_wins = np.where(better, length_wins, window_wins)
+        window_rounds = np.where(better, length_rounds, window_rounds)
+
+    suspicious = z >= z_critical
+    if not suspicious.any():
+        return []
+
+    # Keep the highest-z window of each suspicious player
+    candidates = np.flatnonzero(suspicious)
+    order = candidates[np.lexsort((-z[candidates], player[candidates]))]
+    best = order[np.r_[True, np.diff(player[order]) != 0]]
+    return [
+        (ids[player[i]], game, int(window_wins[i]), int(window_rounds[i]),
+         int(sessions[window_start[i]]), int(sessions[i]), float(z[i]))
+        for i in best
+    ]
+
+
+def run_scan(db_path=DB_PATH, games=GAMES, window=DEFAULT_WINDOW, alpha=DEFAULT_ALPHA,
+             min_rounds=DEFAULT_MIN_ROUNDS, workers=None, flag_players=False):
+    """
+    Scans every game and rewrites the offline-scan rows of CHEAT_LOG.
+    Returns the number of findings written.
+    """
+    jobs = [(db_path, game, window, alpha, min_rounds) for game in games]
+    with ProcessPoolExecutor(max_workers=workers or min(len(jobs), os.cpu_count() or 1)) as pool:
+        findings = [finding for result in pool.map(scan_game, jobs) for finding in result]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = []
+        for player_id, game, wins, rounds, first_session, last_session, z in findings:
+            details = (f"{SCAN_PREFIX} {wins}/{rounds} wins ({wins / rounds * 100:.1f}%) "
+                       f"in sessions {first_session}-{last_session}, z={z:.2f}")
+            rows.append((player_id, game, details))
+
+        # One transaction: drop the previous scan's rows and write this one
+        with conn:
+            conn.execute("DELETE FROM CHEAT_LOG WHERE details LIKE ?", (SCAN_PREFIX + "%",))
+            conn.executemany("INSERT INTO CHEAT_LOG (player_id, event_type, details) VALUES (?, ?, ?)", rows)
+            if flag_players:
+                conn.executemany("UPDATE PLAYERS SET is_flagged=1 WHERE ID=?", [(row[0],) for row in rows])
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan the full game history for suspicious win rates.")
+    parser.add_argument("--db", default=DB_PATH, help="Database to scan (default CasinoDB.db)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Longest rolling window in sessions")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="False-flag probability per window")
+    parser.add_argument("--min-rounds", type=int, default=DEFAULT_MIN_ROUNDS, help="Rounds a window needs to be judged")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per game)")
+    parser.add_argument("--flag-players", action="store_true", help="Also set PLAYERS.is_flagged for every finding")
+    args = parser.parse_args()
+
+    written = run_scan(args.db, GAMES, args.window, args.alpha, args.min_rounds,
+                       args.workers, args.flag_players)
+    print(f"Wrote {written} findings to CHEAT_LOG")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
 # Import random module to simulate dice rolls
 import random
-# Import os module to work with file paths
-import os
 # Import sqlite3 for interacting with the SQLite database
 import sqlite3
 # Import necessary widgets from PyQt6 for GUI components
@@ -9,52 +7,56 @@ from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QComboBox, QTextEdit, QMessageBox
 )
-# Import QPixmap to display dice images
-from PyQt6.QtGui import QPixmap
-# Import Qt for alignment and flags
-from PyQt6.QtCore import Qt
-# Import Matplotlib canvas for embedding plots
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-# Import Figure class to create plots
-from matplotlib.figure import Figure
 # Import the function to flag suspected cheaters
 from cheaters import log_cheater
+# Import the shared rolling-window cheat detector
+from cheat_detector import CheatDetector
+# Import the per-round journal writer
+from round_journal import record_rounds
+# Import the shared live net-winnings graph window
+from net_winnings_window import NetWinningsWindow
+# Import the shared cache of pre-scaled dice images
+from asset_cache import asset_cache, ASSET_PACK_PATH, DICE_IMAGE_FOLDER, DICE_SIZE
+# Import the precomputed bet resolution table
+from craps_bets import (
+    BET_TYPES, BET_CODES, COME_OUT_ONLY, POINT_STATES,
+    NO_DECISION, WIN, LOSS, resolve_roll
+)
 
 # Define the database path
 DB_PATH = "CasinoDB.db"
 
-# Define the folder where dice images are stored (assumes a 'dice_images' subdirectory
-# in the same directory as this script).
-DICE_IMAGE_FOLDER = os.path.join(os.path.dirname(__file__), "dice_images")
 
 
 # Define the Craps game class inheriting from QMainWindow
 class Craps(QMainWindow):
     # Constructor for Craps game
-    def __init__(self, user_id, parent_menu=None):
+    def __init__(self, session, parent_menu=None):
         # Initialize parent QMainWindow
         super().__init__()
         # Set window title
         self.setWindowTitle("Craps Game")
         # Set window size and position
         self.setGeometry(200, 200, 600, 500)
+        # Store the player's session shared by every game
+        self.session = session
         # Store player ID
-        self.user_id = user_id
+        self.user_id = session.player_id
         # Store parent menu reference
         self.parent_menu = parent_menu
         # Connect to database
         self.conn = sqlite3.connect(DB_PATH)
         # Create a cursor object
         self.cur = self.conn.cursor()
-        # Fetch player balance
-        self.balance = self.fetch_balance_from_db()
-        # Fetch player's full name
-        self.full_name = self.fetch_player_name()
-
-        # Initialize bet amount
-        self.bet = 0.0
-        # Initialize bet type
-        self.bet_type = ""
+        # Start from the balance carried by the session
+        self.balance = session.balance
+        # Player's full name, loaded once at login
+        self.full_name = session.full_name
+
+        # Active bets on the table as {bet_code: amount}
+        self.bets = {}
+        # Index into POINT_STATES (0 is the come-out roll)
+        self.point_state = 0
         # Initialize point value (None when no point is established)
         self.point = None
         # Track games won (for cheater detection)
@@ -65,10 +67,12 @@ class Craps(QMainWindow):
         self.total_bets_session = 0.0 # Renamed for clarity, total money bet in session
         # Track total winnings (actual money won, not including original bet back)
         self.total_winnings_session = 0.0 # Renamed for clarity, total money won in session
-        # Track win/loss history for cheater detection (True for win, False for loss)
-        self.session_history = []
-        # Get the next session number for this game launch
-        self.session_number = self.get_next_session_number()
+        # Rolling window of win/loss results for cheater detection
+        self.cheat_detector = CheatDetector.for_game("Craps")
+        # Settled bets (bet, payout, won) waiting to be journaled with the next save
+        self.pending_rounds = []
+        # Take the next session number for this game launch from the session counters
+        self.session_number = session.next_session_number("Craps")
 
         # Initialize self.winnings_window to None, it will be assigned when plot_net_winnings is called
         self.winnings_window = None
@@ -78,62 +82,6 @@ class Craps(QMainWindow):
         # Update the balance label
         self.update_balance_label()
 
-    # Method to fetch the player's full name from the database
-    def fetch_player_name(self):
-        try:
-            # Connect to the database (using a new connection for this specific query)
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode for better performance
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor
-                cur = conn.cursor()
-                # Execute query to get player's full name
-                cur.execute("SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?", (self.user_id,))
-                # Fetch the result
-                result = cur.fetchone()
-                # Return full name or player ID if not found
-                return result[0] if result else str(self.user_id)
-        # Handle any exceptions during database operation
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching player name: {e}")
-            # Return player ID as fallback
-            return str(self.user_id)
-
-    # Method to fetch the player's balance from the database
-    def fetch_balance_from_db(self):
-        try:
-            # Connect to the database
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor
-                cur = conn.cursor()
-                # Execute query to get player's balance
-                cur.execute("SELECT balance FROM PLAYERS WHERE ID=?", (self.user_id,))
-                # Fetch the result
-                result = cur.fetchone()
-                # Return balance as float or default to 100.0 if not found
-                return float(result[0]) if result else 100.0
-        # Handle any exceptions
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching balance: {e}")
-            # Return default balance as fallback
-            return 100.0
-
-    # Get the next session number from the database
-    def get_next_session_number(self):
-        # Query the highest session number for the player
-        self.cur.execute("""
-            SELECT MAX(session_number) FROM Craps
-            WHERE player_name = ?
-        """, (self.full_name,))
-        # Fetch the result
-        result = self.cur.fetchone()[0]
-        # Return incremented or default session number
-        return int(result) + 1 if result is not None else 1
-
     # Set up the GUI interface
     def setup_ui(self):
         # Create main widget container
@@ -159,10 +107,7 @@ class Craps(QMainWindow):
         # Dropdown for bet type selection
         self.bet_type_combo = QComboBox()
         # Add betting options
-        self.bet_type_combo.addItems([
-            "Pass Line", "Don't Pass", "Field", "Any 7",
-            "Craps", "Hard 4", "Hard 6", "Hard 8", "Big 6 & 8"
-        ])
+        self.bet_type_combo.addItems(BET_TYPES)
         # Add combo box to layout
         br.addWidget(self.bet_type_combo)
         # Create place bet button
@@ -245,14 +190,20 @@ class Craps(QMainWindow):
             QMessageBox.warning(self, "Invalid Bet", "Enter a valid amount within your balance.")
             return
 
-        # Store bet amount
-        self.bet = amt
-        # Store selected bet type
-        self.bet_type = self.bet_type_combo.currentText()
-        self.balance -= self.bet
-        self.total_bets_session += self.bet # Accumulate total money bet for the session
+        # Look up the integer code of the selected bet type
+        bet_type = self.bet_type_combo.currentText()
+        bet_code = BET_CODES[bet_type]
+        # Line bets can only be made on the come-out roll
+        if bet_code in COME_OUT_ONLY and self.point is not None:
+            QMessageBox.warning(self, "Invalid Bet", f"{bet_type} can only be placed on the come-out roll.")
+            return
+
+        # Add the amount to any bet already on this type
+        self.bets[bet_code] = self.bets.get(bet_code, 0.0) + amt
+        self.balance -= amt
+        self.total_bets_session += amt # Accumulate total money bet for the session
         self.update_balance_label()
-        self.log(f"Bet ${self.bet:.2f} on {self.bet_type}")
+        self.log(f"Bet ${amt:.2f} on {bet_type}")
         self.roll_button.setEnabled(True)
 
     # Simulate rolling two dice
@@ -266,27 +217,22 @@ class Craps(QMainWindow):
     # Update dice image labels
     def update_dice_images(self, d1, d2):
         try:
-            # Construct absolute paths for dice images using the defined folder
-            image_path1 = os.path.abspath(os.path.join(DICE_IMAGE_FOLDER, f"dice{d1}.png"))
-            image_path2 = os.path.abspath(os.path.join(DICE_IMAGE_FOLDER, f"dice{d2}.png"))
-
-            # Load image for first die and scale
-            p1 = QPixmap(image_path1).scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            # Load image for second die and scale
-            p2 = QPixmap(image_path2).scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            # Get the already-scaled pixmaps from the shared asset cache
+            p1 = asset_cache().pixmap(f"dice{d1}", DICE_SIZE)
+            p2 = asset_cache().pixmap(f"dice{d2}", DICE_SIZE)
 
             # Check if pixmaps loaded successfully
             if not p1.isNull():
                 self.die1_label.setPixmap(p1)
             else:
                 self.die1_label.setText(f"D1: {d1}") # Fallback text
-                self.log(f"Error: dice{d1}.png not found at {image_path1}")
+                self.log(f"Error: dice{d1}.png not found in {ASSET_PACK_PATH} or {DICE_IMAGE_FOLDER}")
 
             if not p2.isNull():
                 self.die2_label.setPixmap(p2)
             else:
                 self.die2_label.setText(f"D2: {d2}") # Fallback text
-                self.log(f"Error: dice{d2}.png not found at {image_path2}")
+                self.log(f"Error: dice{d2}.png not found in {ASSET_PACK_PATH} or {DICE_IMAGE_FOLDER}")
 
         except Exception as e:
             # Log error
@@ -295,204 +241,73 @@ class Craps(QMainWindow):
 
 
     def resolve_bet(self, total, d1, d2):
-        """Evaluate each bet type, pay out or lose, then finish the round."""
-        mult = 1
-        won_round = None # True for win, False for loss, None for no decision (continue rolling)
-        msg = f"Dice rolled: {d1} + {d2} = {total}. "
-
-        # Pass Line
-        if self.bet_type == "Pass Line":
-            if self.point is None: # Come-out roll
-                if total in (7, 11):
-                    won_round = True
-                    msg += "Pass Line wins!"
-                elif total in (2, 3, 12):
-                    won_round = False
-                    msg += "Craps! Pass Line loses."
-                else:
-                    self.point = total
-                    self.log(msg + f"Point is now {self.point}. Roll again.")
-                    return # Continue rolling
-            else: # Point is established
-                if total == self.point:
-                    won_round = True
-                    msg += "Point hit! Pass Line wins."
-                    self.point = None # Reset point
-                elif total == 7:
-                    won_round = False
-                    msg += "Seven-out. Pass Line loses."
-                    self.point = None # Reset point
-                else:
-                    self.log(msg + f"Point is {self.point}. Roll again.")
-                    return # Continue rolling
-
-        # Don't Pass
-        elif self.bet_type == "Don't Pass":
-            if self.point is None: # Come-out roll
-                if total in (2, 3):
-                    won_round = True
-                    msg += "Don't Pass wins!"
-                elif total == 12:
-                    won_round = None # Push
-                    msg += "Push on 12. Bet returned."
-                    self.balance += self.bet # Return original bet
-                    self.total_winnings_session += 0 # No net gain/loss
-                elif total in (7, 11):
-                    won_round = False
-                    msg += "Don't Pass loses."
-                else:
-                    self.point = total
-                    self.log(msg + f"Point is now {self.point}. Roll again.")
-                    return # Continue rolling
-            else: # Point is established
-                if total == self.point:
-                    won_round = False
-                    msg += "Point hit. Don't Pass loses."
-                    self.point = None # Reset point
-                elif total == 7:
-                    won_round = True
-                    msg += "Seven-out! Don't Pass wins."
-                    self.point = None # Reset point
-                else:
-                    self.log(msg + f"Point is {self.point}. Roll again.")
-                    return # Continue rolling
-
-        # Field
-        elif self.bet_type == "Field":
-            if total in (3, 4, 9, 10, 11):
-                won_round = True
-                msg += "Field bet wins 1:1!"
-                mult = 1
-            elif total in (2, 12):
-                won_round = True
-                msg += "Field bet wins 2:1!"
-                mult = 2
-            else:
-                won_round = False
-                msg += "Field bet loses."
-
-        # Any 7
-        elif self.bet_type == "Any 7":
-            if total == 7:
-                won_round = True
-                msg += "Any 7 wins 4:1!"
-                mult = 4
-            else:
-                won_round = False
-                msg += "Any 7 loses."
-
-        # Craps
-        elif self.bet_type == "Craps":
-            if total in (2, 3, 12):
-                won_round = True
-                msg += "Craps wins 7:1!"
-                mult = 7
-            else:
-                won_round = False
-                msg += "Craps loses."
-
-        # Hard 4
-        elif self.bet_type == "Hard 4":
-            if total == 4 and d1 == d2:
-                won_round = True
-                msg += "Hard 4 hits! Pays 7:1"
-                mult = 7
-            elif total == 4 and d1 != d2:
-                won_round = False
-                msg += "Easy 4 hit. Hard 4 loses."
-            elif total == 7:
-                won_round = False
-                msg += "Seven-out. Hard 4 loses."
-            else:
-                self.log(msg + "No decision; roll again for Hard 4.")
-                return
-
-        # Hard 6
-        elif self.bet_type == "Hard 6":
-            if total == 6 and d1 == d2:
-                won_round = True
-                msg += "Hard 6 hits! Pays 9:1"
-                mult = 9
-            elif total == 6 and d1 != d2:
-                won_round = False
-                msg += "Easy 6 hit. Hard 6 loses."
-            elif total == 7:
-                won_round = False
-                msg += "Seven-out. Hard 6 loses."
-            else:
-                self.log(msg + "No decision; roll again for Hard 6.")
-                return
-
-        # Hard 8
-        elif self.bet_type == "Hard 8":
-            if total == 8 and d1 == d2:
-                won_round = True
-                msg += "Hard 8 hits! Pays 9:1"
-                mult = 9
-            elif total == 8 and d1 != d2:
-                won_round = False
-                msg += "Easy 8 hit. Hard 8 loses."
-            elif total == 7:
-                won_round = False
-                msg += "Seven-out. Hard 8 loses."
-            else:
-                self.log(msg + "No decision; roll again for Hard 8.")
-                return
-
-        # Big 6 & 8 (This bet is typically placed on the come-out roll and stays until 7-out or 6/8 hit)
-        # For simplicity, implementing as a one-roll bet here.
-        elif self.bet_type == "Big 6 & 8":
-            if total in (6, 8):
-                won_round = True
-                msg += "Big 6 & 8 wins 1:1!"
-                mult = 1
-            else:
-                won_round = False
-                msg += "Big 6 & 8 loses."
-
-        # Apply result
-        if won_round is True:
-            self.win(msg, multiplier=mult)
-            self.games_won += 1
-            self.session_history.append(True) # Record win for cheater detection
-        elif won_round is False:
-            self.log(msg + f" You lost ${self.bet:.2f}.")
-            self.games_lost += 1
-            self.session_history.append(False) # Record loss for cheater detection
-        else: # This case handles pushes (like Don't Pass on 12) where bet is returned
-            self.log(msg)
-            self.session_history.append(False) # Treat push as non-win for cheater detection
+        """Settle every active bet against this roll using the precomputed table."""
+        msg = f"Dice rolled: {d1} + {d2} = {total}."
+        self.log(msg)
+        # Look up the result of every active bet and the next point state
+        self.point_state, settled = resolve_roll(self.point_state, d1, d2, self.bets)
+        self.point = POINT_STATES[self.point_state]
+
+        # Number of bets that reached a decision on this roll
+        decided = 0
+        # Apply each bet's result
+        for bet_code, amount, result, mult, bet_msg in settled:
+            if result == NO_DECISION:
+                self.log(f"  {bet_msg}")
+                continue
+            # The bet is settled, so remove it from the table
+            del self.bets[bet_code]
+            decided += 1
+            if result == WIN:
+                self.win(amount, f"  {bet_msg}", multiplier=mult)
+                self.games_won += 1
+                self.cheat_detector.record(True) # Record win for cheater detection
+                self.pending_rounds.append((amount, amount + amount * mult, True))
+            elif result == LOSS:
+                self.log(f"  {bet_msg} You lost ${amount:.2f}.")
+                self.games_lost += 1
+                self.cheat_detector.record(False) # Record loss for cheater detection
+                self.pending_rounds.append((amount, 0.0, False))
+            else: # Pushes (like Don't Pass on 12) return the original bet
+                self.balance += amount
+                self.log(f"  {bet_msg}")
+                self.cheat_detector.record(False) # Treat push as non-win for cheater detection
+                self.pending_rounds.append((amount, amount, False))
+
+        # Nothing was decided on this roll, keep rolling
+        if decided == 0:
+            return
 
         self.finish_round()
 
         # Cheater detection logic
-        if len(self.session_history) >= 20: # Check if enough games have been played
-            recent_results = self.session_history[-20:] # Get the last 20 results
-            win_rate = sum(recent_results) / 20.0 # Calculate win rate
-            if win_rate >= 0.8: # If win rate is 80% or higher
-                # Log the player as a cheater
-                log_cheater(self.user_id, "Craps", win_rate)
-                # Show a warning message to the player
-                QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last 20 games and have been flagged.")
-                # Return to the main menu
-                self.back_to_menu()
-                return # Exit the method early
-
-
-    def win(self, message, multiplier=1):
+        if self.cheat_detector.flagged: # Recent win count too unlikely for an honest player
+            win_rate = self.cheat_detector.win_rate # Win rate over the detector's window
+            rounds = self.cheat_detector.rounds # Games in the window
+            # Log the player as a cheater
+            log_cheater(self.user_id, "Craps", win_rate, rounds)
+            # Show a warning message to the player
+            QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last {rounds} games and have been flagged.")
+            # Return to the main menu
+            self.back_to_menu()
+            return # Exit the method early
+
+
+    def win(self, amount, message, multiplier=1):
         # Payout is original bet + (bet * multiplier)
-        payout = self.bet + (self.bet * multiplier)
+        payout = amount + (amount * multiplier)
         self.balance += payout
         # Only add the profit (bet * multiplier) to total_winnings_session
-        self.total_winnings_session += (self.bet * multiplier)
-        self.log(message + f" You won ${self.bet * multiplier:.2f}!")
+        self.total_winnings_session += (amount * multiplier)
+        self.log(message + f" You won ${amount * multiplier:.2f}!")
 
 
     def finish_round(self):
-        self.roll_button.setEnabled(False)
+        # Keep rolling while bets are still waiting for a decision
+        self.roll_button.setEnabled(bool(self.bets))
         self.update_balance_label()
         self.save_user()
-        if self.balance <= 0:
+        if self.balance <= 0 and not self.bets:
             QMessageBox.information(self, "Game Over", "You are out of money.")
             # Optionally, reset game state or return to main menu if out of money
             self.back_to_menu()
@@ -505,7 +320,7 @@ class Craps(QMainWindow):
             self.cur.execute("UPDATE PLAYERS SET balance=? WHERE ID=?", (self.balance, self.user_id))
 
             # Check if an entry for the current session_number and player exists in Craps table
-            self.cur.execute("SELECT 1 FROM Craps WHERE player_name=? AND session_number=?", (self.full_name, self.session_number))
+            self.cur.execute("SELECT 1 FROM Craps WHERE player_id=? AND session_number=?", (self.user_id, self.session_number))
             exists = self.cur.fetchone()
 
             # If an entry exists, update it
@@ -516,21 +331,22 @@ class Craps(QMainWindow):
                         bet_amount = ?,
                         wins = ?,
                         money_won = ?
-                    WHERE player_name = ? AND session_number = ?
+                    WHERE player_id = ? AND session_number = ?
                 """, (
                     self.games_won + self.games_lost, # total rounds played in this session
                     self.total_bets_session, # total money bet in this session
                     self.games_won,
                     self.total_winnings_session, # This now correctly represents accumulated profit
-                    self.full_name,
+                    self.user_id,
                     self.session_number
                 ))
             # If no entry exists, insert a new one
             else:
                 self.cur.execute("""
-                    INSERT INTO Craps (player_name, number_of_bets, bet_amount, wins, money_won, session_number)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO Craps (player_id, player_name, number_of_bets, bet_amount, wins, money_won, session_number)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (
+                    self.user_id,
                     self.full_name,
                     self.games_won + self.games_lost,
                     self.total_bets_session,
@@ -538,8 +354,12 @@ class Craps(QMainWindow):
                     self.total_winnings_session, # This now correctly represents accumulated profit
                     self.session_number
                 ))
+            # Journal the bets settled since the last save in the same transaction
+            record_rounds(self.cur, "Craps", self.user_id, self.full_name, self.session_number, self.pending_rounds)
             # Commit changes
             self.conn.commit()
+            self.pending_rounds.clear()
+            self.session.balance = self.balance
         except Exception as e:
             print(f"DB Save Error: {e}")
             QMessageBox.critical(self, "Database Error", f"Failed to save game data: {e}")
@@ -558,86 +378,16 @@ class Craps(QMainWindow):
     # Plot cumulative net winnings by session
     def plot_net_winnings(self):
         try:
-            # Query session data
-            self.cur.execute("""
-                SELECT session_number, money_won, bet_amount FROM Craps
-                WHERE player_name = ?
-                ORDER BY session_number ASC
-            """, (self.full_name,))
-            # Fetch all matching rows
-            rows = self.cur.fetchall()
-
+            # Graph window that follows new sessions live (net: money_won (profit) - bet_amount (money lost))
+            # Ensure this is an instance variable to prevent premature garbage collection
+            self.winnings_graph_window = NetWinningsWindow(
+                "Net Winnings - Craps", "Cumulative Net Winnings - Craps",
+                self.user_id, [("Craps", "money_won - bet_amount")], color='green')
             # If no session data found
-            if not rows:
+            if not self.winnings_graph_window.has_data():
                 # Notify no data
                 QMessageBox.information(self, "No Data", "No winnings history available for this player.")
                 return
-
-            # List to track cumulative net winnings
-            cumulative = []
-            # List to track session numbers
-            session_numbers = []
-            # Running total of net winnings - UPDATED CALCULATION
-            total_net_winnings = 0.0
-
-            # Loop through session data
-            for session_number, money_won_db, bet_amount_db in rows:
-                # Ensure session number exists
-                if session_number is not None:
-                    # Calculate net gain/loss for this session: money_won (profit) - bet_amount (money lost)
-                    # UPDATED: Now calculates as money_won minus money_lost (bet_amount represents money lost)
-                    net_for_session = money_won_db - bet_amount_db
-                    # Update cumulative total
-                    total_net_winnings += net_for_session
-                    # Store cumulative value
-                    cumulative.append(total_net_winnings)
-                    # Track session number
-                    session_numbers.append(int(session_number))
-
-            # Create window to show graph
-            # Ensure this is an instance variable to prevent premature garbage collection
-            self.winnings_graph_window = QWidget()
-            # Set window title
-            self.winnings_graph_window.setWindowTitle("Net Winnings - Craps")
-            # Set window size
-            self.winnings_graph_window.setGeometry(150, 150, 600, 400)
-
-            # Create vertical layout
-            layout = QVBoxLayout()
-            # Set layout
-            self.winnings_graph_window.setLayout(layout)
-
-            # Create Matplotlib figure
-            figure = Figure()
-            # Create canvas for figure
-            canvas = FigureCanvas(figure)
-            # Create subplot
-            ax = figure.add_subplot(111)
-            # Plot winnings
-            ax.plot(session_numbers, cumulative, marker='o', color='green')
-            # Set chart title
-            ax.set_title("Cumulative Net Winnings - Craps")
-            # Label X axis
-            ax.set_xlabel("Session Number")
-            # Label Y axis
-            ax.set_ylabel("Net Winnings ($)")
-            # Enable grid
-            ax.grid(True)
-            # Set x-axis ticks
-            ax.set_xticks(session_numbers)
-
-            # Create label for total net winnings - UPDATED CALCULATION
-            total_label = QLabel(f"Total Net Winnings: ${total_net_winnings:.2f}")
-            # Center-align the label
-            total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            # Add canvas to layout
-            layout.addWidget(canvas)
-            # Add total label to layout
-            layout.addWidget(total_label)
-
-            # Ensure widget is deleted on close
-            self.winnings_graph_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
             # Show the graph window
             self.winnings_graph_window.show()
         except Exception as e:
@@ -0,0 +1,168 @@
+# craps_bets.py
+
+"""
+Precomputed resolution table for the Craps bets offered by the game.
+
+Every combination of (point state, dice outcome, bet type) is resolved once at
+import time, so a roll is settled by indexing into RESOLUTION for each active
+bet instead of walking an if/elif chain on the bet-type string.
+"""
+
+# Bet types in the order they are offered in the Craps bet-type dropdown.
+# The index of a name in this tuple is the integer code used by the table.
+BET_TYPES = (
+    "Pass Line", "Don't Pass", "Field", "Any 7",
+    "Craps", "Hard 4", "Hard 6", "Hard 8", "Big 6 & 8"
+)
+# Integer codes for each bet type
+PASS_LINE, DONT_PASS, FIELD, ANY_7, CRAPS, HARD_4, HARD_6, HARD_8, BIG_6_8 = range(len(BET_TYPES))
+# Map bet-type names to their integer codes (used once when a bet is placed)
+BET_CODES = {name: code for code, name in enumerate(BET_TYPES)}
+# Line bets: the only bets that establish a point
+LINE_BETS = frozenset((PASS_LINE, DONT_PASS))
+# Bets that may only be placed on a come-out roll (no point established)
+COME_OUT_ONLY = LINE_BETS
+
+# Point states: index 0 is the come-out roll, the rest are the established point
+POINT_STATES = (None, 4, 5, 6, 8, 9, 10)
+# Map a point value (or None) to its state index
+POINT_INDEX = {point: index for index, point in enumerate(POINT_STATES)}
+
+# Possible results for a bet on a given roll
+NO_DECISION = 0  # The bet stays on the table for the next roll
+WIN = 1          # The bet wins and pays its multiplier
+LOSS = 2         # The bet loses
+PUSH = 3         # The bet is returned to the player
+
+
+def outcome_index(d1, d2):
+    """Returns the table index (0-35) of a roll of two dice."""
+    return (d1 - 1) * 6 + (d2 - 1)
+
+
+def _resolve(bet, point, d1, d2):
+    """
+    Resolves a single bet against a single roll with the original game rules.
+    Returns a tuple of (result, multiplier, message).
+    """
+    total = d1 + d2
+
+    # Pass Line
+    if bet == PASS_LINE:
+        if point is None:  # Come-out roll
+            if total in (7, 11):
+                return WIN, 1, "Pass Line wins!"
+            if total in (2, 3, 12):
+                return LOSS, 0, "Craps! Pass Line loses."
+            return NO_DECISION, 0, f"Point is now {total}. Roll again."
+        if total == point:
+            return WIN, 1, "Point hit! Pass Line wins."
+        if total == 7:
+            return LOSS, 0, "Seven-out. Pass Line loses."
+        return NO_DECISION, 0, f"Point is {point}. Roll again."
+
+    # Don't Pass
+    if bet == DONT_PASS:
+        if point is None:  # Come-out roll
+            if total in (2, 3):
+                return WIN, 1, "Don't Pass wins!"
+            if total == 12:
+                return PUSH, 0, "Push on 12. Bet returned."
+            if total in (7, 11):
+                return LOSS, 0, "Don't Pass loses."
+            return NO_DECISION, 0, f"Point is now {total}. Roll again."
+        if total == point:
+            return LOSS, 0, "Point hit. Don't Pass loses."
+        if total == 7:
+            return WIN, 1, "Seven-out! Don't Pass wins."
+        return NO_DECISION, 0, f"Point is {point}. Roll again."
+
+    # Field
+    if bet == FIELD:
+        if total in (3, 4, 9, 10, 11):
+            return WIN, 1, "Field bet wins 1:1!"
+        if total in (2, 12):
+            return WIN, 2, "Field bet wins 2:1!"
+        return LOSS, 0, "Field bet loses."
+
+    # Any 7
+    if bet == ANY_7:
+        if total == 7:
+            return WIN, 4, "Any 7 wins 4:1!"
+        return LOSS, 0, "Any 7 loses."
+
+    # Craps
+    if bet == CRAPS:
+        if total in (2, 3, 12):
+            return WIN, 7, "Craps wins 7:1!"
+        return LOSS, 0, "Craps loses."
+
+    # Hardways stay up until the hard number, the easy number or a seven rolls
+    if bet in (HARD_4, HARD_6, HARD_8):
+        number, pays = {HARD_4: (4, 7), HARD_6: (6, 9), HARD_8: (8, 9)}[bet]
+        if total == number and d1 == d2:
+            return WIN, pays, f"Hard {number} hits! Pays {pays}:1"
+        if total == number:
+            return LOSS, 0, f"Easy {number} hit. Hard {number} loses."
+        if total == 7:
+            return LOSS, 0, f"Seven-out. Hard {number} loses."
+        return NO_DECISION, 0, f"No decision; roll again for Hard {number}."
+
+    # Big 6 & 8 (resolved as a one-roll bet)
+    if total in (6, 8):
+        return WIN, 1, "Big 6 & 8 wins 1:1!"
+    return LOSS, 0, "Big 6 & 8 loses."
+
+
+def _next_point(point, total):
+    """Returns the point state that follows a roll of `total` at `point`."""
+    if point is None:
+        return total if total in (4, 5, 6, 8, 9, 10) else None
+    if total == point or total == 7:
+        return None
+    return point
+
+
+def _build_tables():
+    """Builds the resolution and point-transition tables."""
+    resolution = []
+    transitions = []
+    for point in POINT_STATES:
+        by_outcome = []
+        next_states = []
+        for d1 in range(1, 7):
+            for d2 in range(1, 7):
+                # One (result, multiplier, message) entry per bet type
+                by_outcome.append(tuple(_resolve(bet, point, d1, d2) for bet in range(len(BET_TYPES))))
+                next_states.append(POINT_INDEX[_next_point(point, d1 + d2)])
+        resolution.append(tuple(by_outcome))
+        transitions.append(tuple(next_states))
+    return tuple(resolution), tuple(transitions)
+
+
+# RESOLUTION[point_state][outcome][bet] -> (result, multiplier, message)
+# NEXT_POINT[point_state][outcome] -> next point_state
+RESOLUTION, NEXT_POINT = _build_tables()
+
+
+def resolve_roll(point_state, d1, d2, bets):
+    """
+    Settles every active bet against one roll of the dice. The point only
+    moves while a line bet is on the table, so rolls with nothing but Field or
+    proposition bets leave the game on the come-out roll.
+
+    Args:
+        point_state (int): Index into POINT_STATES for the current point.
+        d1 (int), d2 (int): The two dice.
+        bets (dict): Active bets as {bet_code: amount}.
+    Returns:
+        tuple: (next_point_state, settled) where settled is a list of
+        (bet_code, amount, result, multiplier, message) for every bet,
+        including the ones with NO_DECISION.
+    """
+    outcome = outcome_index(d1, d2)
+    row = RESOLUTION[point_state][outcome]
+    settled = [(bet, amount) + row[bet] for bet, amount in bets.items()]
+    if LINE_BETS.isdisjoint(bets):
+        return point_state, settled
+    return NEXT_POINT[point_state][outcome], settled
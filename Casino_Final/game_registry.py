@@ -0,0 +1,40 @@
+# game_registry.py
+
+"""
+Registry of the casino games, imported on first use.
+
+Each game module pulls in its own GUI toolkit pieces (Blackjack brings in
+tkinter), its images and the graph code, so importing all of them up front
+made the login window wait for every game. The main menu asks the registry for
+a game's class when its button is clicked; the module is imported then and
+kept for the rest of the run.
+"""
+
+import importlib
+
+# Game key -> (module, class) of its window
+GAMES = {
+    "roulette": ("roulette", "RouletteGame"),
+    "craps": ("craps", "Craps"),
+    "blackjack": ("blackjack", "Blackjack"),
+    "highlow": ("highlow", "HighLowGame"),
+    "slots": ("slots", "SlotsGame"),
+    "poker": ("poker", "Poker"),
+}
+
+# Classes already imported, by game key
+_loaded = {}
+
+
+def game_class(key):
+    """Returns a game's window class, importing its module the first time."""
+    cls = _loaded.get(key)
+    if cls is None:
+        module_name, class_name = GAMES[key]
+        cls = _loaded[key] = getattr(importlib.import_module(module_name), class_name)
+    return cls
+
+
+def is_loaded(key):
+    """Whether a game's module has already been imported."""
+    return key in _loaded
@@ -1,50 +1,34 @@
 # Import necessary modules for GUI, random operations, database, and plotting
 import sys
-import random
 import sqlite3
-import os
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QLineEdit, QMessageBox
 )
-from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt, QTimer
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 # Import the cheaters logging function
 from cheaters import log_cheater
+# Import the shared rolling-window cheat detector
+from cheat_detector import CheatDetector
+# Import the per-round journal writer
+from round_journal import record_rounds
+# Import the shared live net-winnings graph window
+from net_winnings_window import NetWinningsWindow
+# Import the shared cache of pre-scaled card images
+from asset_cache import asset_cache, ASSET_PACK_PATH, CARD_IMAGE_FOLDER
+# Import the composition-tracking shoe (cards are int codes; Ace is high)
+from highlow_shoe import Shoe, card_rank, card_label, card_image_name, fair_multiplier
 
 # Define the database path
 DB_PATH = "CasinoDB.db"
 
-# Card setup: Define suits and ranks for a standard deck
-suits = ['hearts', 'diamonds', 'clubs', 'spades']
-ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-# Map ranks to numerical values for comparison in High/Low game.
-# Ace (A) is typically the highest in High/Low.
-rank_values = {
-    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9, '10': 10,
-    'J': 11, 'Q': 12, 'K': 13, 'A': 14
-}
-
-# Define the folder where card images are stored
-CARD_IMAGE_FOLDER = os.path.join(os.path.dirname(__file__), "Cards")
-
-# Function to create and shuffle a deck of cards
-def create_shuffled_deck(num_decks=4):
-    deck = []
-    # Loop to create multiple decks
-    for _ in range(num_decks):
-        # Create card strings in "Rank of Suit" format (e.g., "Ace of Spades")
-        deck += [f"{rank} of {suit}" for suit in suits for rank in ranks]
-    # Shuffle the combined deck
-    random.shuffle(deck)
-    return deck
+# Streak multiplier growth: a win on streak n pays bet * STREAK_GROWTH ** (n - 1)
+STREAK_GROWTH = 1.3
 
 # HighLowGame class, inheriting from QWidget for GUI capabilities
 class HighLowGame(QWidget):
     # Constructor for the HighLow game
-    def __init__(self, player_id, parent_menu=None):
+    def __init__(self, session, parent_menu=None):
         # Call the parent QWidget constructor
         super().__init__()
         # Set the window title
@@ -52,8 +36,10 @@ class HighLowGame(QWidget):
         # Set the window's position and size
         self.setGeometry(500, 200, 400, 600) # Adjusted geometry for better layout
 
+        # Store the player's session shared by every game
+        self.session = session
         # Store the player's ID
-        self.player_id = player_id
+        self.player_id = session.player_id
         # Store a reference to the parent menu for navigation
         self.parent_menu = parent_menu
 
@@ -62,13 +48,13 @@ class HighLowGame(QWidget):
         # Create a cursor object for executing SQL queries
         self.cur = self.conn.cursor()
 
-        # Fetch player's current balance from the database
-        self.balance = self.fetch_balance_from_db()
-        # Fetch the player's full name from the database
-        self.full_name = self.fetch_player_name()
+        # Start from the balance carried by the session
+        self.balance = session.balance
+        # Player's full name, loaded once at login
+        self.full_name = session.full_name
 
         # Game state variables for the current streak
-        self.last_card = None # Stores the previously drawn card
+        self.last_card = None # Stores the previously drawn card (int code, see highlow_shoe)
         self.cashout = 0.0 # Winnings accumulated in the current winning streak
         self.cards_dealt_in_streak = 0 # Number of consecutive correct guesses (streak length)
 
@@ -78,19 +64,22 @@ class HighLowGame(QWidget):
         # Define the threshold for reshuffling (25% of total cards remaining)
         self.shuffle_threshold = int(self.total_cards_in_full_deck * 0.25)
 
-        # Create and shuffle the initial deck
-        self.deck = create_shuffled_deck(self.num_decks)
+        # Create and shuffle the initial shoe (deal order plus per-rank counts)
+        self.shoe = Shoe(self.num_decks)
 
         # Session tracking variables for database logging (per game launch)
-        self.session_number = self.get_next_session_number() # Get a new session number for this launch
+        self.session_number = self.session.next_session_number("HighLow") # Take a new session number for this launch from the session counters
         self.total_winnings_session = 0.0 # Total cashed-out winnings for this entire game launch
         self.total_bets_session = 0.0 # Total money bet in this game launch
         self.wins_session = 0 # Total rounds won in this game launch (for cheater detection)
         self.losses_session = 0 # Total rounds lost in this game launch (for cheater detection)
-        self.session_history = [] # Stores win/loss (True/False) for cheater detection
+        self.cheat_detector = CheatDetector.for_game("HighLow") # Rolling window of win/loss results for cheater detection
+        self.pending_rounds = [] # Rounds (bet, payout, won) waiting to be journaled with the next save
 
         # Initialize self.graph_window to None, it will be assigned when plot_net_winnings is called
         self.graph_window = None
+        # Whether a missing card image has already been reported in this window
+        self.image_error_shown = False
 
         # Set up the graphical user interface elements
         self.setup_ui()
@@ -101,70 +90,6 @@ class HighLowGame(QWidget):
         self.show()
 
 
-    # Method to fetch the player's full name from the database
-    def fetch_player_name(self):
-        try:
-            # Connect to the database (using a new connection for this specific query)
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode for better performance
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor
-                cur = conn.cursor()
-                # Execute query to get player's full name
-                cur.execute("SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?", (self.player_id,))
-                # Fetch the result
-                result = cur.fetchone()
-                # Return full name or player ID if not found
-                return result[0] if result else str(self.player_id)
-        # Handle any exceptions during database operation
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching player name: {e}")
-            # Return player ID as fallback
-            return str(self.player_id)
-
-    # Method to fetch the player's balance from the database
-    def fetch_balance_from_db(self):
-        try:
-            # Connect to the database
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor
-                cur = conn.cursor()
-                # Execute query to get player's balance
-                cur.execute("SELECT balance FROM PLAYERS WHERE ID=?", (self.player_id,))
-                # Fetch the result
-                result = cur.fetchone()
-                # Return balance as float or default to 100.0 if not found
-                return float(result[0]) if result else 100.0
-        # Handle any exceptions
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching balance: {e}")
-            # Return default balance as fallback
-            return 100.0
-
-    # Method to get the next available session number for the player in HighLow game
-    def get_next_session_number(self):
-        try:
-            # Execute query to find the maximum session number for the current player
-            self.cur.execute("""
-                SELECT MAX(session_number)
-                FROM HighLow
-                WHERE player_name=?
-            """, (self.full_name,))
-            # Fetch the result
-            result = self.cur.fetchone()
-            # Return max session number + 1, or 1 if no previous sessions
-            return (result[0] or 0) + 1
-        # Handle any exceptions
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching next session number: {e}")
-            # Return 1 as fallback
-            return 1
-
     # Method to set up the graphical user interface
     def setup_ui(self):
         # Create the main vertical layout for the window
@@ -202,6 +127,13 @@ class HighLowGame(QWidget):
         # Add to layout
         layout.addWidget(self.cards_dealt_label)
 
+        # Label showing the exact odds of the next card from the shoe's composition
+        self.odds_label = QLabel("")
+        # Apply CSS styling
+        self.odds_label.setStyleSheet("font-size: 14px; color: #555;")
+        # Add to layout
+        layout.addWidget(self.odds_label)
+
         # QLineEdit for entering bet amount
         self.bet_input = QLineEdit()
         # Set placeholder text
@@ -302,14 +234,29 @@ class HighLowGame(QWidget):
     def update_balance_label(self):
         self.balance_label.setText(f"Balance: ${self.balance:.2f}")
 
+    # Method to show the exact higher/lower/tie odds for the current card
+    def update_odds_label(self):
+        # No odds to show without a current card
+        if self.last_card is None:
+            self.odds_label.setText("")
+            return
+        p_higher, p_lower, p_tie = self.shoe.probabilities(self.last_card)
+        # What the next correct guess would pay, for comparison with the fair price
+        next_multiplier = STREAK_GROWTH ** self.cards_dealt_in_streak
+        self.odds_label.setText(
+            f"Higher {p_higher*100:.1f}% (fair {fair_multiplier(p_higher):.2f}x) | "
+            f"Lower {p_lower*100:.1f}% (fair {fair_multiplier(p_lower):.2f}x) | "
+            f"Tie {p_tie*100:.1f}% | Next win pays {next_multiplier:.2f}x"
+        )
+
     # Method to check if the deck needs reshuffling and perform it
     def check_and_shuffle_deck(self):
         # If the number of cards remaining in the deck is below the shuffle threshold
-        if len(self.deck) <= self.shuffle_threshold:
+        if len(self.shoe) <= self.shuffle_threshold:
             # Update status label to inform user about reshuffling
             self.status_label.setText("Deck low - reshuffling!")
-            # Create a new shuffled deck
-            self.deck = create_shuffled_deck(self.num_decks)
+            # Refill and shuffle the shoe
+            self.shoe.shuffle()
             # Reset streak-related variables after reshuffle
             self.cards_dealt_in_streak = 0
             self.cashout = 0.0
@@ -318,6 +265,7 @@ class HighLowGame(QWidget):
             self.cards_dealt_label.setText(f"Streak: {self.cards_dealt_in_streak}")
             self.cashout_button.setText(f"Cash Out ${self.cashout:.2f}")
             self.show_card_image(None) # Clear the displayed card image
+            self.update_odds_label()
             # Use a QTimer to display a message after a short delay
             QTimer.singleShot(1500, lambda: self.status_label.setText("Deck reshuffled. Draw a new starting card."))
             # Disable guess buttons until a new starting card is drawn
@@ -331,7 +279,7 @@ class HighLowGame(QWidget):
         self.check_and_shuffle_deck()
 
         # If the deck is empty after checking/reshuffling
-        if not self.deck:
+        if not self.shoe:
             self.status_label.setText("Deck is empty! Please restart the game.")
             return
 
@@ -343,14 +291,16 @@ class HighLowGame(QWidget):
         self.cards_dealt_label.setText(f"Streak: {self.cards_dealt_in_streak}")
         self.cashout_button.setEnabled(False) # Disable cashout until there's a win
 
-        # Draw a card from the deck
-        card = self.deck.pop()
+        # Draw a card from the shoe
+        card = self.shoe.draw()
         # Display the drawn card image
         self.show_card_image(card)
         # Update status message
-        self.status_label.setText(f"Current card: {card}. Guess Higher or Lower?")
+        self.status_label.setText(f"Current card: {card_label(card)}. Guess Higher or Lower?")
         # Set the drawn card as the last_card for the next guess
         self.last_card = card
+        # Show the odds for the next card
+        self.update_odds_label()
         # Enable guess buttons
         self.toggle_guess_buttons(True)
         # Disable the draw button until a guess is made or streak ends
@@ -383,7 +333,7 @@ class HighLowGame(QWidget):
     # Method to process the player's guess (Higher or Lower)
     def make_guess(self, expect_higher):
         # If no starting card has been drawn, prompt user
-        if not self.last_card:
+        if self.last_card is None:
             self.status_label.setText("Draw a starting card first!")
             return
 
@@ -404,20 +354,22 @@ class HighLowGame(QWidget):
         self.check_and_shuffle_deck()
 
         # If deck is empty after reshuffle check
-        if not self.deck:
+        if not self.shoe:
             self.status_label.setText("Deck is empty! Please restart the game.")
             self.toggle_guess_buttons(False)
             self.draw_button.setEnabled(True)
             return
 
         # Draw the new card
-        new_card = self.deck.pop()
+        new_card = self.shoe.draw()
         # Display the new card image
         self.show_card_image(new_card)
+        # Display text of the new card
+        new_card_text = card_label(new_card)
 
-        # Get numerical values of the last card and the new card
-        rank1_value = rank_values[self.last_card.split()[0]]
-        rank2_value = rank_values[new_card.split()[0]]
+        # Get the rank values of the last card and the new card
+        rank1_value = card_rank(self.last_card)
+        rank2_value = card_rank(new_card)
 
         # Determine if the guess was correct
         win_round = False
@@ -428,14 +380,16 @@ class HighLowGame(QWidget):
 
         # Handle ties (new card has same value as last card)
         if rank2_value == rank1_value:
-            self.status_label.setText(f"Rolled: {new_card}. It's a tie! No win or loss. Streak reset.")
-            self.session_history.append(False) # Treat tie as non-win for cheater detection
+            self.status_label.setText(f"Rolled: {new_card_text}. It's a tie! No win or loss. Streak reset.")
+            self.cheat_detector.record(False) # Treat tie as non-win for cheater detection
+            self.pending_rounds.append((bet, 0.0, False)) # A tie loses the bet
             self.cards_dealt_in_streak = 0 # Reset streak on tie
             self.cashout = 0.0 # Reset cashout
             # Update UI for reset streak
             self.cashout_button.setText(f"Cash Out ${self.cashout:.2f}")
             self.cards_dealt_label.setText(f"Streak: {self.cards_dealt_in_streak}")
             self.last_card = None # Force new starting card after tie
+            self.update_odds_label()
             # Disable guess buttons, enable draw button
             self.toggle_guess_buttons(False)
             self.draw_button.setEnabled(True)
@@ -448,27 +402,29 @@ class HighLowGame(QWidget):
             # Multiplier calculation: 1 * (1 + 0.3) ^ (cards_dealt_in_streak - 1)
             # For streak 1 (first correct guess), exponent is 0, multiplier is 1.0
             # For streak 2 (second correct guess), exponent is 1, multiplier is 1.3
-            multiplier = (1 + 0.3) ** (self.cards_dealt_in_streak - 1)
+            multiplier = STREAK_GROWTH ** (self.cards_dealt_in_streak - 1)
             # Calculate winnings from this specific bet
             current_winnings_from_bet = bet * multiplier
 
             self.cashout += current_winnings_from_bet # Add to current streak's cashout
             # Update status message with win details and current streak winnings
-            self.status_label.setText(f"Rolled: {new_card}. Winner! Streak: {self.cards_dealt_in_streak}. Current Winnings: ${self.cashout:.2f}")
+            self.status_label.setText(f"Rolled: {new_card_text}. Winner! Streak: {self.cards_dealt_in_streak}. Current Winnings: ${self.cashout:.2f}")
             self.cashout_button.setEnabled(True) # Enable cashout button
             self.wins_session += 1 # Increment total wins for this game launch
             # self.total_winnings_session += current_winnings_from_bet # REMOVED: Winnings only added on cashout
-            self.session_history.append(True) # Record win for cheater detection
+            self.cheat_detector.record(True) # Record win for cheater detection
+            self.pending_rounds.append((bet, 0.0, True)) # Winnings go to the pot, paid out on cash out
             self.last_card = new_card # Continue streak: new card becomes the last card
             # Guess buttons remain enabled for the next guess in the streak
         # If the player lost the guess
         else:
-            self.status_label.setText(f"Rolled: {new_card}. You lost the bet. Streak reset.")
+            self.status_label.setText(f"Rolled: {new_card_text}. You lost the bet. Streak reset.")
             self.cashout = 0.0 # Reset cashout on loss
             self.cards_dealt_in_streak = 0 # Reset streak on loss
             self.cashout_button.setEnabled(False) # Disable cashout
             self.losses_session += 1 # Increment total losses for this game launch
-            self.session_history.append(False) # Record loss for cheater detection
+            self.cheat_detector.record(False) # Record loss for cheater detection
+            self.pending_rounds.append((bet, 0.0, False))
             self.last_card = None # Force new starting card after loss
             # Disable guess buttons, enable draw button
             self.toggle_guess_buttons(False)
@@ -477,11 +433,12 @@ class HighLowGame(QWidget):
         # Update UI elements
         self.cards_dealt_label.setText(f"Streak: {self.cards_dealt_in_streak}")
         self.cashout_button.setText(f"Cash Out ${self.cashout:.2f}")
+        self.update_odds_label()
 
         # Check for game over (balance <= 0)
         if self.balance <= 0:
             QMessageBox.information(self, "Game Over", "You ran out of money! Game resetting.")
-            self.balance = self.fetch_balance_from_db() # Reload balance or set a default
+            self.balance = self.session.balance # Reload the last saved balance
             self.update_balance_label()
             self.status_label.setText("Game over. Please deposit more funds or restart.")
             self.toggle_guess_buttons(False) # Disable all action buttons
@@ -491,17 +448,16 @@ class HighLowGame(QWidget):
             self.save_user() # Save user data to DB after each round
 
         # Cheater detection logic
-        if len(self.session_history) >= 20: # Check if enough games have been played
-            recent_results = self.session_history[-20:] # Get the last 20 results
-            win_rate = sum(recent_results) / 20.0 # Calculate win rate
-            if win_rate >= 0.8: # If win rate is 80% or higher
-                # Log the player as a cheater
-                log_cheater(self.player_id, "HighLow", win_rate)
-                # Show a warning message to the player
-                QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last 20 games and have been flagged.")
-                # Return to the main menu
-                self.back_to_menu()
-                return # Exit the method early
+        if self.cheat_detector.flagged: # Recent win count too unlikely for an honest player
+            win_rate = self.cheat_detector.win_rate # Win rate over the detector's window
+            rounds = self.cheat_detector.rounds # Games in the window
+            # Log the player as a cheater
+            log_cheater(self.player_id, "HighLow", win_rate, rounds)
+            # Show a warning message to the player
+            QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last {rounds} games and have been flagged.")
+            # Return to the main menu
+            self.back_to_menu()
+            return # Exit the method early
 
     # Method to cash out current streak winnings
     def cash_out(self):
@@ -511,6 +467,8 @@ class HighLowGame(QWidget):
             self.update_balance_label() # Update balance display
             QMessageBox.information(self, "Cash Out", f"You've cashed out ${self.cashout:.2f}!")
 
+            # Journal the pot being paid out (not a round of its own)
+            self.pending_rounds.append((0.0, self.cashout, None))
             # Add cashed out amount to session's total winnings
             self.total_winnings_session += self.cashout # Now this correctly accumulates only cashed out money
 
@@ -523,6 +481,7 @@ class HighLowGame(QWidget):
             self.cashout_button.setEnabled(False) # Disable cashout until next win
             self.cards_dealt_label.setText(f"Streak: {self.cards_dealt_in_streak}")
             self.show_card_image(None) # Clear the displayed card image
+            self.update_odds_label()
             self.status_label.setText("Winnings cashed out. Draw a new starting card.")
             # Disable guess buttons, enable draw button for a new streak
             self.toggle_guess_buttons(False)
@@ -537,11 +496,12 @@ class HighLowGame(QWidget):
         self.last_card = None # Clear the last card
         self.cashout = 0.0 # Reset cashout winnings
         self.cards_dealt_in_streak = 0 # Reset streak length
-        self.deck = create_shuffled_deck(self.num_decks) # Reshuffle the deck
+        self.shoe.shuffle() # Reshuffle the shoe
         # Update UI elements
         self.cashout_button.setText(f"Cash Out ${self.cashout:.2f}")
         self.cards_dealt_label.setText(f"Streak: {self.cards_dealt_in_streak}")
         self.show_card_image(None) # Clear displayed card image
+        self.update_odds_label()
 
     # Method to display a card image on the GUI
     def show_card_image(self, card):
@@ -550,28 +510,23 @@ class HighLowGame(QWidget):
             self.card_image.clear()
             return
 
-        # Example card string: "2 of clubs" -> split into rank, "of", suit
-        rank, _, suit = card.split()
-        # Construct the filename for the card image (e.g., "2_of_clubs.png")
-        card_filename = f"{rank}_of_{suit}.png"
-        # Construct the full path to the image file using os.path.abspath
-        # IMPORTANT: Ensure a 'Cards' folder exists in the same directory as highlow.py
-        # and contains all card images (e.g., "2_of_clubs.png", "K_of_spades.png", etc.)
-        image_path = os.path.abspath(os.path.join(CARD_IMAGE_FOLDER, card_filename))
+        # Asset name of the card image (e.g., "2_of_clubs")
+        card_name = card_image_name(card)
 
-        # Create a QPixmap from the image path
-        pixmap = QPixmap(image_path)
+        # Get the card already scaled to the label size from the shared asset cache
+        pixmap = asset_cache().pixmap(card_name, (self.card_image.width(), self.card_image.height()))
 
         # If the pixmap loaded successfully
         if not pixmap.isNull():
-            # Scale the pixmap to fit the label, maintaining aspect ratio and smooth transformation
-            self.card_image.setPixmap(pixmap.scaled(self.card_image.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            self.card_image.setPixmap(pixmap)
             self.card_image.setText("") # Clear any previous text
         # If the image failed to load
         else:
-            self.card_image.setText(f"Image not found:\n{card_filename}")
-            # Print an error message for debugging
-            print(f"Error: Card image not found at {image_path}")
+            self.card_image.setText(f"Image not found:\n{card_name}.png")
+            # Warn once per window instead of on every card drawn
+            if not self.image_error_shown:
+                self.image_error_shown = True
+                QMessageBox.warning(self, "Image Error", f"Card image {card_name}.png not found in {ASSET_PACK_PATH} or {CARD_IMAGE_FOLDER}")
 
     # Method to save current game state and session statistics to the database
     def save_user(self):
@@ -580,7 +535,7 @@ class HighLowGame(QWidget):
             self.cur.execute("UPDATE PLAYERS SET balance=? WHERE ID=?", (self.balance, self.player_id))
 
             # Check if an entry for the current session_number and player exists in HighLow table
-            self.cur.execute("SELECT 1 FROM HighLow WHERE player_name=? AND session_number=?", (self.full_name, self.session_number))
+            self.cur.execute("SELECT 1 FROM HighLow WHERE player_id=? AND session_number=?", (self.player_id, self.session_number))
             exists = self.cur.fetchone()
 
             # If an entry exists, update it
@@ -591,21 +546,22 @@ class HighLowGame(QWidget):
                         bet_amount = ?,
                         wins = ?,
                         money_won = ?
-                    WHERE player_name = ? AND session_number = ?
+                    WHERE player_id = ? AND session_number = ?
                 """, (
                     self.wins_session + self.losses_session, # total rounds played in this session
                     self.total_bets_session, # total money bet
                     self.wins_session,
                     self.total_winnings_session, # This now correctly represents cashed-out winnings
-                    self.full_name,
+                    self.player_id,
                     self.session_number
                 ))
             # If no entry exists, insert a new one
             else:
                 self.cur.execute("""
-                    INSERT INTO HighLow (player_name, number_of_bets, bet_amount, wins, money_won, session_number)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO HighLow (player_id, player_name, number_of_bets, bet_amount, wins, money_won, session_number)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (
+                    self.player_id,
                     self.full_name,
                     self.wins_session + self.losses_session,
                     self.total_bets_session,
@@ -613,8 +569,12 @@ class HighLowGame(QWidget):
                     self.total_winnings_session, # This now correctly represents cashed-out winnings
                     self.session_number
                 ))
+            # Journal the rounds played since the last save in the same transaction
+            record_rounds(self.cur, "HighLow", self.player_id, self.full_name, self.session_number, self.pending_rounds)
             # Commit the changes to the database
             self.conn.commit()
+            self.pending_rounds.clear()
+            self.session.balance = self.balance
         # Handle any exceptions during database save
         except Exception as e:
             # Print error for debugging
@@ -633,65 +593,15 @@ class HighLowGame(QWidget):
 
     def plot_net_winnings(self):
         try:
-            # Execute query to fetch session data for plotting
-            self.cur.execute("""
-                SELECT session_number, money_won, bet_amount FROM HighLow
-                WHERE player_name=? ORDER BY session_number
-            """, (self.full_name,))
-            # Fetch all results
-            rows = self.cur.fetchall()
-
+            # Graph window that follows new sessions live (money_won is gross)
+            self.graph_window = NetWinningsWindow(
+                "Net Winnings - High/Low", "Cumulative Net Winnings - High/Low",
+                self.player_id, [("HighLow", "money_won - bet_amount")], color='orange')
             # If no data is found
-            if not rows:
+            if not self.graph_window.has_data():
                 QMessageBox.information(self, "No Data", "No winnings history available for this player.")
                 return
-
-            # Initialize lists for cumulative net winnings and session numbers
-            cumulative_net_winnings = []
-            session_numbers = []
-            current_total_net = 0.0
-
-            # Iterate through fetched rows
-            for session_num, money_won, bet_amount in rows:
-                if session_num is not None:
-                    # Calculate net for this session
-                    net_for_session = money_won - bet_amount
-                    # Add to the overall total
-                    current_total_net += net_for_session
-                    # Append to the list
-                    cumulative_net_winnings.append(current_total_net)
-                    session_numbers.append(int(session_num))
-
-            # Create a window for the graph
-            self.graph_window = QWidget()
-            self.graph_window.setWindowTitle("Net Winnings - High/Low")
-            self.graph_window.setGeometry(150, 150, 600, 400)
-
-            # Create layout
-            layout = QVBoxLayout()
-            self.graph_window.setLayout(layout)
-
-            # Plot with matplotlib
-            fig = Figure(figsize=(5, 4))
-            canvas = FigureCanvas(fig)
-            ax = fig.add_subplot(111)
-            ax.plot(session_numbers, cumulative_net_winnings, marker='o', color='orange')
-            ax.set_title("Cumulative Net Winnings - High/Low")
-            ax.set_xlabel("Session Number")
-            ax.set_ylabel("Net Winnings ($)")
-            ax.grid(True)
-            ax.set_xticks(session_numbers)
-
-            # Add total net winnings label
-            total_label = QLabel(f"Total Net Winnings: ${current_total_net:.2f}")
-            total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            # Add to layout
-            layout.addWidget(canvas)
-            layout.addWidget(total_label)
-
             # Show the window
-            self.graph_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
             self.graph_window.show()
 
         except Exception as e:
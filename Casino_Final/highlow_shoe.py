@@ -0,0 +1,82 @@
+# highlow_shoe.py
+
+"""
+Card shoe for High/Low that tracks its own composition.
+
+Cards are small integers (rank index * 4 + suit index), so comparing two cards
+is an integer division instead of parsing "Ace of Spades" strings. Next to the
+deal order the shoe keeps how many cards of each of the 13 ranks are left,
+which makes the exact chance that the next card is higher, lower or a tie
+available at any point without looking at the cards themselves.
+"""
+
+import random
+from array import array
+
+# Ranks from lowest to highest (Ace is high in High/Low) and suits, as used in card image names
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
+# Number of distinct ranks
+RANK_COUNT = len(RANKS)
+
+
+def card_rank(card):
+    """Returns the rank index of a card (0 for a 2, 12 for an Ace)."""
+    return card // 4
+
+
+def card_label(card):
+    """Returns the display text of a card (e.g. 'A of spades')."""
+    return f"{RANKS[card // 4]} of {SUITS[card % 4]}"
+
+
+def card_image_name(card):
+    """Returns the asset name of a card's image (e.g. 'A_of_spades')."""
+    return f"{RANKS[card // 4]}_of_{SUITS[card % 4]}"
+
+
+class Shoe:
+    """A shuffled multi-deck shoe with per-rank counts of the cards still to come."""
+    def __init__(self, num_decks=4, rng=random):
+        self.num_decks = num_decks
+        self.rng = rng
+        # Cards in deal order; cards are drawn from the end
+        self.order = array("B")
+        # Cards left of each rank
+        self.counts = [0] * RANK_COUNT
+        self.shuffle()
+
+    def shuffle(self):
+        """Refills the shoe with every card and shuffles it."""
+        cards = [rank * 4 + suit for _ in range(self.num_decks) for rank in range(RANK_COUNT) for suit in range(4)]
+        self.rng.shuffle(cards)
+        self.order = array("B", cards)
+        self.counts = [4 * self.num_decks] * RANK_COUNT
+
+    def __len__(self):
+        return len(self.order)
+
+    def draw(self):
+        """Deals the next card and removes it from the rank counts."""
+        card = self.order.pop()
+        self.counts[card // 4] -= 1
+        return card
+
+    def probabilities(self, card):
+        """
+        Returns the exact (P(higher), P(lower), P(tie)) of the next card against
+        `card`, given the cards left in the shoe.
+        """
+        remaining = len(self.order)
+        if remaining == 0:
+            return 0.0, 0.0, 0.0
+        rank = card // 4
+        lower = sum(self.counts[:rank])
+        tie = self.counts[rank]
+        higher = remaining - lower - tie
+        return higher / remaining, lower / remaining, tie / remaining
+
+
+def fair_multiplier(probability):
+    """Returns the gross payout that would make a bet with this win probability break even."""
+    return 1.0 / probability if probability > 0 else float("inf")
@@ -0,0 +1,302 @@
+# highlow_solver.py
+
+"""
+Optimal-play analysis of the High/Low streak game.
+
+The model matches HighLowGame:
+
+  * a streak starts with a free card; every guess costs one bet;
+  * a correct guess on streak n adds bet * 1.3 ** (n - 1) to the pot;
+  * a wrong guess or a tie loses the bet and the whole pot;
+  * after at least one correct guess the player may cash out the pot.
+
+HighLowSolver runs a dynamic program over (streak length, current rank,
+remaining shoe composition) and returns the player's optimal choice in every
+state (cash out, guess higher, guess lower) together with the house edge under
+that policy: -E[net] / E[amount wagered] per streak.
+
+Keeping the exact composition for every card of a long streak is too many
+states, so the composition is tracked exactly for the first `exact_depth`
+guesses and then frozen (removing a few more cards from a 208-card shoe barely
+moves the odds). Streaks are cashed out at `max_streak`, far beyond where any
+real streak gets to.
+
+simulate() plays millions of streaks with numpy, drawing without replacement
+from the shoe and querying the solver's policy for each distinct state, to
+confirm the solved edge. It can also spread the bet: betting more on guesses
+whose payout beats their odds (p * 1.3 ** n > 1), which shows how far a player
+who varies the bet can push the edge before table limits are raised.
+"""
+
+import argparse
+import math
+
+import numpy as np
+
+from highlow_shoe import RANKS, RANK_COUNT
+
+# Streak multiplier growth (a win on streak n pays bet * STREAK_GROWTH ** (n - 1))
+STREAK_GROWTH = 1.3
+# Full 4-deck shoe: 16 cards of each rank
+FULL_SHOE = (16,) * RANK_COUNT
+
+# Player actions
+STOP, HIGHER, LOWER = 0, 1, 2
+ACTION_NAMES = {STOP: "cash out", HIGHER: "higher", LOWER: "lower"}
+
+# Rank x is above / below rank r
+_ABOVE = np.arange(RANK_COUNT)[None, :] > np.arange(RANK_COUNT)[:, None]
+_BELOW = np.arange(RANK_COUNT)[None, :] < np.arange(RANK_COUNT)[:, None]
+
+
+def pot_after(streak, growth=STREAK_GROWTH):
+    """Returns the pot after `streak` correct guesses with a bet of 1."""
+    return (growth ** streak - 1) / (growth - 1)
+
+
+class HighLowSolver:
+    """
+    Solves the optimal cash-out policy for a starting shoe composition.
+
+    Every state is valued for a bet of 1 as (expected cash collected from here
+    on, including the pot already won, minus the bets still to be placed;
+    expected amount still to be wagered; action; win probability of the guess).
+    """
+    def __init__(self, composition=FULL_SHOE, growth=STREAK_GROWTH, exact_depth=2, max_streak=40):
+        if exact_depth < 1 or max_streak <= exact_depth:
+            raise ValueError("Need 1 <= exact_depth < max_streak.")
+        self.start = tuple(int(count) for count in composition)
+        self.growth = growth
+        self.exact_depth = exact_depth
+        self.max_streak = max_streak
+        # Pot after each streak length
+        self.pots = np.array([pot_after(s, growth) for s in range(max_streak + 1)])
+        # (streak, rank, composition) -> state, for streaks before the composition freezes
+        self._exact = {}
+        # composition -> (net, wagered, action, p_win) arrays indexed [streak, rank]
+        self._frozen = {}
+
+    def _frozen_tables(self, comp):
+        """Backward induction over every streak >= exact_depth for a fixed composition."""
+        tables = self._frozen.get(comp)
+        if tables is not None:
+            return tables
+        counts = np.array(comp, dtype=float)
+        probs = counts / counts.sum()
+        # P(win) of each direction from each rank (ties lose)
+        p_higher = _ABOVE @ probs
+        p_lower = _BELOW @ probs
+
+        size = (self.max_streak + 1, RANK_COUNT)
+        net = np.zeros(size)
+        wagered = np.zeros(size)
+        action = np.zeros(size, dtype=np.int8)
+        p_win = np.zeros(size)
+        # Forced cash-out at the streak cap
+        net[self.max_streak] = self.pots[self.max_streak]
+        for s in range(self.max_streak - 1, self.exact_depth - 1, -1):
+            # Continue: pay 1, then on a win collect the next pot increment and carry on
+            next_net = net[s + 1]
+            next_wagered = wagered[s + 1]
+            higher = -1 + (_ABOVE * probs) @ next_net
+            lower = -1 + (_BELOW * probs) @ next_net
+            go_higher = higher >= lower
+            best = np.where(go_higher, higher, lower)
+            best_wagered = 1 + np.where(go_higher, (_ABOVE * probs) @ next_wagered, (_BELOW * probs) @ next_wagered)
+            stop = self.pots[s]
+            # The pot already won is lost on a miss, so continuing is compared with cashing out
+            keep_going = best > stop if s > 0 else np.ones(RANK_COUNT, dtype=bool)
+            net[s] = np.where(keep_going, best, stop)
+            wagered[s] = np.where(keep_going, best_wagered, 0.0)
+            action[s] = np.where(keep_going, np.where(go_higher, HIGHER, LOWER), STOP)
+            p_win[s] = np.where(keep_going, np.where(go_higher, p_higher, p_lower), 0.0)
+        tables = (net, wagered, action, p_win)
+        self._frozen[comp] = tables
+        return tables
+
+    def state(self, streak, rank, comp):
+        """
+        Returns (net, wagered, action, p_win) for a state.
+        `comp` is the composition the next card is drawn from.
+        """
+        if streak >= self.exact_depth:
+            net, wagered, action, p_win = self._frozen_tables(comp)
+            return net[streak, rank], wagered[streak, rank], int(action[streak, rank]), p_win[streak, rank]
+        key = (streak, rank, comp)
+        cached = self._exact.get(key)
+        if cached is not None:
+            return cached
+
+        total = sum(comp)
+        higher = [-1.0, 1.0, 0.0]
+        lower = [-1.0, 1.0, 0.0]
+        for card_rank, count in enumerate(comp):
+            if count == 0 or card_rank == rank:
+                continue
+            p = count / total
+            child_comp = comp[:card_rank] + (count - 1,) + comp[card_rank + 1:]
+            child_net, child_wagered, _, _ = self.state(streak + 1, card_rank, child_comp)
+            side = higher if card_rank > rank else lower
+            side[0] += p * child_net
+            side[1] += p * child_wagered
+            side[2] += p
+        best_action, best = (HIGHER, higher) if higher[0] >= lower[0] else (LOWER, lower)
+        stop = self.pots[streak]
+        if streak > 0 and stop >= best[0]:
+            result = (stop, 0.0, STOP, 0.0)
+        else:
+            result = (best[0], best[1], best_action, best[2])
+        self._exact[key] = result
+        return result
+
+    def solve(self):
+        """
+        Returns a dict with the value of one streak started from the solver's
+        shoe under the optimal policy: expected net, expected wagered and the
+        house edge.
+        """
+        total = sum(self.start)
+        expected_net = 0.0
+        expected_wagered = 0.0
+        for rank, count in enumerate(self.start):
+            if count == 0:
+                continue
+            comp = self.start[:rank] + (count - 1,) + self.start[rank + 1:]
+            net, wagered, _, _ = self.state(0, rank, comp)
+            expected_net += count / total * net
+            expected_wagered += count / total * wagered
+        return {
+            "expected_net": expected_net,
+            "expected_wagered": expected_wagered,
+            "house_edge": -expected_net / expected_wagered
+        }
+
+    def policy_table(self, max_shown=8):
+        """Returns {streak: [action per rank]} using the starting shoe for every streak."""
+        _, _, action, _ = self._frozen_tables(self.start)
+        table = {}
+        for s in range(1, max_shown + 1):
+            if s >= self.exact_depth:
+                table[s] = [int(a) for a in action[s]]
+            else:
+                table[s] = [self.state(s, r, self.start)[2] for r in range(RANK_COUNT)]
+        return table
+
+
+def simulate(solver, streaks=1_000_000, chunk=100_000, spread=1.0, seed=None):
+    """
+    Plays `streaks` streaks with the solver's policy, vectorized over chunks.
+
+    Cards are dealt without replacement from the solver's starting shoe. The
+    policy is looked up once per distinct (streak, cards seen, current rank)
+    with np.unique. With spread > 1 the player bets `spread` units on guesses
+    whose payout beats their win probability and 1 unit otherwise.
+
+    Returns a dict with the simulated house edge, its standard error and the
+    share of guesses that had a positive expectation.
+    """
+    rng = np.random.default_rng(seed)
+    shoe = np.repeat(np.arange(RANK_COUNT, dtype=np.int8), solver.start)
+    start = np.array(solver.start)
+    cards_needed = solver.max_streak + 2
+    all_net = []
+    all_wagered = []
+    guesses = 0
+    positive_guesses = 0
+
+    remaining = streaks
+    while remaining > 0:
+        m = min(chunk, remaining)
+        remaining -= m
+        # Each row is one streak's cards, dealt without replacement
+        dealt = rng.permuted(np.broadcast_to(shoe, (m, shoe.size)), axis=1)[:, :cards_needed]
+        current = dealt[:, 0].astype(np.int64)
+        alive = np.ones(m, dtype=bool)
+        pot = np.zeros(m)
+        net = np.zeros(m)
+        wagered = np.zeros(m)
+
+        for s in range(solver.max_streak + 1):
+            live = np.flatnonzero(alive)
+            if live.size == 0:
+                break
+            # The solver's composition: the shoe minus the cards seen until it froze
+            seen = min(s + 1, solver.exact_depth + 1)
+            keys = np.concatenate([np.sort(dealt[live, :seen], axis=1), current[live, None]], axis=1)
+            unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+            actions = np.empty(len(unique_keys), dtype=np.int64)
+            p_wins = np.empty(len(unique_keys))
+            for i, key in enumerate(unique_keys):
+                comp = start - np.bincount(key[:seen], minlength=RANK_COUNT)
+                _, _, actions[i], p_wins[i] = solver.state(s, int(key[-1]), tuple(int(c) for c in comp))
+            action = actions[inverse.ravel()]
+            p_win = p_wins[inverse.ravel()]
+
+            # Cash out
+            stopping = live[action == STOP]
+            net[stopping] += pot[stopping]
+            alive[stopping] = False
+
+            # Guess
+            going = action != STOP
+            playing = live[going]
+            gain = solver.growth ** s
+            favourable = p_win[going] * gain > 1
+            guesses += playing.size
+            positive_guesses += int(favourable.sum())
+            bet = np.where(favourable, spread, 1.0)
+            net[playing] -= bet
+            wagered[playing] += bet
+            next_card = dealt[playing, s + 1].astype(np.int64)
+            guessed_higher = action[going] == HIGHER
+            won = np.where(guessed_higher, next_card > current[playing], next_card < current[playing])
+            pot[playing[won]] += bet[won] * gain
+            current[playing[won]] = next_card[won]
+            # A miss or a tie loses the pot
+            lost = playing[~won]
+            pot[lost] = 0.0
+            alive[lost] = False
+
+        all_net.append(net)
+        all_wagered.append(wagered)
+
+    net = np.concatenate(all_net)
+    wagered = np.concatenate(all_wagered)
+    edge = -net.sum() / wagered.sum()
+    # Standard error of a ratio estimate
+    residual = net + edge * wagered
+    std_error = residual.std() / (math.sqrt(len(net)) * wagered.mean())
+    return {
+        "house_edge": edge,
+        "std_error": std_error,
+        "positive_guess_share": positive_guesses / guesses if guesses else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve and simulate optimal High/Low streak play.")
+    parser.add_argument("--streaks", type=int, default=1_000_000, help="Streaks to simulate (default 1,000,000)")
+    parser.add_argument("--spread", type=float, default=1.0, help="Bet units on favourable guesses (default 1)")
+    parser.add_argument("--exact-depth", type=int, default=2, help="Guesses tracked with the exact shoe composition")
+    parser.add_argument("--max-streak", type=int, default=40, help="Streak length at which the pot is cashed out")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the simulation")
+    args = parser.parse_args()
+
+    solver = HighLowSolver(exact_depth=args.exact_depth, max_streak=args.max_streak)
+    result = solver.solve()
+    print(f"Optimal play, full shoe: house edge {result['house_edge'] * 100:.3f}% "
+          f"(E[net] {result['expected_net']:.4f}, E[wagered] {result['expected_wagered']:.4f} per streak)")
+
+    print("Policy by streak (ranks 2..A):")
+    for s, actions in solver.policy_table().items():
+        print(f"  streak {s}: " + " ".join(f"{RANKS[r]}={ACTION_NAMES[a][0].upper()}" for r, a in enumerate(actions)))
+
+    if args.streaks > 0:
+        sim = simulate(solver, args.streaks, spread=args.spread, seed=args.seed)
+        print(f"Simulated {args.streaks:,} streaks (spread {args.spread:g}x): house edge "
+              f"{sim['house_edge'] * 100:.3f}% +/- {sim['std_error'] * 100:.3f}%, "
+              f"{sim['positive_guess_share'] * 100:.1f}% of guesses had positive expectation")
+
+
+if __name__ == "__main__":
+    main()
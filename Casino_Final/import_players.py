@@ -0,0 +1,235 @@
+# import_players.py
+
+"""
+Bulk player import.
+
+Streams players from a CSV file (with a header row) or a JSON Lines file, one
+object per line, with the fields
+
+    first_name, last_name   required
+    balance                 optional starting balance (default --balance)
+    external_id             optional stable key from the source system
+
+and creates each one's PLAYERS row (with the starting balance counted as the
+first deposit) and Login row through account_allocator, which also hands out
+the new IDs and passwords. Records are validated as they are read, and invalid
+ones are reported and skipped. Valid ones are written in chunks, one
+transaction per chunk with executemany, so a live database is only locked for
+one chunk at a time and an interrupted import keeps every chunk it committed.
+
+Every imported player's key is kept in IMPORTED_PLAYERS, so running the same
+file again skips the players it already created. The key is the external_id
+when there is one, otherwise the file name and row number (give external_id
+if the file may be edited between runs). The PLAYERS.ID index is dropped for
+the import and rebuilt once at the end, unless --keep-indexes is given.
+
+The new accounts' credentials are appended to a CSV (import_key, player_id,
+password) to hand out to the players, so a re-run adds its new accounts after
+those of earlier runs. A chunk's credentials are written and synced to disk
+before its transaction commits, so a crash can never leave committed accounts
+without their handout. After a failed commit the file may list accounts that do
+not exist; the credentials of every imported account can always be read back
+from the database:
+
+    SELECT i.import_key, l.ID, l.Password
+    FROM IMPORTED_PLAYERS i JOIN Login l ON l.ID = i.player_id
+
+Example:
+    python import_players.py players.csv --out accounts.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+
+# Import the bulk account creation
+from account_allocator import create_accounts
+# Import the schema migrator; the import needs the sequences and IMPORTED_PLAYERS
+from migrations import run_migrations
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Players written per transaction
+DEFAULT_CHUNK = 50000
+# Longest first or last name accepted
+MAX_NAME_LENGTH = 50
+# Secondary index rebuilt after the import (Login's ID and password indexes are constraints and stay)
+DEFERRED_INDEXES = {"idx_players_id": "CREATE INDEX IF NOT EXISTS idx_players_id ON PLAYERS (ID)"}
+
+
+def read_records(path, file_format):
+    """Yields (row number, record dict) from a CSV or JSON Lines file, or (row number, error) for unreadable rows."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "csv":
+            # Row 1 is the header
+            for row_number, record in enumerate(csv.DictReader(f), start=2):
+                yield row_number, record
+        else:
+            for row_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield row_number, f"invalid JSON: {e.msg}"
+                    continue
+                yield row_number, record if isinstance(record, dict) else "not a JSON object"
+
+
+def validate(record, default_balance):
+    """Returns (external_id or None, first name, last name, balance), or raises ValueError."""
+    names = []
+    for field in ("first_name", "last_name"):
+        value = record.get(field)
+        value = value.strip() if isinstance(value, str) else ""
+        if not value:
+            raise ValueError(f"missing {field}")
+        if len(value) > MAX_NAME_LENGTH:
+            raise ValueError(f"{field} longer than {MAX_NAME_LENGTH} characters")
+        names.append(value)
+
+    balance = record.get("balance")
+    if balance is None or balance == "":
+        balance = default_balance
+    else:
+        try:
+            balance = float(balance)
+        except (TypeError, ValueError):
+            raise ValueError(f"balance {balance!r} is not a number")
+        if not math.isfinite(balance) or balance < 0:
+            raise ValueError(f"balance {balance!r} must be a non-negative amount")
+
+    external_id = record.get("external_id")
+    external_id = str(external_id).strip() if external_id not in (None, "") else None
+    return external_id, names[0], names[1], balance
+
+
+def import_chunk(conn, chunk, before_commit=None):
+    """
+    Creates the players of one chunk [(import key, first, last, balance)] that
+    were not imported before, in one transaction. before_commit, if given, is
+    called with the new accounts before the transaction commits. Returns
+    [(import key, player ID, password)].
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # One lookup for the whole chunk, with its keys passed as a JSON array
+        done = {row[0] for row in conn.execute("""
+            SELECT import_key FROM IMPORTED_PLAYERS
+            WHERE import_key IN (SELECT value FROM json_each(?))
+        """, (json.dumps([player[0] for player in chunk]),))}
+        # Skip players imported by an earlier run and keys repeated within the chunk
+        new = []
+        for player in chunk:
+            if player[0] not in done:
+                done.add(player[0])
+                new.append(player)
+        accounts = create_accounts(conn, [player[1:] for player in new])
+        created = [(player[0], player_id, password) for player, (player_id, password) in zip(new, accounts)]
+        conn.executemany("INSERT INTO IMPORTED_PLAYERS (import_key, player_id) VALUES (?, ?)",
+                         [(key, player_id) for key, player_id, _ in created])
+        if before_commit is not None:
+            before_commit(created)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return created
+
+
+def import_players(path, db_path=DB_PATH, file_format=None, chunk_size=DEFAULT_CHUNK,
+                   default_balance=0.0, out=None, defer_indexes=True, rejects=sys.stderr):
+    """
+    Imports every valid player of a file. Writes the new accounts as CSV rows
+    to the text file `out` (if given), syncing each chunk's rows to disk before
+    the chunk commits, and one line per rejected record to `rejects`.
+    Returns a dict of counts: read, rejected, skipped, created.
+    """
+    if file_format is None:
+        file_format = "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+    source = os.path.basename(path)
+    counts = {"read": 0, "rejected": 0, "skipped": 0, "created": 0}
+
+    run_migrations(db_path)
+    # Autocommit mode so each chunk's transaction is controlled explicitly
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Safe under WAL: a crash can only lose the last commits, never corrupt the file
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Room for the Login and IMPORTED_PLAYERS index pages a chunk touches
+        conn.execute("PRAGMA cache_size=-131072")
+        if defer_indexes:
+            for name in DEFERRED_INDEXES:
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+        writer = csv.writer(out) if out is not None else None
+
+        def write_credentials(created):
+            writer.writerows(created)
+            out.flush()
+            os.fsync(out.fileno())
+
+        def flush(chunk):
+            created = import_chunk(conn, chunk, write_credentials if writer is not None else None)
+            counts["created"] += len(created)
+            counts["skipped"] += len(chunk) - len(created)
+
+        chunk = []
+        for row_number, record in read_records(path, file_format):
+            counts["read"] += 1
+            try:
+                if isinstance(record, str):
+                    raise ValueError(record)
+                external_id, first, last, balance = validate(record, default_balance)
+            except ValueError as e:
+                counts["rejected"] += 1
+                print(f"{source} row {row_number}: {e}", file=rejects)
+                continue
+            key = f"id:{external_id}" if external_id else f"row:{source}:{row_number}"
+            chunk.append((key, first, last, balance))
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+    finally:
+        # Rebuild the deferred indexes even after a failure, so logins never stay unindexed
+        for sql in DEFERRED_INDEXES.values():
+            conn.execute(sql)
+        conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import players from a CSV or JSON Lines file.")
+    parser.add_argument("path", help="Players file (.csv, or .jsonl / .ndjson)")
+    parser.add_argument("--db", default=DB_PATH, help="Database to import into (default CasinoDB.db)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default=None, help="File format (default: from the extension)")
+    parser.add_argument("--out", default=None, help="CSV to append the new accounts' credentials to (default <file>_accounts.csv)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="Players written per transaction")
+    parser.add_argument("--balance", type=float, default=0.0, help="Starting balance of players without one")
+    parser.add_argument("--keep-indexes", action="store_true", help="Keep PLAYERS' ID index during the import")
+    args = parser.parse_args()
+
+    out_path = args.out or os.path.splitext(args.path)[0] + "_accounts.csv"
+    started = time.perf_counter()
+    # Append, so a re-run never truncates the credentials of earlier runs
+    with open(out_path, "a", newline="", encoding="utf-8") as f:
+        if f.tell() == 0:
+            csv.writer(f).writerow(("import_key", "player_id", "password"))
+        counts = import_players(args.path, args.db, args.format, args.chunk, args.balance,
+                                f, not args.keep_indexes)
+    elapsed = time.perf_counter() - started
+    print(f"Read {counts['read']} records in {elapsed:.1f} s: created {counts['created']}, "
+          f"skipped {counts['skipped']} already imported, rejected {counts['rejected']}")
+    print(f"New accounts appended to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,13 @@
 
 #Reprint of login_menu.py with required changes
 
-import random  #Import the random module to generate random IDs and passwords
 import sqlite3  #Import sqlite3 to interact with the database
 from PyQt6.QtWidgets import (  #Import required PyQt6 GUI components
     QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QMessageBox
 )
+from warmup import start_warmup  #Import the post-login warm-up (DB, tables, favourite games, images)
+from session import PlayerSession  #Import the session context shared by every game
+from account_allocator import create_account  #Import the player ID and password allocator
 
 DB_PATH = "CasinoDB.db"  #Define the path to the SQLite database
 ADMIN_ID = 7589 # Hardcoded admin ID
@@ -66,17 +68,15 @@ class LoginMenu(QWidget):  #Define the LoginMenu class inheriting from QWidget
             conn.close()
             return
 
-        cur.execute("SELECT first_name, last_name FROM PLAYERS WHERE ID=?", (user_id_input,))
-        name_result = cur.fetchone()
+        # Load the player's session once; every game window shares it from here on
+        self.session = PlayerSession.load(conn, user_id_input) or PlayerSession(user_id_input, "Player", 0.0)
         conn.close()
-
-        self.player_id = user_id_input
-        self.full_name = f"{name_result[0]} {name_result[1]}" if name_result else "Player"
         self.launch_deposit()
 
     def launch_deposit(self):
         from Casino_With_Admin import DepositWindow
-        self.deposit_window = DepositWindow(self.player_id, self.full_name)
+        start_warmup(self.session)  #Prepare the player's games in the background
+        self.deposit_window = DepositWindow(self.session)
         self.deposit_window.show()
         self.close()
         
@@ -126,29 +126,24 @@ class CreateLoginWindow(QWidget):
 
         conn = sqlite3.connect(DB_PATH)
         cur = conn.cursor()
-
-        while True:
-            new_id = random.randint(1000, 9999)
-            cur.execute("SELECT 1 FROM PLAYERS WHERE ID=?", (new_id,))
-            if not cur.fetchone():
-                break
-
-        while True:
-            new_pw = str(random.randint(1000, 9999))
-            cur.execute("SELECT 1 FROM Login WHERE Password=?", (new_pw,))
-            if not cur.fetchone():
-                break
-
-        # Initialize total_deposit to 0 for new players
-        cur.execute("INSERT INTO PLAYERS (ID, balance, first_name, last_name, total_deposit) VALUES (?, 0, ?, ?, 0)", (new_id, fname, lname))
-        cur.execute("INSERT INTO Login (ID, Password) VALUES (?, ?)", (new_id, new_pw))
-        conn.commit()
-        conn.close()
+        try:
+            # Take the next ID and password from the account sequences (balance and total_deposit start at 0)
+            new_id, new_pw = create_account(cur, fname, lname)
+            conn.commit()
+        except (sqlite3.Error, ValueError) as e:
+            conn.rollback()
+            QMessageBox.critical(self, "Account Error", f"Could not create the account: {e}")
+            return
+        finally:
+            conn.close()
 
         QMessageBox.information(self, "Account Created",
             f"Your ID: {new_id}\nYour Password: {new_pw}\nSave this info to log in.")
 
         from Casino_With_Admin import DepositWindow
-        self.deposit_window = DepositWindow(new_id, f"{fname} {lname}")
+        # A new player has no sessions yet
+        session = PlayerSession(new_id, f"{fname} {lname}", 0.0)
+        start_warmup(session)
+        self.deposit_window = DepositWindow(session)
         self.deposit_window.show()
         self.close()
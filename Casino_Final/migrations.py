@@ -0,0 +1,332 @@
+# migrations.py
+
+"""
+Versioned schema migrations for CasinoDB.db.
+
+The schema version is kept in SQLite's `PRAGMA user_version`. At application
+start run_migrations() applies every migration newer than that version, each in
+its own transaction together with the version bump, so a crash never leaves a
+half-applied step. Once migrated, the rest of the code can assume the schema
+instead of checking tables and columns on every call.
+
+To change the schema, append a new (version, description, function) entry to
+MIGRATIONS; never edit a migration that has already shipped. Migrations carry
+their own SQL and data instead of calling into the application modules, so
+later changes to those modules cannot change what an old migration does.
+"""
+
+import secrets
+import sqlite3
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Define the hardcoded ID for the casino stats row
+CASINO_ID = 7589
+# Every per-game history table
+GAME_TABLES = ("Blackjack", "Craps", "HighLow", "Poker", "Roulette", "Slots")
+
+
+def table_columns(conn, table):
+    """Returns the column names of a table (empty if the table does not exist)."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def add_column(conn, table, column, declaration):
+    """Adds a column unless the table already has it."""
+    if column not in table_columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def _baseline(conn):
+    """
+    Version 1: the schema the application has grown into. Creates any missing
+    table and adds the columns that used to be added on the fly by
+    cheaters.log_cheater and CasinoAdminPanel.update_stats.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS PLAYERS (
+            ID INTEGER, first_name TEXT, last_name TEXT, balance REAL, money_won REAL,
+            Won INTEGER, Lost INTEGER, Bets INTEGER, is_flagged INTEGER, money_loss INTEGER,
+            total_deposit INTEGER DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Login (
+            ID INTEGER PRIMARY KEY,
+            Password INTEGER UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS CASINO (
+            id INTEGER, money_won INTEGER, Bets INTEGER, Won INTEGER, Lost INTEGER,
+            money_loss INTEGER, net_profit INTEGER, total_cash INTEGER, total_cashout REAL DEFAULT 0
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS CHEAT_LOG (
+            id         INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_id  INTEGER NOT NULL,
+            event_time DATETIME DEFAULT CURRENT_TIMESTAMP,
+            event_type TEXT    NOT NULL,
+            details    TEXT,
+            money_loss INTEGER DEFAULT 0
+        )
+    """)
+    for table in GAME_TABLES:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                player_name TEXT, number_of_bets INTEGER, bet_amount REAL, wins INTEGER,
+                money_loss INTEGER, money_won REAL, session_number INTEGER
+            )
+        """)
+        add_column(conn, table, "session_number", "INTEGER")
+        # Only Roulette recorded losses; the others report 0 so every table can be summed alike
+        add_column(conn, table, "losses", "INTEGER DEFAULT 0")
+
+    add_column(conn, "PLAYERS", "is_flagged", "INTEGER DEFAULT 0")
+    add_column(conn, "PLAYERS", "total_deposit", "INTEGER DEFAULT 0")
+    add_column(conn, "CASINO", "total_cashout", "REAL DEFAULT 0")
+    add_column(conn, "CASINO", "total_cash", "REAL DEFAULT 0")
+    add_column(conn, "CHEAT_LOG", "money_loss", "INTEGER DEFAULT 0")
+    # The casino stats row the admin panel updates
+    if conn.execute("SELECT 1 FROM CASINO WHERE id=?", (CASINO_ID,)).fetchone() is None:
+        conn.execute("""
+            INSERT INTO CASINO (id, money_won, Bets, Won, Lost, money_loss, net_profit, total_cash, total_cashout)
+            VALUES (?, 0, 0, 0, 0, 0, 0, 0, 0)
+        """, (CASINO_ID,))
+
+
+def _rounds_journal(conn):
+    """Version 2: ROUNDS, one row per committed round (see round_journal.py)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ROUNDS (
+            id             INTEGER PRIMARY KEY,
+            played_at      TEXT    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            game           TEXT    NOT NULL,
+            player_id      INTEGER,
+            player_name    TEXT,
+            session_number INTEGER,
+            bet            REAL    NOT NULL DEFAULT 0,
+            payout         REAL    NOT NULL DEFAULT 0,
+            won            INTEGER
+        )
+    """)
+
+
+def _incremental_casino_totals(conn):
+    """
+    Version 3: CASINO keeps the players' net result and the last ROUNDS id merged
+    into its totals, so the admin panel only aggregates rounds newer than that.
+    The history played before the journal is frozen into baseline_* columns,
+    computed from the game tables the way the admin panel always did, together
+    with the last ROUNDS id it covers (journaled rounds commit with their
+    session rows, so those are already part of it). The totals are that
+    baseline plus every round journaled after baseline_mark (see casino_totals.py).
+    """
+    add_column(conn, "CASINO", "player_net", "REAL DEFAULT 0")
+    add_column(conn, "CASINO", "rounds_mark", "INTEGER DEFAULT 0")
+    add_column(conn, "CASINO", "baseline_bets", "INTEGER DEFAULT 0")
+    add_column(conn, "CASINO", "baseline_player_losses", "INTEGER DEFAULT 0")
+    add_column(conn, "CASINO", "baseline_player_wins", "INTEGER DEFAULT 0")
+    add_column(conn, "CASINO", "baseline_player_net", "REAL DEFAULT 0")
+    add_column(conn, "CASINO", "baseline_mark", "INTEGER DEFAULT 0")
+    bets = player_wins = player_losses = 0
+    player_net = 0.0
+    for table in GAME_TABLES:
+        total_bets, wins, bet_amount, money_won, losses = conn.execute(f"""
+            SELECT SUM(number_of_bets), SUM(wins), SUM(bet_amount), SUM(money_won), SUM(losses) FROM {table}
+        """).fetchone()
+        bets += total_bets or 0
+        player_wins += wins or 0
+        player_losses += losses or 0
+        # Slots and HighLow store gross winnings, the other games store net
+        if table in ("Slots", "HighLow"):
+            player_net += (money_won or 0.0) - (bet_amount or 0.0)
+        else:
+            player_net += money_won or 0.0
+    mark = conn.execute("SELECT COALESCE(MAX(id), 0) FROM ROUNDS").fetchone()[0]
+    conn.execute("""
+        UPDATE CASINO
+        SET baseline_bets = ?, baseline_player_losses = ?, baseline_player_wins = ?,
+            baseline_player_net = ?, baseline_mark = ?,
+            Bets = ?, Won = ?, Lost = ?, player_net = ?, rounds_mark = ?
+        WHERE id = ?
+    """, (bets, player_losses, player_wins, player_net, mark,
+          bets, player_losses, player_wins, player_net, mark, CASINO_ID))
+
+
+def _game_rollups(conn):
+    """
+    Version 4: hourly and daily per-game rollups of ROUNDS (see rollups.py),
+    filled from the rounds journaled so far.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS GAME_ROLLUPS (
+            grain          TEXT    NOT NULL,
+            bucket         TEXT    NOT NULL,
+            game           TEXT    NOT NULL,
+            handle         REAL    NOT NULL DEFAULT 0,
+            payouts        REAL    NOT NULL DEFAULT 0,
+            rounds         INTEGER NOT NULL DEFAULT 0,
+            unique_players INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (grain, bucket, game)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ROLLUP_PLAYERS (
+            grain     TEXT    NOT NULL,
+            bucket    TEXT    NOT NULL,
+            game      TEXT    NOT NULL,
+            player_id INTEGER NOT NULL,
+            PRIMARY KEY (grain, bucket, game, player_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS GAME_HOLD AS
+        SELECT grain, bucket, game, handle, payouts, rounds, unique_players,
+               CASE WHEN handle > 0 THEN (handle - payouts) * 100.0 / handle END AS hold_pct
+        FROM GAME_ROLLUPS
+    """)
+    # Fill both grains from the journal, as rollups.py defined them at this version
+    conn.execute("DELETE FROM GAME_ROLLUPS")
+    conn.execute("DELETE FROM ROLLUP_PLAYERS")
+    for grain, pattern in (("hour", "%Y-%m-%d %H:00:00"), ("day", "%Y-%m-%d")):
+        conn.execute("""
+            INSERT INTO ROLLUP_PLAYERS (grain, bucket, game, player_id)
+            SELECT DISTINCT ?, strftime(?, played_at), game, player_id
+            FROM ROUNDS
+            WHERE player_id IS NOT NULL
+        """, (grain, pattern))
+        conn.execute("""
+            INSERT INTO GAME_ROLLUPS (grain, bucket, game, handle, payouts, rounds, unique_players)
+            SELECT ?, strftime(?, played_at) AS bucket, game, SUM(bet), SUM(payout), COUNT(won),
+                   COUNT(DISTINCT player_id)
+            FROM ROUNDS
+            GROUP BY bucket, game
+        """, (grain, pattern))
+
+
+def _game_player_ids(conn):
+    """
+    Version 5: game history keyed by player ID. Every game table gets a
+    player_id column, filled from the player_name of existing rows wherever that
+    name belongs to exactly one player (rows of a name shared by several players
+    cannot be attributed and keep a NULL ID), and an index on
+    (player_id, session_number) for the per-player lookups. player_name stays
+    as a display label.
+    """
+    conn.execute("""
+        CREATE TEMP TABLE unique_names (name TEXT PRIMARY KEY, player_id INTEGER NOT NULL) WITHOUT ROWID
+    """)
+    conn.execute("""
+        INSERT INTO temp.unique_names (name, player_id)
+        SELECT first_name || ' ' || last_name, MIN(ID)
+        FROM PLAYERS
+        WHERE first_name IS NOT NULL AND last_name IS NOT NULL
+        GROUP BY first_name || ' ' || last_name
+        HAVING COUNT(*) = 1
+    """)
+    for table in GAME_TABLES:
+        add_column(conn, table, "player_id", "INTEGER")
+        conn.execute(f"""
+            UPDATE {table}
+            SET player_id = (SELECT player_id FROM temp.unique_names WHERE name = {table}.player_name)
+            WHERE player_id IS NULL
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_player_session ON {table} (player_id, session_number)")
+    conn.execute("DROP TABLE temp.unique_names")
+
+
+def _account_sequences(conn):
+    """
+    Version 6: ACCOUNT_SEQUENCES, the counters and keys player IDs and
+    passwords are allocated from (see account_allocator.py), and an index on
+    PLAYERS.ID for the login and balance lookups.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ACCOUNT_SEQUENCES (
+            name       TEXT    PRIMARY KEY,
+            base       INTEGER NOT NULL,
+            size       INTEGER NOT NULL,
+            next_value INTEGER NOT NULL DEFAULT 0,
+            key        BLOB    NOT NULL
+        ) WITHOUT ROWID
+    """)
+    # 8-digit IDs and passwords, 90 million of each, each sequence with its own
+    # random key for the four-round Feistel permutation (4 bytes per round)
+    for name in ("player_id", "password"):
+        conn.execute("""
+            INSERT OR IGNORE INTO ACCOUNT_SEQUENCES (name, base, size, next_value, key)
+            VALUES (?, 10000000, 90000000, 0, ?)
+        """, (name, secrets.token_bytes(16)))
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_id ON PLAYERS (ID)")
+
+
+def _imported_players(conn):
+    """
+    Version 7: IMPORTED_PLAYERS, the import key of every player created by
+    import_players.py, so re-running an import skips the players it already made.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS IMPORTED_PLAYERS (
+            import_key TEXT    PRIMARY KEY,
+            player_id  INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+
+# (version, description, function) in the order they are applied
+MIGRATIONS = [
+    (1, "baseline schema", _baseline),
+    (2, "rounds journal", _rounds_journal),
+    (3, "incremental casino totals", _incremental_casino_totals),
+    (4, "per-game rollups", _game_rollups),
+    (5, "game history keyed by player ID", _game_player_ids),
+    (6, "account ID and password sequences", _account_sequences),
+    (7, "imported players", _imported_players),
+]
+
+# Schema version this code expects
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    """Returns the database's current schema version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def run_migrations(db_path=DB_PATH):
+    """
+    Applies every pending migration. Returns the list of versions applied
+    (empty when the database is already current).
+    """
+    applied = []
+    # Autocommit mode so each migration's transaction is controlled explicitly
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        for version, description, migrate in MIGRATIONS:
+            if version <= schema_version(conn):
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check under the write lock in case another process migrated first
+                if version <= schema_version(conn):
+                    conn.execute("ROLLBACK")
+                    continue
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version = {int(version)}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            print(f"Applied schema migration {version}: {description}")
+            applied.append(version)
+    finally:
+        conn.close()
+    return applied
+
+
+if __name__ == "__main__":
+    import sys
+    versions = run_migrations(sys.argv[1] if len(sys.argv) > 1 else DB_PATH)
+    print(f"Schema is at version {SCHEMA_VERSION}" + ("" if versions else " (nothing to do)"))
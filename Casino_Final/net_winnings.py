@@ -0,0 +1,190 @@
+# net_winnings.py
+
+"""
+Cumulative net-winnings series for the winnings graphs.
+
+SQLite sums each game session's rows, numpy takes the running total over the
+player's sessions (one point per game session, in session order), and long
+series are then reduced with min/max bucketing to about two points per pixel
+column: each bucket keeps its lowest and highest point, so every swing stays
+visible while a 100k-session history plots as a couple of thousand points.
+
+series_cache keeps the per-session nets of every game table that has been
+plotted. Only a table's newest session can still change (games update their
+open session's row in place), so a refresh re-reads just the rows from that
+session on and appends them to the cached prefix. NetWinningsPlot draws a
+series on a matplotlib axis and updates its line in place; DataVersionWatcher
+tells a graph window when another connection has committed so it knows to
+refresh.
+"""
+
+import sqlite3
+
+import numpy as np
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Net result of a session row, per game table. Slots and HighLow store gross
+# winnings in money_won; the other games store the net result.
+NET_EXPRESSIONS = {
+    "Blackjack": "money_won",
+    "Craps": "money_won",
+    "HighLow": "money_won - bet_amount",
+    "Poker": "money_won",
+    "Roulette": "money_won",
+    "Slots": "money_won - bet_amount",
+}
+# Game tables that log a cumulative row per round (Roulette, one per spin), so a
+# session's net is its last row rather than the sum of its rows
+CUMULATIVE_TABLES = frozenset({"Roulette"})
+# Buckets kept when downsampling (roughly the plot width in pixels)
+DEFAULT_BUCKETS = 800
+# Series up to this long are drawn with a marker on every point
+MARKER_LIMIT = 50
+
+
+def session_nets(conn, player_id, table, expression, min_session=None):
+    """
+    Returns (session numbers, net per session) as numpy arrays for a player in one
+    game table, summing the rows of each session in SQL (or taking its last row in
+    CUMULATIVE_TABLES). With min_session only sessions from that number on are read.
+    """
+    # With MAX(rowid), SQLite reads the bare expression from the session's last row
+    net = f"{expression}, MAX(rowid)" if table in CUMULATIVE_TABLES else f"SUM({expression})"
+    rows = conn.execute(f"""
+        SELECT session_number, {net}
+        FROM {table}
+        WHERE player_id = ? AND session_number >= ?
+        GROUP BY session_number
+        ORDER BY session_number
+    """, (player_id, int(min_session) if min_session is not None else -2 ** 63)).fetchall()
+    sessions = np.array([row[0] for row in rows], dtype=np.int64)
+    nets = np.array([row[1] or 0.0 for row in rows], dtype=np.float64)
+    return sessions, nets
+
+
+def apply_pending(sessions, totals, pending):
+    """
+    Replaces the saved points of an unsaved session with its in-memory net.
+    pending is (session number, net) of the newest session, or None.
+    """
+    if not pending:
+        return sessions, totals
+    keep = sessions != pending[0]
+    sessions, totals = sessions[keep], totals[keep]
+    last = totals[-1] if len(totals) else 0.0
+    return np.append(sessions, pending[0]), np.append(totals, last + pending[1])
+
+
+class SeriesCache:
+    """Per-session nets per (player ID, game table), extended from the newest session on refresh."""
+    def __init__(self):
+        self._nets = {}
+
+    def _table_nets(self, conn, player_id, table, expression):
+        key = (player_id, table, expression)
+        cached = self._nets.get(key)
+        if cached is None or len(cached[0]) == 0:
+            sessions, nets = session_nets(conn, player_id, table, expression)
+        else:
+            # Keep everything before the newest session and re-read from there
+            sessions, nets = cached
+            keep = sessions < sessions[-1]
+            new_sessions, new_nets = session_nets(conn, player_id, table, expression, sessions[-1])
+            sessions = np.concatenate([sessions[keep], new_sessions])
+            nets = np.concatenate([nets[keep], new_nets])
+        self._nets[key] = (sessions, nets)
+        return sessions, nets
+
+    def series(self, conn, player_id, sources, pending=None):
+        """
+        Returns the up-to-date (session numbers, cumulative net) of a player.
+        sources is a list of (game table, net SQL expression); sessions of several
+        games are ordered by session number, then by their order in sources.
+        """
+        parts = [self._table_nets(conn, player_id, table, expression) for table, expression in sources]
+        sessions = np.concatenate([part[0] for part in parts])
+        nets = np.concatenate([part[1] for part in parts])
+        if len(parts) > 1:
+            source = np.concatenate([np.full(len(part[0]), index) for index, part in enumerate(parts)])
+            order = np.lexsort((source, sessions))
+            sessions, nets = sessions[order], nets[order]
+        return apply_pending(sessions, np.cumsum(nets), pending)
+
+    def invalidate(self, player_id=None):
+        """Drops the cached series of one player, or of everyone."""
+        if player_id is None:
+            self._nets.clear()
+        else:
+            for key in [key for key in self._nets if key[0] == player_id]:
+                del self._nets[key]
+
+
+# Shared series cache used by every winnings graph
+series_cache = SeriesCache()
+
+
+def minmax_downsample(x, y, buckets=DEFAULT_BUCKETS):
+    """
+    Reduces a series to the lowest and highest point of each of `buckets`
+    equal-width index buckets (plus the first and last point), in order.
+    Series that are already short enough are returned unchanged.
+    """
+    n = len(y)
+    if n <= 2 * buckets:
+        return x, y
+    size = -(-n // buckets)
+    # Pad with the last value so the series splits into equal rows
+    padded = np.concatenate([y, np.full(size * buckets - n, y[-1])]).reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = np.concatenate([offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1), [0, n - 1]])
+    keep = np.unique(np.minimum(keep, n - 1))
+    return x[keep], y[keep]
+
+
+class NetWinningsPlot:
+    """
+    One cumulative-winnings line on a matplotlib figure, updated in place.
+    With sequential=True the x axis counts sessions 1..n instead of using
+    session numbers (for series that mix several games).
+    """
+    def __init__(self, figure, title, xlabel="Session Number", color=None, sequential=False):
+        from matplotlib.ticker import MaxNLocator
+        self.figure = figure
+        self.sequential = sequential
+        self.ax = figure.add_subplot(111)
+        self.line, = self.ax.plot([], [], linestyle='-', color=color)
+        self.ax.set_title(title)
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel("Net Winnings ($)")
+        self.ax.grid(True)
+        # Let matplotlib pick a handful of whole-number session ticks
+        self.ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+
+    def update(self, sessions, totals):
+        """Points the line at a new series and schedules a redraw."""
+        x = np.arange(1, len(totals) + 1) if self.sequential else sessions
+        plot_x, plot_y = minmax_downsample(x, totals)
+        self.line.set_data(plot_x, plot_y)
+        self.line.set_marker('o' if len(totals) <= MARKER_LIMIT else 'None')
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.figure.canvas.draw_idle()
+
+
+class DataVersionWatcher:
+    """Reports whether any other connection has committed since the last check."""
+    def __init__(self, db_path=DB_PATH):
+        # Kept open: PRAGMA data_version is only meaningful on the same connection
+        self.conn = sqlite3.connect(db_path)
+        self.version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self):
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.version:
+            return False
+        self.version = version
+        return True
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,93 @@
+# net_winnings_window.py
+
+"""
+Shared PyQt window for the cumulative net-winnings graphs.
+
+Every game's "Net Winnings" button and the main menu's total graph open this
+window. The series comes from net_winnings.series_cache, and while the window
+is open it checks PRAGMA data_version on a timer: when any connection has
+committed, the cached series is extended and the existing line is updated in
+place instead of rebuilding the figure.
+"""
+
+import sqlite3
+from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
+from PyQt6.QtCore import Qt, QTimer
+# Import the cached series, in-place plot and change watcher
+from net_winnings import DB_PATH, series_cache, NetWinningsPlot, DataVersionWatcher
+
+# How often an open graph checks for new commits, in milliseconds
+REFRESH_INTERVAL_MS = 1000
+
+
+class NetWinningsWindow(QWidget):
+    """
+    Graph of a player's cumulative net winnings that follows new sessions live.
+
+    sources is a list of (game table, net SQL expression). pending, if given, is
+    called on every refresh and returns (session number, net) of the player's
+    unsaved session or None.
+    """
+    def __init__(self, window_title, plot_title, player_id, sources, color=None, pending=None,
+                 xlabel="Session Number", sequential=False, total_text="Total Net Winnings",
+                 size=(600, 400), db_path=DB_PATH):
+        # matplotlib is imported with the first graph, not when a game loads
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        super().__init__()
+        self.setWindowTitle(window_title)
+        self.setGeometry(150, 150, size[0], size[1])
+        self.player_id = player_id
+        self.sources = list(sources)
+        self.pending = pending
+        self.total_text = total_text
+        self.db_path = db_path
+
+        layout = QVBoxLayout()
+        self.figure = Figure(figsize=(5, 4))
+        self.canvas = FigureCanvas(self.figure)
+        self.plot = NetWinningsPlot(self.figure, plot_title, xlabel, color, sequential)
+        self.total_label = QLabel("")
+        self.total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.total_label.setStyleSheet("font-size: 16px; font-weight: bold; padding-top: 10px;")
+        layout.addWidget(self.canvas)
+        layout.addWidget(self.total_label)
+        self.setLayout(layout)
+
+        # Number of points in the current series
+        self.points = 0
+        self.watcher = DataVersionWatcher(db_path)
+        self.refresh()
+
+        # Extend the line whenever another connection commits
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh_if_changed)
+        self.timer.start(REFRESH_INTERVAL_MS)
+
+    def has_data(self):
+        """Whether the player has any session to plot."""
+        return self.points > 0
+
+    def refresh(self):
+        """Brings the series up to date and updates the line in place."""
+        with sqlite3.connect(self.db_path) as conn:
+            sessions, totals = series_cache.series(conn, self.player_id, self.sources,
+                                                   self.pending() if self.pending else None)
+        self.points = len(totals)
+        self.plot.update(sessions, totals)
+        total = totals[-1] if len(totals) else 0.0
+        self.total_label.setText(f"{self.total_text}: ${total:.2f}")
+
+    def refresh_if_changed(self):
+        """Refreshes only after a commit, so an idle graph costs one pragma read per tick."""
+        try:
+            if self.watcher.changed():
+                self.refresh()
+        except sqlite3.Error as e:
+            print(f"Net winnings graph refresh failed: {e}")
+
+    def closeEvent(self, event):
+        """Stops following the database when the graph is closed."""
+        self.timer.stop()
+        self.watcher.close()
+        super().closeEvent(event)
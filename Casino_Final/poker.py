@@ -9,11 +9,11 @@ from PyQt6.QtWidgets import QApplication, QWidget, QMainWindow, QLabel, QLineEdi
 from PyQt6.QtGui import QIntValidator # Used to validate integer input in QLineEdit
 from PyQt6.QtCore import Qt # Used for alignment flags and other core Qt functionalities
 
-# Matplotlib imports for plotting graphs
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas # For embedding Matplotlib figures into PyQt6 applications
-from matplotlib.figure import Figure # To create Matplotlib figures
 
 from cheaters import log_cheater # Import the cheater logging function from a separate module
+from cheat_detector import CheatDetector # Import the shared rolling-window cheat detector
+from round_journal import record_rounds # Import the per-round journal writer
+from net_winnings_window import NetWinningsWindow # Import the shared live net-winnings graph window
 
 # Define the database path
 DB_PATH = "CasinoDB.db" # Path to the SQLite database file
@@ -85,26 +85,27 @@ class Card:
 
 
 class Poker(QMainWindow): # Changed to QMainWindow for consistency with other games
-    def __init__(self, player_id, parent_menu=None):
+    def __init__(self, session, parent_menu=None):
         """
         Initializes the Poker game window and game state.
         
         Args:
-            player_id (int): The ID of the current player.
+            session (PlayerSession): The logged-in player's session, shared by every game.
             parent_menu (QWidget): Reference to the main menu window to return to.
         """
         super().__init__() # Call the constructor of the parent QMainWindow class
         self.setWindowTitle("Texas Hold'em Poker") # Set the window title
         self.setGeometry(100, 100, 800, 600) # Set a reasonable window size (x, y, width, height)
 
-        self.player_id = player_id # Store the player's unique ID
+        self.session = session # Store the player's session
+        self.player_id = session.player_id # Store the player's unique ID
         self.parent_menu = parent_menu # Store reference to the main menu
 
         # Database connection and player data
         self.conn = sqlite3.connect(DB_PATH) # Establish connection to the SQLite database
         self.cursor = self.conn.cursor() # Create a cursor object for executing SQL queries
-        self.balance = self.fetch_balance_from_db() # Fetch the player's current balance from DB
-        self.full_name = self.fetch_player_name() # Fetch the player's full name from DB
+        self.balance = session.balance # Start from the balance carried by the session
+        self.full_name = session.full_name # Player's full name, loaded once at login
 
         # Game state variables
         self.player_hand = [] # List to store the player's two hole cards
@@ -115,63 +116,17 @@ class Poker(QMainWindow): # Changed to QMainWindow for consistency with other ga
         self.current_bet = 0.0 # Stores the player's bet for the current round
 
         # Session tracking for database logging and cheater detection
-        self.session_number = self.get_next_session_number() # Get the next available session number for this game launch
+        self.session_number = session.next_session_number("Poker") # Take the next session number for this game launch from the session counters
         self.total_winnings_session = 0.0 # Accumulates net winnings (profit/loss) for this entire game launch
         self.total_bets_session = 0.0     # Accumulates total money bet in this game launch
         self.wins_session = 0             # Counts total rounds won in this game launch
         self.losses_session = 0           # Counts total rounds lost in this game launch
-        self.session_history = []         # Stores win/loss (True/False) for cheater detection (last 20 games)
+        self.cheat_detector = CheatDetector.for_game("Poker") # Rolling window of win/loss results for cheater detection
+        self.pending_rounds = []          # Rounds (bet, payout, won) waiting to be journaled with the next save
 
         self.setup_ui() # Call method to set up the graphical user interface
         self.update_balance_label() # Update the balance display on the UI
 
-    def fetch_player_name(self):
-        """
-        Fetches the player's full name (first_name + last_name) from the PLAYERS table in the database.
-        Returns the full name as a string, or the player ID as a string if not found or an error occurs.
-        """
-        try:
-            # Execute SQL query to concatenate first and last names
-            self.cursor.execute("SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?", (self.player_id,))
-            result = self.cursor.fetchone() # Fetch the first (and only) result
-            return result[0] if result else str(self.player_id) # Return name if found, else ID
-        except Exception as e:
-            print(f"Error fetching player name: {e}") # Print error for debugging
-            return str(self.player_id) # Fallback to player ID
-
-    def fetch_balance_from_db(self):
-        """
-        Fetches the player's current balance from the PLAYERS table in the database.
-        Returns the balance as a float, or 100.0 as a default if not found or an error occurs.
-        """
-        try:
-            # Execute SQL query to get the player's balance
-            self.cursor.execute("SELECT balance FROM PLAYERS WHERE ID=?", (self.player_id,))
-            result = self.cursor.fetchone() # Fetch the result
-            return float(result[0]) if result else 100.0 # Return balance if found, else default
-        except Exception as e:
-            print(f"Error fetching balance: {e}") # Print error for debugging
-            return 100.0 # Fallback to default balance
-
-    def get_next_session_number(self):
-        """
-        Determines the next sequential session number for the current player in the Poker game.
-        Queries the Poker table for the maximum existing session number for the player
-        and returns that number incremented by 1. If no sessions exist, returns 1.
-        """
-        try:
-            # Query for the maximum session number for the current player in the Poker table
-            self.cursor.execute("""
-                SELECT MAX(session_number)
-                FROM Poker
-                WHERE player_name=?
-            """, (self.full_name,))
-            result = self.cursor.fetchone() # Fetch the result
-            return (result[0] or 0) + 1 # If result is None (no sessions), use 0 then add 1
-        except Exception as e:
-            print(f"Error fetching next session number: {e}") # Print error for debugging
-            return 1 # Fallback to session 1
-
     def setup_ui(self):
         """Sets up the graphical user interface for the Poker game."""
         central_widget = QWidget() # Create a central widget for the QMainWindow
@@ -636,17 +591,20 @@ class Poker(QMainWindow): # Changed to QMainWindow for consistency with other ga
             self.balance += self.current_bet * 2 # Player gets original bet back + 1x profit
             net_profit_loss_for_round = self.current_bet # Player's profit is the bet amount
             self.wins_session += 1 # Increment session wins
-            self.session_history.append(True) # Record win for cheater detection
+            self.cheat_detector.record(True) # Record win for cheater detection
+            self.pending_rounds.append((self.current_bet, self.current_bet * 2, True)) # Journal the round
         elif dealer_best_hand > player_best_hand:
             win_message = f"Dealer wins with a {self._hand_type_to_string(dealer_best_hand[0])}!"
             net_profit_loss_for_round = -self.current_bet # Player's loss is the bet amount
             self.losses_session += 1 # Increment session losses
-            self.session_history.append(False) # Record loss for cheater detection
+            self.cheat_detector.record(False) # Record loss for cheater detection
+            self.pending_rounds.append((self.current_bet, 0.0, False)) # Journal the round
         else: # It's a tie
             win_message = "It's a tie! Bet returned."
             self.balance += self.current_bet # Return original bet to player
             net_profit_loss_for_round = 0.0 # No profit, no loss
-            self.session_history.append(False) # Treat tie as non-win for cheater detection
+            self.cheat_detector.record(False) # Treat tie as non-win for cheater detection
+            self.pending_rounds.append((self.current_bet, self.current_bet, False)) # Journal the round (bet returned)
 
         self.total_winnings_session += net_profit_loss_for_round # Accumulate the profit/loss for the entire session
         self.label_win.setText(win_message) # Display the game outcome message
@@ -654,14 +612,13 @@ class Poker(QMainWindow): # Changed to QMainWindow for consistency with other ga
         self.save_user() # Save current game state to the database after each round
 
         # Cheater detection logic: Check if win rate is suspiciously high over the last 20 games
-        if len(self.session_history) >= 20: # Ensure at least 20 games have been played
-            recent_results = self.session_history[-20:] # Get the results of the last 20 games
-            win_rate = sum(recent_results) / 20.0 # Calculate the win rate (sum of True's / 20)
-            if win_rate >= 0.8: # If win rate is 80% or higher
-                log_cheater(self.player_id, "Poker", win_rate) # Log the player as a cheater
-                QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last 20 games and have been flagged.")
-                self.back_to_menu() # Return player to main menu
-                return
+        if self.cheat_detector.flagged: # Recent win count too unlikely for an honest player
+            win_rate = self.cheat_detector.win_rate # Win rate over the detector's window
+            rounds = self.cheat_detector.rounds # Games in the window
+            log_cheater(self.player_id, "Poker", win_rate, rounds) # Log the player as a cheater
+            QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last {rounds} games and have been flagged.")
+            self.back_to_menu() # Return player to main menu
+            return
 
         # Check for game over condition (player runs out of money)
         if self.balance <= 0:
@@ -706,7 +663,7 @@ class Poker(QMainWindow): # Changed to QMainWindow for consistency with other ga
             self.cursor.execute("UPDATE PLAYERS SET balance=? WHERE ID=?", (self.balance, self.player_id))
 
             # Check if an entry for the current session_number and player exists in the Poker table
-            self.cursor.execute("SELECT 1 FROM Poker WHERE player_name=? AND session_number=?", (self.full_name, self.session_number))
+            self.cursor.execute("SELECT 1 FROM Poker WHERE player_id=? AND session_number=?", (self.player_id, self.session_number))
             exists = self.cursor.fetchone() # Fetch result to see if entry exists
 
             # If an entry exists, update it
@@ -717,21 +674,22 @@ class Poker(QMainWindow): # Changed to QMainWindow for consistency with other ga
                         bet_amount = ?,
                         wins = ?,
                         money_won = ?
-                    WHERE player_name = ? AND session_number = ?
+                    WHERE player_id = ? AND session_number = ?
                 """, (
                     self.wins_session + self.losses_session, # total rounds played in this session
                     self.total_bets_session, # total money bet in this session
                     self.wins_session, # total wins for this session
                     self.total_winnings_session, # This is the accumulated net profit/loss for the session
-                    self.full_name, # player's full name
+                    self.player_id, # player ID
                     self.session_number # current session number
                 ))
             # If no entry exists, insert a new one
             else:
                 self.cursor.execute("""
-                    INSERT INTO Poker (player_name, number_of_bets, bet_amount, wins, money_won, session_number)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO Poker (player_id, player_name, number_of_bets, bet_amount, wins, money_won, session_number)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (
+                    self.player_id,
                     self.full_name,
                     self.wins_session + self.losses_session,
                     self.total_bets_session,
@@ -739,7 +697,10 @@ class Poker(QMainWindow): # Changed to QMainWindow for consistency with other ga
                     self.total_winnings_session, # This is the accumulated net profit/loss for the session
                     self.session_number
                 ))
+            record_rounds(self.cursor, "Poker", self.player_id, self.full_name, self.session_number, self.pending_rounds) # Journal the rounds in the same transaction
             self.conn.commit() # Commit changes to the database
+            self.pending_rounds.clear() # Those rounds are now journaled
+            self.session.balance = self.balance # The next game starts from the saved balance
         except Exception as e:
             print(f"DB Save Error: {e}") # Print error for debugging
             QMessageBox.critical(self, "Database Error", f"Failed to save game data: {e}") # Show critical error message
@@ -758,61 +719,18 @@ class Poker(QMainWindow): # Changed to QMainWindow for consistency with other ga
     def plot_net_winnings(self):
         """
         Plots the cumulative net winnings over sessions for the Poker game.
-        Fetches session data from the database and displays it as a line graph.
+        Opens the shared graph window, which follows new sessions live.
         """
         try:
-            # Query for session number, money_won, and bet_amount for the current player
-            self.cursor.execute("""
-                SELECT session_number, money_won, bet_amount FROM Poker
-                WHERE player_name=? ORDER BY session_number
-            """, (self.full_name,))
-            rows = self.cursor.fetchall() # Fetch all results
-
-            if not rows: # If no data is found for the player
+            # Graph window for the Poker history (money_won is already net)
+            self.graph_window = NetWinningsWindow(
+                "Net Winnings - Poker", "Cumulative Net Winnings - Poker",
+                self.player_id, [("Poker", "money_won")], color='brown') # Store as instance variable to prevent premature garbage collection
+
+            if not self.graph_window.has_data(): # If no data is found for the player
                 QMessageBox.information(self, "No Data", "No winnings history available for this player.")
                 return
 
-            cumulative_net_winnings = [] # List to store cumulative net winnings for plotting
-            session_numbers = [] # List to store session numbers for plotting
-            current_total_net = 0.0 # Running total of net winnings
-
-            # Iterate through fetched rows to calculate cumulative net winnings
-            for session_num, money_won_from_db, bet_amount in rows:
-                if session_num is not None: # Ensure session number is valid
-                    # Calculate net winnings for this session (money_won is already net)
-                    net_for_session = money_won_from_db
-                    current_total_net += net_for_session # Add to the running total
-                    cumulative_net_winnings.append(current_total_net) # Append cumulative total
-                    session_numbers.append(int(session_num)) # Append session number
-
-            # Create a new QWidget to host the graph window
-            self.graph_window = QWidget() # Store as instance variable to prevent premature garbage collection
-            self.graph_window.setWindowTitle("Net Winnings - Poker") # Set window title
-            self.graph_window.setGeometry(150, 150, 600, 400) # Set window geometry
-
-            layout = QVBoxLayout() # Create a vertical layout for the graph window
-            self.graph_window.setLayout(layout) # Set the layout
-
-            fig = Figure(figsize=(5, 4)) # Create a Matplotlib figure
-            canvas = FigureCanvas(fig) # Create a FigureCanvas to embed the figure in PyQt6
-            ax = fig.add_subplot(111) # Add a subplot to the figure
-
-            # Plot the cumulative net winnings data
-            ax.plot(session_numbers, cumulative_net_winnings, marker='o', color='brown')
-            ax.set_title("Cumulative Net Winnings - Poker") # Set chart title
-            ax.set_xlabel("Session Number") # Set x-axis label
-            ax.set_ylabel("Net Winnings ($)") # Set y-axis label
-            ax.grid(True) # Enable grid lines
-            ax.set_xticks(session_numbers) # Set x-axis ticks to show all session numbers
-
-            # Create a QLabel to display the final total net winnings
-            total_label = QLabel(f"Total Net Winnings: ${current_total_net:.2f}")
-            total_label.setAlignment(Qt.AlignmentFlag.AlignCenter) # Center-align the label
-
-            layout.addWidget(canvas) # Add the Matplotlib canvas to the layout
-            layout.addWidget(total_label) # Add the total winnings label to the layout
-
-            self.graph_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose) # Ensure widget is deleted on close
             self.graph_window.show() # Show the graph window
         except Exception as e:
             QMessageBox.critical(self, "Plot Error", f"Failed to plot winnings: {e}") # Show error message if plotting fails
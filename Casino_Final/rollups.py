@@ -0,0 +1,126 @@
+# rollups.py
+
+"""
+Hourly and daily per-game rollups of the ROUNDS journal.
+
+GAME_ROLLUPS holds one row per (grain, bucket, game) with the handle (money
+staked), payouts, decided rounds and unique players of that hour or day;
+GAME_HOLD adds the hold percentage, (handle - payouts) / handle. The rollups are
+updated by round_journal.record_rounds in the same transaction as the rounds
+themselves, so trend queries read a few thousand rollup rows instead of
+scanning the journal. ROLLUP_PLAYERS remembers which players were already
+counted in a bucket.
+
+The rollups cover the journal only. Sessions played before it (migration 2)
+exist only as undated per-session rows in the game tables, without per-round
+stakes and payouts, so they cannot be put in an hour or a day and are not
+included in any rollup.
+
+Rebuild the rollups from the journal (e.g. after repairing ROUNDS rows):
+    python rollups.py --rebuild
+Print per-game hold for the last 30 days:
+    python rollups.py --days 30
+"""
+
+import argparse
+import sqlite3
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Rollup grains and how a 'YYYY-MM-DD HH:MM:SS' timestamp maps to their bucket
+GRAINS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d",
+}
+
+
+def buckets(played_at):
+    """Returns (grain, bucket) for every grain of a 'YYYY-MM-DD HH:MM:SS' timestamp."""
+    return [("hour", played_at[:13] + ":00:00"), ("day", played_at[:10])]
+
+
+def update_rollups(cur, game, player_id, played_at, rounds):
+    """
+    Adds a batch of (bet, payout, won) rounds played by one player at `played_at`
+    to its hourly and daily buckets using the caller's cursor (the caller commits).
+    """
+    handle = sum(bet for bet, _, _ in rounds)
+    payouts = sum(payout for _, payout, _ in rounds)
+    decided = sum(1 for _, _, won in rounds if won is not None)
+    for grain, bucket in buckets(played_at):
+        # Count the player once per bucket
+        new_player = 0
+        if player_id is not None:
+            new_player = cur.execute(
+                "INSERT OR IGNORE INTO ROLLUP_PLAYERS (grain, bucket, game, player_id) VALUES (?, ?, ?, ?)",
+                (grain, bucket, game, player_id)).rowcount
+        cur.execute("""
+            INSERT INTO GAME_ROLLUPS (grain, bucket, game, handle, payouts, rounds, unique_players)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (grain, bucket, game) DO UPDATE SET
+                handle = handle + excluded.handle,
+                payouts = payouts + excluded.payouts,
+                rounds = rounds + excluded.rounds,
+                unique_players = unique_players + excluded.unique_players
+        """, (grain, bucket, game, handle, payouts, decided, new_player))
+
+
+def rebuild_rollups(conn):
+    """Recomputes every rollup from the full journal (the caller commits)."""
+    conn.execute("DELETE FROM GAME_ROLLUPS")
+    conn.execute("DELETE FROM ROLLUP_PLAYERS")
+    for grain, pattern in GRAINS.items():
+        conn.execute("""
+            INSERT INTO ROLLUP_PLAYERS (grain, bucket, game, player_id)
+            SELECT DISTINCT ?, strftime(?, played_at), game, player_id
+            FROM ROUNDS
+            WHERE player_id IS NOT NULL
+        """, (grain, pattern))
+        conn.execute("""
+            INSERT INTO GAME_ROLLUPS (grain, bucket, game, handle, payouts, rounds, unique_players)
+            SELECT ?, strftime(?, played_at) AS bucket, game, SUM(bet), SUM(payout), COUNT(won),
+                   COUNT(DISTINCT player_id)
+            FROM ROUNDS
+            GROUP BY bucket, game
+        """, (grain, pattern))
+
+
+def hold_by_game(conn, grain="day", since=None):
+    """
+    Returns (bucket, game, handle, payouts, rounds, unique_players, hold %) rows of
+    one grain, oldest first, optionally from bucket `since` on.
+    """
+    return conn.execute("""
+        SELECT bucket, game, handle, payouts, rounds, unique_players, hold_pct
+        FROM GAME_HOLD
+        WHERE grain = ? AND bucket >= ?
+        ORDER BY bucket, game
+    """, (grain, since or "")).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain and print the per-game hold rollups.")
+    parser.add_argument("--db", default=DB_PATH, help="Database to use (default CasinoDB.db)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Rebuild every rollup from the rounds journal (history from before the journal is not included)")
+    parser.add_argument("--grain", choices=sorted(GRAINS), default="day", help="Rollup grain to print")
+    parser.add_argument("--days", type=int, default=30, help="How many days back to print")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        if args.rebuild:
+            with conn:
+                rebuild_rollups(conn)
+            print("Rebuilt rollups from the rounds journal")
+        since = conn.execute("SELECT date('now', ?)", (f"-{args.days} days",)).fetchone()[0]
+        print(f"{'Bucket':<20}{'Game':<11}{'Handle':>12}{'Payouts':>12}{'Rounds':>8}{'Players':>8}{'Hold':>8}")
+        for bucket, game, handle, payouts, rounds, players, hold in hold_by_game(conn, args.grain, since):
+            hold_text = f"{hold:.1f}%" if hold is not None else "N/A"
+            print(f"{bucket:<20}{game:<11}{handle:>12.2f}{payouts:>12.2f}{rounds:>8}{players:>8}{hold_text:>8}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,6 @@
 import random
 #Import sqlite3 to interact with the CasinoDB SQLite database
 import sqlite3
-#Import pyplot from matplotlib for plotting graphs
-import matplotlib.pyplot as plt
 #Import PyQt6 widgets to build the GUI
 from PyQt6.QtWidgets import (
     #Import necessary UI elements
@@ -17,10 +15,14 @@ from PyQt6.QtWidgets import QAbstractItemView
 from PyQt6.QtCore import Qt
 #Import function to log cheaters based on high win rates
 from cheaters import log_cheater
-#Import canvas for displaying matplotlib graph in GUI
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-#Import Figure to create custom plot figures
-from matplotlib.figure import Figure
+# Import the shared rolling-window cheat detector
+from cheat_detector import CheatDetector
+# Import the per-round journal writer
+from round_journal import record_rounds
+# Import the shared live net-winnings graph window
+from net_winnings_window import NetWinningsWindow
+# Import the net result of a Roulette session row
+from net_winnings import NET_EXPRESSIONS
 
 #Define path to the SQLite database
 DB_PATH = "CasinoDB.db"
@@ -28,15 +30,19 @@ DB_PATH = "CasinoDB.db"
 #Create the RouletteGame class that inherits from QWidget
 class RouletteGame(QWidget):
     #Constructor to initialize the game window
-    def __init__(self, player_id, parent_menu=None):
+    def __init__(self, session, parent_menu=None):
         #Call the parent constructor
         super().__init__()
         #Set the title of the window
         self.setWindowTitle("Roulette")
         #Set window position and size
         self.setGeometry(100, 100, 800, 700)
+        #Store the player's session shared by every game
+        self.session = session
         #Store the current player's ID
-        self.player_id = player_id
+        self.player_id = session.player_id
+        #Store the player's full name, stored with each row as a display label
+        self.full_name = session.full_name
         #Store the reference to the main menu for navigation
         self.parent_menu = parent_menu
 
@@ -44,13 +50,11 @@ class RouletteGame(QWidget):
         self.conn = sqlite3.connect(DB_PATH)
         #Create a cursor to execute SQL queries
         self.cur = self.conn.cursor()
-        #Fetch the current player's balance
-        self.cur.execute("SELECT balance FROM PLAYERS WHERE ID=?", (self.player_id,))
-        #Store the retrieved balance
-        self.balance = self.cur.fetchone()[0]
+        #Start from the balance carried by the session
+        self.balance = self.session.balance
 
-        #Determine the next session number for the player
-        self.session_number = self.get_next_session_number()
+        #Take the next session number for the player from the session counters
+        self.session_number = self.session.next_session_number("Roulette")
 
         #Initialize total number of wins
         self.winner = 0
@@ -66,8 +70,8 @@ class RouletteGame(QWidget):
         self.r_tot_won = 0
         #Initialize total money lost (gross for the session)
         self.r_tot_loss = 0
-        #Initialize history to track wins/losses per spin
-        self.session_history = []
+        #Initialize the rolling window of wins/losses per bet for cheater detection
+        self.cheat_detector = CheatDetector.for_game("Roulette")
         # Initialize self.graph_window to None, it will be assigned when plot_net_winnings is called
         self.graph_window = None
         
@@ -266,14 +270,6 @@ class RouletteGame(QWidget):
     def update_balance_label(self):
         self.balance_label.setText(f"Player Balance: ${self.balance:.2f}")
 
-    #Retrieve the next session number from DB
-    def get_next_session_number(self):
-        #Fetch max session
-        self.cur.execute("SELECT MAX(session_number) FROM Roulette WHERE player_name = (SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?)", (self.player_id,))
-        result = self.cur.fetchone()[0]
-        #Increment for new session
-        return (result or 0) + 1
-
     #Add buttons for roulette grid
     def build_roulette_grid(self):
         #Green 0
@@ -348,6 +344,8 @@ class RouletteGame(QWidget):
         rolled = random.randint(0, 36)
         total_winnings = 0
         total_bet_for_round = sum(self.bets.values())
+        #Each bet is its own round: (bet, payout, won)
+        bet_results = []
         
         # Process each bet
         for bet_type, bet_amount in self.bets.items():
@@ -394,20 +392,20 @@ class RouletteGame(QWidget):
                 
             if win:
                 total_winnings += payout
+            bet_results.append((bet_amount, payout, win))
 
         net_winnings_for_round = total_winnings - total_bet_for_round
         
         self.balance += total_winnings
         
-        if net_winnings_for_round > 0:
-            self.session_history.append(True)
-            self.winner += 1
-        else:
-            self.session_history.append(False)
-            self.loser += 1
+        #Count every bet's decision, so a spin covered by many bets is not one likely win
+        bets_won = sum(1 for _, _, win in bet_results if win)
+        self.cheat_detector.record_many(win for _, _, win in bet_results)
+        self.winner += bets_won
+        self.loser += len(bet_results) - bets_won
         
         self.tot_bet_money += total_bet_for_round
-        self.tot_bet_played += 1
+        self.tot_bet_played += len(bet_results)
         self.r_tot_won += net_winnings_for_round
         self.r_tot_loss += total_bet_for_round
 
@@ -415,20 +413,22 @@ class RouletteGame(QWidget):
         self.cur.execute("UPDATE PLAYERS SET balance=? WHERE ID=?", (self.balance, self.player_id))
         
         self.cur.execute("""
-            INSERT INTO Roulette (player_name, number_of_bets, bet_amount, wins, losses, money_won, session_number)
-            VALUES ((SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID = ?), ?, ?, ?, ?, ?, ?)
-        """, (self.player_id, self.tot_bet_played, self.tot_bet_money, self.winner, self.loser, self.r_tot_won, self.session_number))
+            INSERT INTO Roulette (player_id, player_name, number_of_bets, bet_amount, wins, losses, money_won, session_number)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (self.player_id, self.full_name, self.tot_bet_played, self.tot_bet_money, self.winner, self.loser, self.r_tot_won, self.session_number))
+        # Journal this spin's bets in the same transaction
+        record_rounds(self.cur, "Roulette", self.player_id, self.full_name, self.session_number, bet_results)
         self.conn.commit()
+        self.session.balance = self.balance
         
         # Cheater detection logic
-        if len(self.session_history) >= 20:
-            recent = self.session_history[-20:]
-            rate = sum(recent) / 20
-            if rate >= 0.8:
-                log_cheater(self.player_id, "Roulette", rate)
-                QMessageBox.warning(self, "Cheater Detected", f"You won {rate*100:.1f}% of your last 20 games and have been flagged.")
-                self.close()
-                return
+        if self.cheat_detector.flagged:
+            rate = self.cheat_detector.win_rate
+            rounds = self.cheat_detector.rounds
+            log_cheater(self.player_id, "Roulette", rate, rounds)
+            QMessageBox.warning(self, "Cheater Detected", f"You won {rate*100:.1f}% of your last {rounds} games and have been flagged.")
+            self.close()
+            return
 
         # Update GUI
         self.bets.clear()
@@ -469,93 +469,24 @@ class RouletteGame(QWidget):
         self.close()
 
     def plot_net_winnings(self):
-        #Query previous game sessions for this player
-        self.cur.execute("""
-            SELECT session_number, money_won, bet_amount FROM Roulette
-            WHERE player_name = (SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?)
-            ORDER BY session_number
-        """, (self.player_id,))
-        #Fetch all results
-        rows = self.cur.fetchall()
+        #Create the shared graph window; it follows new spins live while it is open
+        self.graph_window = NetWinningsWindow(
+            "Net Winnings Graph", "Cumulative Net Winnings - Roulette",
+            self.player_id, [("Roulette", NET_EXPRESSIONS["Roulette"])],
+            color='blue', pending=self.pending_session)
 
         # If there are no results, and we have not played in the current session, show message
-        if not rows and self.tot_bet_played == 0:
+        if not self.graph_window.has_data():
             QMessageBox.information(self, "No Data", "No winnings history available for this player.")
             return
 
-        # Aggregate data by session number
-        session_data = {}
-        for session_num, money_won, bet_amount in rows:
-            if session_num is None: # Skip rows with no session number
-                continue
-            if session_num not in session_data:
-                session_data[session_num] = {'money_won': 0, 'bet_amount': 0}
-            session_data[session_num]['money_won'] += money_won
-            session_data[session_num]['bet_amount'] += bet_amount
-
-        # Add current session data to the aggregation
-        if self.tot_bet_played > 0:
-            if self.session_number not in session_data:
-                session_data[self.session_number] = {'money_won': 0, 'bet_amount': 0}
-            session_data[self.session_number]['money_won'] = self.r_tot_won
-            session_data[self.session_number]['bet_amount'] = self.tot_bet_money
-
-        # Prepare data for plotting
-        sorted_sessions = sorted(session_data.keys())
-        session_numbers = []
-        cumulative = []
-        total = 0
-
-        for session_num in sorted_sessions:
-            data = session_data[session_num]
-            net = data['money_won'] - data['bet_amount']
-            total += net
-            cumulative.append(total)
-            session_numbers.append(session_num)
-
-
-        #Create a new window for the graph
-        self.graph_window = QWidget()
-        #Set window title
-        self.graph_window.setWindowTitle("Net Winnings Graph")
-        #Set window size and position
-        self.graph_window.setGeometry(150, 150, 600, 400)
-
-        #Create vertical layout for graph
-        layout = QVBoxLayout()
-
-        #Create matplotlib figure
-        fig = Figure(figsize=(5, 4))
-        #Create canvas to embed in GUI
-        canvas = FigureCanvas(fig)
-        #Add subplot to figure
-        ax = fig.add_subplot(111)
-        #Plot net winnings line
-        ax.plot(session_numbers, cumulative, marker='o', color='blue')
-        #Set x-axis ticks to session numbers
-        ax.set_xticks(session_numbers)
-        #Set graph title
-        ax.set_title("Cumulative Net Winnings - Roulette")
-        #Set x-axis label
-        ax.set_xlabel("Session Number")
-        #Set y-axis label
-        ax.set_ylabel("Net Winnings ($)")
-        #Enable grid lines
-        ax.grid(True)
-
-        #Add canvas to layout
-        layout.addWidget(canvas)
-
-        #Create label showing total net winnings
-        total_label = QLabel(f"Total Net Winnings: ${total:.2f}")
-        #Center the label text
-        total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        #Style the label
-        total_label.setStyleSheet("font-size: 16px; font-weight: bold; padding-top: 10px;")
-        #Add label to layout
-        layout.addWidget(total_label)
-
-        #Set layout for the graph window
-        self.graph_window.setLayout(layout)
         #Show the graph window
         self.graph_window.show()
+
+    def pending_session(self):
+        """
+        Returns (session number, net) of the current session, which replaces its saved rows in the graph.
+        """
+        if self.tot_bet_played > 0:
+            return (self.session_number, self.r_tot_won)
+        return None
@@ -0,0 +1,45 @@
+# round_journal.py
+
+"""
+Per-round journal shared by every game.
+
+The game tables hold one aggregate row per session, which hides individual
+rounds. Each game also appends its rounds to the ROUNDS table (created by
+migration 2) with the same cursor, right before it commits its session row, so
+a round is journaled exactly when it is committed. Readers such as the admin
+anomaly panel tail the journal by id and only ever look at new rows. The
+hourly and daily per-game rollups (see rollups.py) are updated alongside.
+
+A round is (bet, payout, won):
+    bet     money staked on the round
+    payout  money returned to the player, stake included (net = payout - bet)
+    won     1 or 0, or None for entries that are not a decided round
+            (e.g. a High/Low cash-out, which only pays out the pot)
+"""
+
+# Import the rollup maintenance shared with the rebuild command
+from rollups import update_rollups
+
+_INSERT_ROUND = """
+    INSERT INTO ROUNDS (played_at, game, player_id, player_name, session_number, bet, payout, won)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def record_round(cur, game, player_id, player_name, session_number, bet, payout, won):
+    """Journals one round using the caller's cursor (the caller commits)."""
+    record_rounds(cur, game, player_id, player_name, session_number, [(bet, payout, won)])
+
+
+def record_rounds(cur, game, player_id, player_name, session_number, rounds):
+    """Journals many (bet, payout, won) rounds with one executemany (the caller commits)."""
+    if not rounds:
+        return
+    # One timestamp for the batch so the journal and the rollups agree on its bucket
+    played_at = cur.execute("SELECT datetime('now')").fetchone()[0]
+    cur.executemany(_INSERT_ROUND, [
+        (played_at, game, player_id, player_name, session_number, bet, payout,
+         None if won is None else int(bool(won)))
+        for bet, payout, won in rounds
+    ])
+    update_rollups(cur, game, player_id, played_at, rounds)
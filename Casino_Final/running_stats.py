@@ -0,0 +1,76 @@
+# running_stats.py
+
+"""Streaming statistics shared by the live anomaly panel and the analytics report."""
+
+import math
+from collections import deque
+
+
+class RunningStats:
+    """Welford running mean and variance of a stream of values."""
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, x):
+        """Adds one value in O(1)."""
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self):
+        """Sample variance (0 until two values have been seen)."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class WindowedStats:
+    """
+    Rolling mean and variance of the last `size` values of a stream. Once the
+    window is full each new value replaces the oldest with an O(1) update of
+    the mean and of the sum of squared deviations.
+    """
+    __slots__ = ("size", "values", "mean", "m2")
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def n(self):
+        """Number of values in the window."""
+        return len(self.values)
+
+    def update(self, x):
+        """Adds one value, dropping the oldest once the window is full, in O(1)."""
+        if len(self.values) < self.size:
+            self.values.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (x - self.mean)
+            return
+        old = self.values.popleft()
+        self.values.append(x)
+        old_mean = self.mean
+        self.mean += (x - old) / self.size
+        # Rounding can leave a tiny negative sum for a constant window
+        self.m2 = max(0.0, self.m2 + (x - old) * (x - self.mean + old - old_mean))
+
+    @property
+    def variance(self):
+        """Sample variance of the window (0 until two values have been seen)."""
+        return self.m2 / (len(self.values) - 1) if len(self.values) > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
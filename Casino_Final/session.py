@@ -0,0 +1,82 @@
+# session.py
+
+"""
+The logged-in player's session context.
+
+LoginMenu loads a PlayerSession once (ID, display name, balance and the last
+session number the player has in every game table) and it is handed from the
+deposit window to the main menu and on to every game. Games read the player's
+name and balance from it instead of querying PLAYERS when they open, take
+their session number from its counters instead of a MAX() query, and write
+their balance back to it when they save, so the next game starts from the
+current balance without another query. The main menu reloads it whenever it
+recomputes the player's stats, since that rewrites PLAYERS.balance.
+"""
+
+import sqlite3
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# Game tables that keep a per-player session number
+GAME_TABLES = ("Roulette", "Craps", "Blackjack", "HighLow", "Slots", "Poker")
+
+
+class PlayerSession:
+    """A logged-in player: ID, display name, balance and per-game session counters."""
+    def __init__(self, player_id, full_name, balance, last_sessions=None):
+        self.player_id = player_id
+        self.full_name = full_name
+        self.balance = balance
+        # Game table -> highest session number handed out (or found in the table)
+        self.last_sessions = dict(last_sessions or {})
+
+    @classmethod
+    def load(cls, conn, player_id):
+        """Reads a player's profile and session counters. Returns None if the player does not exist."""
+        row = conn.execute("SELECT first_name || ' ' || last_name, balance FROM PLAYERS WHERE ID=?",
+                           (player_id,)).fetchone()
+        if row is None:
+            return None
+        # One statement for every game's highest session number (each an index lookup)
+        query = " UNION ALL ".join(
+            f"SELECT '{table}', MAX(session_number) FROM {table} WHERE player_id = ?" for table in GAME_TABLES)
+        last_sessions = {table: int(number or 0)
+                         for table, number in conn.execute(query, (player_id,) * len(GAME_TABLES))}
+        return cls(player_id, row[0], float(row[1] or 0.0), last_sessions)
+
+    def refresh(self, conn):
+        """
+        Re-reads the balance and session counters after something else rewrote
+        PLAYERS (e.g. update_stats.update_player_stats). Counters never move
+        back, so a session number already handed out is not reused.
+        """
+        latest = PlayerSession.load(conn, self.player_id)
+        if latest is None:
+            return
+        self.balance = latest.balance
+        for game, number in latest.last_sessions.items():
+            self.last_sessions[game] = max(self.last_sessions.get(game, 0), number)
+
+    def next_session_number(self, game):
+        """Hands out the next session number of a game for this player."""
+        number = self.last_sessions.get(game, 0) + 1
+        self.last_sessions[game] = number
+        return number
+
+
+def load_session(player_id, db_path=DB_PATH):
+    """Opens the database and loads a player's session, or returns None if there is no such player."""
+    conn = sqlite3.connect(db_path)
+    try:
+        return PlayerSession.load(conn, player_id)
+    finally:
+        conn.close()
+
+
+def refresh_session(session, db_path=DB_PATH):
+    """Opens the database and re-reads a session's balance and counters."""
+    conn = sqlite3.connect(db_path)
+    try:
+        session.refresh(conn)
+    finally:
+        conn.close()
@@ -0,0 +1,256 @@
+# slot_engine.py
+
+"""
+Data-driven slot machine engine.
+
+When a machine is loaded its reel strips and paylines are compiled into lookup
+arrays:
+
+  * each symbol gets an index, and every (reel, stop, row) cell is stored as
+    that index already multiplied by the reel's place value, so the code of a
+    whole line is the sum of one lookup per reel;
+  * every possible line code maps to an outcome id (multiplier, run length,
+    symbol) computed once with slots_math.line_pay.
+
+Evaluating a spin across all paylines is then a handful of array lookups and
+additions, whatever the number of reels, rows or lines. Machines use the same
+dict format as slots_math, with two optional keys:
+
+    "rows":  number of visible rows per reel (default 1)
+    "lines": paylines as one row index per reel (default: a single line on row 0)
+
+Reels given as weight maps are expanded into strips (each symbol repeated
+`weight` times, so weights must be whole numbers); give explicit strips when
+the order matters on multi-row machines.
+
+SlotEngine.stats() gives the per-spin RTP, hit frequency and variance across
+every payline, which slots_math.analyze() only covers for a single line.
+"""
+
+import json
+import math
+import os
+import random
+from array import array
+
+import numpy as np
+
+from slots_math import DEFAULT_MACHINE, SlotStats, analyze, line_pay, normalize_machine
+
+# Machine file written by slots_tuner.py; the game uses it when present
+SLOTS_MACHINE_PATH = "slots_machine.json"
+
+# Largest number of distinct line codes a machine may compile to
+MAX_LINE_CODES = 4_000_000
+# Most stop combinations stats() enumerates exactly; larger multi-line machines are sampled
+MAX_EXACT_SPINS = 2_000_000
+# Spins sampled (with a fixed seed) for a multi-line machine too large to enumerate
+STATS_SAMPLE_SPINS = 1_000_000
+
+# Compiled engines by (machine file, modification time); engines are read-only once built
+_compiled = {}
+
+
+class SlotEngine:
+    """A compiled slot machine. Spins return stops; outcomes come from lookup tables."""
+    def __init__(self, machine):
+        # Keep the reels in the order given (strips keep their order)
+        strips = [self._strip(reel) for reel in machine["reels"]]
+        self.paytable = normalize_machine(machine)["paytable"]
+        self.reel_count = len(strips)
+        self.rows = int(machine.get("rows", 1))
+        if self.rows < 1:
+            raise ValueError(f"Machine has {self.rows} rows; it needs at least one.")
+        self.lines = [self._line(line, index) for index, line in
+                      enumerate(machine.get("lines", [[0] * self.reel_count]))]
+        if not self.lines:
+            raise ValueError("Machine has no paylines.")
+        self.line_count = len(self.lines)
+        self.strips = strips
+        # Per-spin statistics, computed on first use
+        self._stats = None
+
+        # Symbol <-> index
+        self.symbols = sorted({symbol for strip in strips for symbol in strip})
+        symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        radix = len(self.symbols)
+        if radix ** self.reel_count > MAX_LINE_CODES:
+            raise ValueError(f"Machine has {radix ** self.reel_count} line codes; at most {MAX_LINE_CODES} can be compiled.")
+
+        # cells[reel][stop * rows + row] = symbol index * radix ** reel
+        self.cells = []
+        for reel, strip in enumerate(strips):
+            place = radix ** reel
+            length = len(strip)
+            cells = array("l")
+            for stop in range(length):
+                for row in range(self.rows):
+                    cells.append(symbol_index[strip[(stop + row) % length]] * place)
+            self.cells.append(cells)
+
+        # Line code -> outcome id, and outcome id -> (multiplier, run length, symbol)
+        self.outcomes = []
+        outcome_ids = {}
+        self.outcome_of_code = array("l", bytes(array("l").itemsize * radix ** self.reel_count))
+        for code in range(radix ** self.reel_count):
+            line = [self.symbols[(code // radix ** reel) % radix] for reel in range(self.reel_count)]
+            outcome = line_pay(line, self.paytable)
+            if outcome not in outcome_ids:
+                outcome_ids[outcome] = len(self.outcomes)
+                self.outcomes.append(outcome)
+            self.outcome_of_code[code] = outcome_ids[outcome]
+        # Multiplier of each outcome id, for the batch path
+        self.outcome_multiplier = [outcome[0] for outcome in self.outcomes]
+
+        # Row offset of every (line, reel), so a line is read with one index per reel
+        self.line_rows = [tuple(line[reel] for reel in range(self.reel_count)) for line in self.lines]
+
+    def _line(self, line, index):
+        """Returns a payline as a list of row indices, one per reel."""
+        if len(line) != self.reel_count:
+            raise ValueError(f"Payline {index} has {len(line)} entries; the machine has {self.reel_count} reels.")
+        for row in line:
+            if row != int(row) or not 0 <= row < self.rows:
+                raise ValueError(f"Payline {index} uses row {row}; the machine has {self.rows} rows.")
+        return [int(row) for row in line]
+
+    @staticmethod
+    def _strip(reel):
+        """Returns a reel as a strip (list of symbols)."""
+        if isinstance(reel, dict):
+            strip = []
+            for symbol, weight in reel.items():
+                # A strip repeats each symbol, so only whole weights can be compiled
+                if weight < 0 or weight != int(weight):
+                    raise ValueError(f"Reel weight {weight} of symbol {symbol} is not a whole number; "
+                                     "scale the reel's weights to integers (as slots_tuner.py does).")
+                strip.extend([int(symbol)] * int(weight))
+        else:
+            strip = [int(symbol) for symbol in reel]
+        if not strip:
+            raise ValueError("Machine has an empty reel.")
+        return strip
+
+    def random_stops(self, rng=random):
+        """Picks a stop position on every reel."""
+        return [rng.randrange(len(strip)) for strip in self.strips]
+
+    def evaluate(self, stops):
+        """
+        Evaluates one spin across every payline.
+        Returns (total multiplier, [(line index, multiplier, run length, symbol), ...])
+        where the multiplier is per unit of the whole bet (split evenly over the lines).
+        """
+        rows = self.rows
+        cells = self.cells
+        outcome_of_code = self.outcome_of_code
+        wins = []
+        total = 0.0
+        for line_index, line_rows in enumerate(self.line_rows):
+            code = 0
+            for reel, row in enumerate(line_rows):
+                code += cells[reel][stops[reel] * rows + row]
+            mult, run, symbol = self.outcomes[outcome_of_code[code]]
+            if mult > 0:
+                wins.append((line_index, mult, run, symbol))
+                total += mult
+        return total / self.line_count, wins
+
+    def spin(self, rng=random):
+        """Spins once. Returns (stops, total multiplier, line wins)."""
+        stops = self.random_stops(rng)
+        total, wins = self.evaluate(stops)
+        return stops, total, wins
+
+    def evaluate_many(self, stops_list):
+        """Returns the total multiplier of each spin in `stops_list` (no per-line detail)."""
+        rows = self.rows
+        cells = self.cells
+        outcome_of_code = self.outcome_of_code
+        multiplier = self.outcome_multiplier
+        line_rows = self.line_rows
+        lines = self.line_count
+        totals = []
+        for stops in stops_list:
+            total = 0.0
+            for rows_of_line in line_rows:
+                code = 0
+                for reel, row in enumerate(rows_of_line):
+                    code += cells[reel][stops[reel] * rows + row]
+                total += multiplier[outcome_of_code[code]]
+            totals.append(total / lines)
+        return totals
+
+    def spin_many(self, count, rng=random):
+        """Spins `count` times in one batch. Returns (list of stops, list of total multipliers)."""
+        lengths = [len(strip) for strip in self.strips]
+        stops_list = [[rng.randrange(length) for length in lengths] for _ in range(count)]
+        return stops_list, self.evaluate_many(stops_list)
+
+    def stats(self):
+        """
+        Returns the SlotStats of one spin across every payline, per unit of the
+        whole bet. A single line is analyzed exactly with slots_math; several
+        lines are enumerated over every stop combination, or sampled when there
+        are more than MAX_EXACT_SPINS of them.
+        """
+        if self._stats is None:
+            if self.line_count == 1:
+                self._stats = analyze({"reels": self.strips, "paytable": self.paytable})
+            else:
+                self._stats = SlotStats(self._spin_distribution())
+        return self._stats
+
+    def _spin_distribution(self):
+        """Returns {total multiplier: probability} of a spin over every payline."""
+        lengths = [len(strip) for strip in self.strips]
+        cells = [np.asarray(reel_cells, dtype=np.int64) for reel_cells in self.cells]
+        outcome_of_code = np.asarray(self.outcome_of_code, dtype=np.int64)
+        multiplier = np.asarray(self.outcome_multiplier, dtype=np.float64)
+        if math.prod(lengths) <= MAX_EXACT_SPINS:
+            # Every stop combination once: stops of reel r vary along axis r
+            stops = [np.arange(length).reshape([-1 if r == reel else 1 for r in range(self.reel_count)])
+                     for reel, length in enumerate(lengths)]
+        else:
+            rng = np.random.default_rng(0)
+            stops = [rng.integers(0, length, STATS_SAMPLE_SPINS) for length in lengths]
+        total = 0.0
+        for line_rows in self.line_rows:
+            code = 0
+            for reel, row in enumerate(line_rows):
+                code = code + cells[reel][stops[reel] * self.rows + row]
+            total = total + multiplier[outcome_of_code[code]]
+        totals = np.round(np.ravel(total) / self.line_count, 12)
+        values, counts = np.unique(totals, return_counts=True)
+        return {float(value): count / totals.size for value, count in zip(values, counts)}
+
+    def line_symbols(self, stops, line=0):
+        """Returns the symbols under a payline for the given stops."""
+        rows = self.line_rows[line]
+        return [strip[(stop + row) % len(strip)] for strip, stop, row in zip(self.strips, stops, rows)]
+
+
+def load_engine(path=SLOTS_MACHINE_PATH):
+    """
+    Loads and compiles a machine JSON file as-is (keeping strip order, rows and lines).
+    Falls back to the built-in 7s Frenzy machine if the file is missing or invalid.
+    Returns (machine, engine). The compiled result is reused until the file changes.
+    """
+    try:
+        key = (os.path.abspath(path), os.path.getmtime(path))
+    except OSError:
+        key = (None, None)
+    if key in _compiled:
+        return _compiled[key]
+    result = None
+    if key[0] is not None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                machine = json.load(f)
+            result = (machine, SlotEngine(machine))
+        except (OSError, ValueError, KeyError, TypeError, IndexError) as e:
+            print(f"Error loading slot machine {path}: {e}")
+    if result is None:
+        result = (DEFAULT_MACHINE, SlotEngine(DEFAULT_MACHINE))
+    _compiled[key] = result
+    return result
@@ -1,26 +1,41 @@
 ﻿# Import necessary modules for GUI, random operations, database, and plotting
 import sys
-import random
 import sqlite3
 import os
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QLineEdit, QMessageBox, QGridLayout
+    QApplication, QWidget, QPushButton, QLabel, QVBoxLayout, QHBoxLayout, QLineEdit, QMessageBox, QGridLayout, QCheckBox
 )
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt, QTimer
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 # Import the cheaters logging function
 from cheaters import log_cheater
+# Import the shared rolling-window cheat detector
+from cheat_detector import CheatDetector
+# Import the per-round journal writer
+from round_journal import record_rounds
+# Import the shared live net-winnings graph window
+from net_winnings_window import NetWinningsWindow
+# Import the symbol set
+from slots_math import SYMBOLS
+# Import the compiled slot engine
+from slot_engine import load_engine
 
 # Define the database path
 DB_PATH = "CasinoDB.db"
 
+# Words used in win messages for each run length
+RUN_WORDS = {2: "Two", 3: "Three", 4: "Four", 5: "Five"}
+
+# Most spins a single autoplay run may take
+MAX_AUTOPLAY_SPINS = 1000
+# A spin paying at least this many times the bet counts as a big win
+BIG_WIN_MULTIPLIER = 10.0
+
 # Define the SlotsGame class, inheriting from QWidget for GUI capabilities
 class SlotsGame(QWidget):
     # Constructor for the Slots game
-    def __init__(self, player_id, parent_menu=None):
+    def __init__(self, session, parent_menu=None):
         # Call the parent QWidget constructor
         super().__init__()
         # Set the window title
@@ -28,8 +43,10 @@ class SlotsGame(QWidget):
         # Set the window's position and size
         self.setGeometry(400, 150, 500, 650) # Adjusted geometry for better layout
 
+        # Store the player's session shared by every game
+        self.session = session
         # Store the player's ID
-        self.player_id = player_id
+        self.player_id = session.player_id
         # Store a reference to the parent menu for navigation
         self.parent_menu = parent_menu
 
@@ -38,10 +55,10 @@ class SlotsGame(QWidget):
         # Create a cursor object for executing SQL queries
         self.cur = self.conn.cursor()
 
-        # Fetch player's current balance from the database
-        self.balance = self.fetch_balance_from_db()
-        # Fetch the player's full name from the database
-        self.full_name = self.fetch_player_name()
+        # Start from the balance carried by the session
+        self.balance = session.balance
+        # Player's full name, loaded once at login
+        self.full_name = session.full_name
 
         # Game state variables
         self.current_bet = 0.0
@@ -49,14 +66,22 @@ class SlotsGame(QWidget):
         self.total_bets_session = 0.0 # Total money bet in this game launch
         self.wins_session = 0 # Total rounds won in this game launch
         self.losses_session = 0 # Total rounds lost in this game launch
-        self.session_history = [] # Stores win/loss (True/False) for cheater detection
 
-        # Get the next session number for this game launch
-        self.session_number = self.get_next_session_number()
+        # Take the next session number for this game launch from the session counters
+        self.session_number = self.session.next_session_number("Slots")
 
         # Initialize self.graph_window to None
         self.graph_window = None
 
+        # Load the machine (slots_machine.json if tuned, else 7s Frenzy) compiled to lookup tables
+        self.machine, self.engine = load_engine()
+        # RTP, hit frequency and volatility of one spin across all of this machine's paylines
+        self.machine_stats = self.engine.stats()
+        # Rolling window of win/loss results, calibrated to this machine's hit frequency
+        self.cheat_detector = CheatDetector.for_game("Slots", self.machine_stats.hit_frequency)
+        # Rounds (bet, payout, won) waiting to be journaled with the next save
+        self.pending_rounds = []
+
         # Set up the graphical user interface elements
         self.setup_ui()
         # Update the balance display on the UI
@@ -65,81 +90,9 @@ class SlotsGame(QWidget):
         # Show the Slots game window
         self.show()
 
-    # Method to fetch the player's full name from the database
-    def fetch_player_name(self):
-        try:
-            # Connect to the database (using a new connection for this specific query)
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode for better performance
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor
-                cur = conn.cursor()
-                # Execute query to get player's full name
-                cur.execute("SELECT first_name || ' ' || last_name FROM PLAYERS WHERE ID=?", (self.player_id,))
-                # Fetch the result
-                result = cur.fetchone()
-                # Return full name or player ID if not found
-                return result[0] if result else str(self.player_id)
-        # Handle any exceptions during database operation
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching player name: {e}")
-            # Return player ID as fallback
-            return str(self.player_id)
-
-    # Method to fetch the player's balance from the database
-    def fetch_balance_from_db(self):
-        try:
-            # Connect to the database
-            with sqlite3.connect(DB_PATH) as conn:
-                # Set journaling mode
-                conn.execute("PRAGMA journal_mode=WAL")
-                # Create a cursor
-                cur = conn.cursor()
-                # Execute query to get player's balance
-                cur.execute("SELECT balance FROM PLAYERS WHERE ID=?", (self.player_id,))
-                # Fetch the result
-                result = cur.fetchone()
-                # Return balance as float or default to 100.0 if not found
-                return float(result[0]) if result else 100.0
-        # Handle any exceptions
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching balance: {e}")
-            # Return default balance as fallback
-            return 100.0
-
-    # Method to get the next available session number for the player in Slots game
-    def get_next_session_number(self):
-        try:
-            # Execute query to find the maximum session number for the current player
-            self.cur.execute("""
-                SELECT MAX(session_number)
-                FROM Slots
-                WHERE player_name=?
-            """, (self.full_name,))
-            # Fetch the result
-            result = self.cur.fetchone()
-            # Return max session number + 1, or 1 if no previous sessions
-            return (result[0] or 0) + 1
-        # Handle any exceptions
-        except Exception as e:
-            # Print error for debugging
-            print(f"Error fetching next session number: {e}")
-            # Return 1 as fallback
-            return 1
-
     # Map numbers to slot machine symbols
     def get_symbol(self, number):
-        return {
-            1: "🍒", # Cherry
-            2: "🍋", # Lemon
-            3: "🍇", # Grape
-            4: "🍉", # Watermelon
-            5: "🔔", # Bell
-            6: "💎", # Diamond
-            7: "💰"  # Money Bag (Jackpot symbol)
-        }.get(number, "")
+        return SYMBOLS.get(number, str(number))
 
     # Set up the graphical user interface
     def setup_ui(self):
@@ -156,7 +109,7 @@ class SlotsGame(QWidget):
         # Slot reels display
         self.reel_labels = []
         reel_layout = QHBoxLayout()
-        for _ in range(3):
+        for _ in range(self.engine.reel_count):
             label = QLabel("❓") # Placeholder for symbols
             label.setFixedSize(120, 120)
             label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -204,6 +157,44 @@ class SlotsGame(QWidget):
         bet_layout.addWidget(self.spin_button)
         main_layout.addLayout(bet_layout)
 
+        # Autoplay: number of spins and optional stop conditions
+        autoplay_layout = QHBoxLayout()
+        self.autoplay_spins_input = QLineEdit()
+        self.autoplay_spins_input.setPlaceholderText("Spins")
+        self.loss_limit_input = QLineEdit()
+        self.loss_limit_input.setPlaceholderText("Loss limit $")
+        self.win_target_input = QLineEdit()
+        self.win_target_input.setPlaceholderText("Win target $")
+        for field in (self.autoplay_spins_input, self.loss_limit_input, self.win_target_input):
+            field.setStyleSheet("padding: 6px; border: 1px solid #ccc; border-radius: 8px; font-size: 14px;")
+            autoplay_layout.addWidget(field)
+        self.big_win_checkbox = QCheckBox(f"Stop on {BIG_WIN_MULTIPLIER:g}x win")
+        self.big_win_checkbox.setChecked(True)
+        autoplay_layout.addWidget(self.big_win_checkbox)
+
+        self.autoplay_button = QPushButton("Autoplay")
+        self.autoplay_button.setStyleSheet("""
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                padding: 8px 15px;
+                border-radius: 8px;
+                font-size: 16px;
+                font-weight: bold;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #fb8c00;
+            }
+            QPushButton:disabled {
+                background-color: #cccccc;
+                color: #666666;
+            }
+        """)
+        self.autoplay_button.clicked.connect(self.autoplay)
+        autoplay_layout.addWidget(self.autoplay_button)
+        main_layout.addLayout(autoplay_layout)
+
         # Statistics section
         stats_group_box_layout = QVBoxLayout()
         stats_group_box = QWidget()
@@ -220,6 +211,14 @@ class SlotsGame(QWidget):
         stats_group_box_layout.addWidget(self.total_won_label)
         stats_group_box_layout.addWidget(self.rtp_label)
         stats_group_box_layout.addWidget(self.house_edge_label)
+
+        # Certified (exact) figures for the paytable, for comparison with the session
+        self.theoretical_label = QLabel(
+            f"Paytable RTP: {self.machine_stats.rtp * 100:.2f}% | "
+            f"Hit Rate: {self.machine_stats.hit_frequency * 100:.2f}% | "
+            f"Std Dev: {self.machine_stats.std_dev:.2f}x"
+        )
+        stats_group_box_layout.addWidget(self.theoretical_label)
         main_layout.addWidget(stats_group_box)
 
         # Action buttons (Net Winnings, Back to Main Menu)
@@ -289,63 +288,29 @@ class SlotsGame(QWidget):
         self.total_bets_session += self.current_bet
         self.update_balance_label()
 
-        symbols_rolled = []
-        numbers_rolled = []
-        for i in range(3):
-            num = random.randint(1, 7)
-            numbers_rolled.append(num)
-            symbols_rolled.append(self.get_symbol(num))
-            self.reel_labels[i].setText(symbols_rolled[i]) # Update reel display
-
-        win_amount = 0.0
-        win_message = ""
-        won_round = False
-
-        # Check for 3-line wins
-        if numbers_rolled[0] == numbers_rolled[1] == numbers_rolled[2]:
-            match = numbers_rolled[0]
-            multiplier = {
-                1: 50.0, # 777
-                2: 30.0, # Lemon
-                3: 20.0, # Grape
-                4: 15.0, # Watermelon
-                5: 10.0, # Bell
-                6: 8.0,  # Diamond
-                7: 6.0   # Money Bag
-            }.get(match, 0.0)
-            win_amount = self.current_bet * multiplier
-            win_message = f"JACKPOT! Three {self.get_symbol(match)}s! Won ${win_amount:.2f}"
-            won_round = True
-        # Check for 2-line wins (consecutive)
-        elif (numbers_rolled[0] == numbers_rolled[1]) or \
-             (numbers_rolled[1] == numbers_rolled[2]):
-            # Determine the matching symbol for the 2-line win
-            match_num = numbers_rolled[1] if numbers_rolled[0] == numbers_rolled[1] else numbers_rolled[2]
-            multiplier = {
-                1: 2.5, # 7x
-                2: 2.2, # Lemon
-                3: 2.0, # Grape
-                4: 1.8, # Watermelon
-                5: 1.6, # Bell
-                6: 1.4, # Diamond
-                7: 1.2  # Money Bag
-            }.get(match_num, 0.0)
-            win_amount = self.current_bet * multiplier
-            win_message = f"Two {self.get_symbol(match_num)}s! Won ${win_amount:.2f}"
-            won_round = True
+        # Spin every reel and evaluate all paylines from the compiled tables
+        stops, multiplier, line_wins = self.engine.spin()
+        # Show the symbols under the first payline
+        symbols_rolled = [self.get_symbol(num) for num in self.engine.line_symbols(stops)]
+        for label, symbol in zip(self.reel_labels, symbols_rolled):
+            label.setText(symbol) # Update reel display
+
+        win_amount = self.current_bet * multiplier
+        won_round = win_amount > 0
+        if won_round:
+            win_message = self.describe_win(line_wins, win_amount)
         else:
             win_message = "No win. Try again!"
-            won_round = False
 
         self.balance += win_amount # Add winnings to balance
         self.total_winnings_session += win_amount # Accumulate total winnings for session
 
         if won_round:
             self.wins_session += 1
-            self.session_history.append(True)
         else:
             self.losses_session += 1
-            self.session_history.append(False)
+        self.cheat_detector.record(won_round)
+        self.pending_rounds.append((self.current_bet, win_amount, won_round))
 
         self.result_label.setText(f"{' | '.join(symbols_rolled)} - {win_message}")
         self.update_balance_label()
@@ -354,28 +319,140 @@ class SlotsGame(QWidget):
         self.update_statistics() # Update RTP/House Edge display
 
         # Cheater detection logic
-        if len(self.session_history) >= 20: # Check if enough games have been played
-            recent_results = self.session_history[-20:] # Get the last 20 results
-            win_rate = sum(recent_results) / 20.0 # Calculate win rate
-            if win_rate >= 0.8: # If win rate is 80% or higher
-                # Log the player as a cheater
-                log_cheater(self.player_id, "Slots", win_rate)
-                # Show a warning message to the player
-                QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last 20 games and have been flagged.")
-                # Return to the main menu
-                self.back_to_menu()
-                return # Exit the method early
+        if self.detect_cheating():
+            return # Exit the method early
 
         # Check for game over (balance <= 0)
+        self.check_game_over()
+
+    # Parse an optional positive dollar amount; returns None when left blank, False when invalid
+    def parse_optional_amount(self, field, name):
+        text = field.text().strip()
+        if not text:
+            return None
+        try:
+            amount = float(text)
+        except ValueError:
+            amount = 0.0
+        if amount <= 0:
+            QMessageBox.warning(self, "Invalid Input", f"{name} must be a positive number or left blank.")
+            return False
+        return amount
+
+    # Play many spins at once, stopping early on the loss limit, win target or a big win
+    def autoplay(self):
+        bet = self.validate_bet()
+        if bet is None:
+            return
+        try:
+            spins = int(self.autoplay_spins_input.text())
+        except ValueError:
+            spins = 0
+        if not 1 <= spins <= MAX_AUTOPLAY_SPINS:
+            QMessageBox.warning(self, "Invalid Input", f"Enter between 1 and {MAX_AUTOPLAY_SPINS} autoplay spins.")
+            return
+        loss_limit = self.parse_optional_amount(self.loss_limit_input, "Loss limit")
+        win_target = self.parse_optional_amount(self.win_target_input, "Win target")
+        if loss_limit is False or win_target is False:
+            return
+        stop_on_big_win = self.big_win_checkbox.isChecked()
+
+        # Evaluate every spin in one batch, then apply the stop conditions in order
+        stops_list, multipliers = self.engine.spin_many(spins)
+        balance = self.balance
+        net = 0.0
+        gross_won = 0.0
+        results = []
+        stop_reason = "all spins played"
+        for multiplier in multipliers:
+            if balance < bet:
+                stop_reason = "balance too low for another spin"
+                break
+            win_amount = bet * multiplier
+            balance += win_amount - bet
+            net += win_amount - bet
+            gross_won += win_amount
+            results.append(win_amount > 0)
+            self.pending_rounds.append((bet, win_amount, win_amount > 0))
+            if stop_on_big_win and multiplier >= BIG_WIN_MULTIPLIER:
+                stop_reason = "big win"
+                break
+            if loss_limit is not None and -net >= loss_limit:
+                stop_reason = "loss limit reached"
+                break
+            if win_target is not None and net >= win_target:
+                stop_reason = "win target reached"
+                break
+        played = len(results)
+        wins = sum(results)
+
+        # Apply the whole run to the session at once
+        self.current_bet = bet
+        self.balance = balance
+        self.total_bets_session += bet * played
+        self.total_winnings_session += gross_won
+        self.wins_session += wins
+        self.losses_session += played - wins
+        # Every window the run passes through is checked
+        self.cheat_detector.record_many(results)
+
+        # Show the last spin played and a summary of the run
+        last_stops = stops_list[played - 1]
+        symbols_rolled = [self.get_symbol(num) for num in self.engine.line_symbols(last_stops)]
+        for label, symbol in zip(self.reel_labels, symbols_rolled):
+            label.setText(symbol)
+        sign = "+" if net >= 0 else "-"
+        self.result_label.setText(
+            f"{' | '.join(symbols_rolled)} - Autoplay: {played} spins, {wins} wins, "
+            f"net {sign}${abs(net):.2f} ({stop_reason})"
+        )
+        self.update_balance_label()
+        self.save_user() # One transaction for the whole run
+        self.update_statistics()
+
+        # Cheater detection logic
+        if self.detect_cheating():
+            return
+        self.check_game_over()
+
+    # Flag the player if their recent win count is too unlikely for this machine. Returns True if flagged.
+    def detect_cheating(self):
+        if self.cheat_detector.flagged:
+            win_rate = self.cheat_detector.win_rate # Win rate over the detector's window
+            rounds = self.cheat_detector.rounds # Games in the window
+            # Log the player as a cheater
+            log_cheater(self.player_id, "Slots", win_rate, rounds)
+            # Show a warning message to the player
+            QMessageBox.warning(self, "Cheater Detected", f"You won {win_rate*100:.1f}% of your last {rounds} games and have been flagged.")
+            # Return to the main menu
+            self.back_to_menu()
+            return True
+        return False
+
+    # Check for game over (balance <= 0)
+    def check_game_over(self):
         if self.balance <= 0:
             QMessageBox.information(self, "Game Over", "You ran out of money! Game resetting.")
-            self.balance = self.fetch_balance_from_db() # Reload balance or set a default
+            self.balance = self.session.balance # Reload the last saved balance
             self.update_balance_label()
             self.result_label.setText("Game over. Please deposit more funds or restart.")
             self.spin_button.setEnabled(False) # Disable spin button
+            self.autoplay_button.setEnabled(False)
             self.bet_input.setEnabled(False)
 
 
+    # Build the result message for a winning spin from its best paying line
+    def describe_win(self, line_wins, win_amount):
+        _, _, run, symbol = max(line_wins, key=lambda win: win[1])
+        count = RUN_WORDS.get(run, str(run))
+        message = f"{count} {self.get_symbol(symbol)}s! Won ${win_amount:.2f}"
+        # A full line of one symbol is the jackpot
+        if run == self.engine.reel_count:
+            message = f"JACKPOT! {message}"
+        if len(line_wins) > 1:
+            message += f" ({len(line_wins)} lines)"
+        return message
+
     # Update RTP and House Edge statistics
     def update_statistics(self):
         total_spins = self.wins_session + self.losses_session
@@ -405,7 +482,7 @@ class SlotsGame(QWidget):
             self.cur.execute("UPDATE PLAYERS SET balance=? WHERE ID=?", (self.balance, self.player_id))
 
             # Check if an entry for the current session_number and player exists in Slots table
-            self.cur.execute("SELECT 1 FROM Slots WHERE player_name=? AND session_number=?", (self.full_name, self.session_number))
+            self.cur.execute("SELECT 1 FROM Slots WHERE player_id=? AND session_number=?", (self.player_id, self.session_number))
             exists = self.cur.fetchone()
 
             # If an entry exists, update it
@@ -416,21 +493,22 @@ class SlotsGame(QWidget):
                         bet_amount = ?,
                         wins = ?,
                         money_won = ?
-                    WHERE player_name = ? AND session_number = ?
+                    WHERE player_id = ? AND session_number = ?
                 """, (
                     self.wins_session + self.losses_session, # total rounds played in this session
                     self.total_bets_session,
                     self.wins_session,
                     self.total_winnings_session, # This is the accumulated gross winnings
-                    self.full_name,
+                    self.player_id,
                     self.session_number
                 ))
             # If no entry exists, insert a new one
             else:
                 self.cur.execute("""
-                    INSERT INTO Slots (player_name, number_of_bets, bet_amount, wins, money_won, session_number)
-                    VALUES (?, ?, ?, ?, ?, ?)
+                    INSERT INTO Slots (player_id, player_name, number_of_bets, bet_amount, wins, money_won, session_number)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (
+                    self.player_id,
                     self.full_name,
                     self.wins_session + self.losses_session,
                     self.total_bets_session,
@@ -438,8 +516,12 @@ class SlotsGame(QWidget):
                     self.total_winnings_session, # This is the accumulated gross winnings
                     self.session_number
                 ))
+            # Journal the rounds played since the last save in the same transaction
+            record_rounds(self.cur, "Slots", self.player_id, self.full_name, self.session_number, self.pending_rounds)
             # Commit the changes to the database
             self.conn.commit()
+            self.pending_rounds.clear()
+            self.session.balance = self.balance
         # Handle any exceptions during database save
         except Exception as e:
             # Print error for debugging
@@ -459,76 +541,16 @@ class SlotsGame(QWidget):
     # Method to plot cumulative net winnings over sessions for Slots game
     def plot_net_winnings(self):
         try:
-            # Execute query to fetch session data for plotting
-            self.cur.execute("""
-                SELECT session_number, money_won, bet_amount FROM Slots
-                WHERE player_name=? ORDER BY session_number
-            """, (self.full_name,))
-            # Fetch all results
-            rows = self.cur.fetchall()
+            # Create the shared graph window (gross won - total bet per session) and store it as an
+            # instance variable; it follows new sessions live while it is open
+            self.graph_window = NetWinningsWindow(
+                "Net Winnings - Slots", "Cumulative Net Winnings - Slots",
+                self.player_id, [("Slots", "money_won - bet_amount")], color='purple')
 
             # If no data is found, show an information message
-            if not rows:
+            if not self.graph_window.has_data():
                 QMessageBox.information(self, "No Data", "No winnings history available for this player.")
                 return
-
-            # Initialize lists for cumulative net winnings and session numbers
-            cumulative_net_winnings = []
-            session_numbers = []
-            current_total_net = 0.0 # Overall total net winnings for plotting
-
-            # Iterate through fetched rows
-            for session_num, money_won, bet_amount in rows:
-                # Ensure session number is not None
-                if session_num is not None:
-                    # Calculate net winnings for this session (gross won - total bet for that session)
-                    net_for_session = money_won - bet_amount
-                    current_total_net += net_for_session # Add to overall cumulative total
-                    cumulative_net_winnings.append(current_total_net) # Add to cumulative list
-                    session_numbers.append(int(session_num)) # Add session number
-
-            # Create a new QWidget for the graph window and store it as an instance variable
-            # This prevents the window from being garbage collected and closing immediately
-            self.graph_window = QWidget()
-            # Set window title
-            self.graph_window.setWindowTitle("Net Winnings - Slots")
-            # Set window geometry
-            self.graph_window.setGeometry(150, 150, 600, 400)
-
-            # Create vertical layout for the graph window
-            layout = QVBoxLayout()
-            self.graph_window.setLayout(layout)
-
-            # Create a Matplotlib figure
-            fig = Figure(figsize=(5, 4))
-            # Create a FigureCanvas to embed the figure
-            canvas = FigureCanvas(fig)
-            # Add a subplot to the figure
-            ax = fig.add_subplot(111)
-            # Plot the cumulative net winnings
-            ax.plot(session_numbers, cumulative_net_winnings, marker='o', color='purple')
-            # Set chart title
-            ax.set_title("Cumulative Net Winnings - Slots")
-            # Set x-axis label
-            ax.set_xlabel("Session Number")
-            # Set y-axis label
-            ax.set_ylabel("Net Winnings ($)")
-            # Enable grid
-            ax.grid(True)
-            # Set x-axis ticks
-            ax.set_xticks(session_numbers)
-
-            # Create label for total net winnings (final value)
-            total_label = QLabel(f"Total Net Winnings: ${current_total_net:.2f}")
-            # Center-align the label
-            total_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-            # Add canvas and label to layout
-            layout.addWidget(canvas)
-            layout.addWidget(total_label)
-
-            # Ensure widget is deleted on close
-            self.graph_window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
             # Show the graph window
             self.graph_window.show()
         # Handle any exceptions during plotting
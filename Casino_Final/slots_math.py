@@ -0,0 +1,204 @@
+# slots_math.py
+
+"""
+Exact return-to-player math for slot machine reel and paytable definitions.
+
+A machine is a plain dict (so it can be saved as JSON):
+
+    {
+        "reels": [ {symbol: weight, ...}, ... ],   # one weight map (or strip list) per reel
+        "paytable": { run_length: {symbol: multiplier, ...}, ... }
+    }
+
+A spin pays on its longest run of identical adjacent symbols (the leftmost one
+on ties), using the multiplier for that run length and symbol. Multipliers are
+gross: a bet of 1 returns `multiplier` in total. With three reels this is the
+original 7s Frenzy rule: three of a kind, otherwise two adjacent matching reels.
+
+Instead of simulating spins, analyze() walks the reels one at a time over the
+states (last symbol, current run length, best run so far), which gives the exact
+payout distribution for weighted reels of any length and any number of symbols.
+"""
+
+import json
+import math
+from fractions import Fraction
+
+# Slot machine symbols by number
+SYMBOLS = {
+    1: "🍒", # Cherry
+    2: "🍋", # Lemon
+    3: "🍇", # Grape
+    4: "🍉", # Watermelon
+    5: "🔔", # Bell
+    6: "💎", # Diamond
+    7: "💰"  # Money Bag (Jackpot symbol)
+}
+
+# Multipliers for three matching symbols
+THREE_OF_A_KIND = {
+    1: 50.0, # 777
+    2: 30.0, # Lemon
+    3: 20.0, # Grape
+    4: 15.0, # Watermelon
+    5: 10.0, # Bell
+    6: 8.0,  # Diamond
+    7: 6.0   # Money Bag
+}
+
+# Multipliers for two matching adjacent symbols
+TWO_ADJACENT = {
+    1: 2.5, # 7x
+    2: 2.2, # Lemon
+    3: 2.0, # Grape
+    4: 1.8, # Watermelon
+    5: 1.6, # Bell
+    6: 1.4, # Diamond
+    7: 1.2  # Money Bag
+}
+
+# The 7s Frenzy machine: three reels, every symbol equally likely
+DEFAULT_MACHINE = {
+    "reels": [{symbol: 1 for symbol in SYMBOLS} for _ in range(3)],
+    "paytable": {3: THREE_OF_A_KIND, 2: TWO_ADJACENT}
+}
+
+
+def reel_weights(reel):
+    """
+    Returns a reel as {symbol: weight}. A reel may be given as a weight map or
+    as a strip (a list of symbols, where repeats add weight).
+    """
+    if isinstance(reel, dict):
+        return {int(symbol): weight for symbol, weight in reel.items() if weight > 0}
+    weights = {}
+    for symbol in reel:
+        weights[int(symbol)] = weights.get(int(symbol), 0) + 1
+    return weights
+
+
+def normalize_machine(machine):
+    """Returns a copy of a machine with integer symbols and run lengths (JSON keys are strings)."""
+    return {
+        "reels": [reel_weights(reel) for reel in machine["reels"]],
+        "paytable": {
+            int(run): {int(symbol): float(mult) for symbol, mult in pays.items()}
+            for run, pays in machine["paytable"].items()
+        }
+    }
+
+
+def line_pay(symbols, paytable):
+    """
+    Returns (multiplier, run_length, symbol) for one line of symbols.
+    The longest run of identical adjacent symbols pays; the leftmost wins ties.
+    """
+    best_run, best_symbol = 1, symbols[0]
+    run = 1
+    for previous, symbol in zip(symbols, symbols[1:]):
+        run = run + 1 if symbol == previous else 1
+        if run > best_run:
+            best_run, best_symbol = run, symbol
+    return paytable.get(best_run, {}).get(best_symbol, 0.0), best_run, best_symbol
+
+
+class SlotStats:
+    """Exact statistics of a machine for a bet of 1."""
+    def __init__(self, distribution):
+        # Payout multiplier -> probability
+        self.distribution = dict(sorted(distribution.items()))
+        # Expected return per unit bet
+        self.rtp = sum(mult * p for mult, p in self.distribution.items())
+        # Probability that a spin pays anything
+        self.hit_frequency = sum(p for mult, p in self.distribution.items() if mult > 0)
+        # Variance and standard deviation of the return of one spin
+        self.variance = sum(mult * mult * p for mult, p in self.distribution.items()) - self.rtp ** 2
+        self.std_dev = math.sqrt(max(self.variance, 0.0))
+        # House edge per unit bet
+        self.house_edge = 1.0 - self.rtp
+
+    def as_dict(self):
+        """Returns the statistics as plain floats (e.g. for JSON output)."""
+        return {
+            "rtp": self.rtp,
+            "house_edge": self.house_edge,
+            "hit_frequency": self.hit_frequency,
+            "variance": self.variance,
+            "std_dev": self.std_dev,
+            "distribution": {str(mult): p for mult, p in self.distribution.items()}
+        }
+
+
+def analyze(machine, exact=False):
+    """
+    Computes the exact payout distribution of a machine.
+
+    Args:
+        machine (dict): Reel and paytable definition (see module docstring).
+        exact (bool): Use exact fractions while combining reels. This needs
+            integer reel weights and is slower; floats are exact to rounding.
+    Returns:
+        SlotStats: RTP, hit frequency, variance and payout distribution.
+    """
+    machine = normalize_machine(machine)
+    reels = machine["reels"]
+    paytable = machine["paytable"]
+
+    # Per-reel symbol probabilities
+    reel_probs = []
+    for reel in reels:
+        total = sum(reel.values())
+        if exact:
+            reel_probs.append([(symbol, Fraction(weight, total)) for symbol, weight in reel.items()])
+        else:
+            reel_probs.append([(symbol, weight / total) for symbol, weight in reel.items()])
+
+    # State after the first reel: (last symbol, run length, best run, best symbol)
+    states = {}
+    for symbol, p in reel_probs[0]:
+        states[(symbol, 1, 1, symbol)] = p
+
+    # Add one reel at a time
+    for probs in reel_probs[1:]:
+        next_states = {}
+        for (last, run, best_run, best_symbol), p_state in states.items():
+            for symbol, p in probs:
+                new_run = run + 1 if symbol == last else 1
+                if new_run > best_run:
+                    key = (symbol, new_run, new_run, symbol)
+                else:
+                    key = (symbol, new_run, best_run, best_symbol)
+                next_states[key] = next_states.get(key, 0) + p_state * p
+        states = next_states
+
+    # Collapse the final states into a payout distribution
+    distribution = {}
+    for (_, _, best_run, best_symbol), p in states.items():
+        mult = paytable.get(best_run, {}).get(best_symbol, 0.0)
+        distribution[mult] = distribution.get(mult, 0) + p
+    return SlotStats({mult: float(p) for mult, p in distribution.items()})
+
+
+def load_machine(path):
+    """Loads a machine definition from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        return normalize_machine(json.load(f))
+
+
+def save_machine(machine, path):
+    """Saves a machine definition as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(normalize_machine(machine), f, indent=2)
+
+
+if __name__ == "__main__":
+    import sys
+    # Analyze a machine file, or the built-in 7s Frenzy machine
+    target = load_machine(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MACHINE
+    stats = analyze(target, exact=True)
+    print(f"RTP:           {stats.rtp * 100:.4f}%")
+    print(f"House edge:    {stats.house_edge * 100:.4f}%")
+    print(f"Hit frequency: {stats.hit_frequency * 100:.4f}%")
+    print(f"Std deviation: {stats.std_dev:.4f}")
+    for mult, p in stats.distribution.items():
+        print(f"  pays {mult:>6.2f}x with probability {p:.6f}")
@@ -0,0 +1,171 @@
+# slots_tuner.py
+
+"""
+Searches per-reel symbol weights (and optionally multipliers) for a slot
+machine that hits a target RTP and volatility band.
+
+Every candidate is scored with the exact calculator in slots_math, so there is
+no simulation noise. Independent searches (random restarts) run in parallel in
+a process pool and the best machine found is saved as JSON, ready to be loaded
+with slots_math.load_machine().
+
+Example:
+    python slots_tuner.py --rtp 0.95 --std-min 3 --std-max 5 --out machine.json
+"""
+
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from slots_math import DEFAULT_MACHINE, analyze, load_machine, normalize_machine, save_machine
+
+# Bounds for a single symbol's weight on a reel
+MIN_WEIGHT = 1
+MAX_WEIGHT = 40
+# Reels with coarser weights than this are scaled up before the search
+START_RESOLUTION = 10
+# Largest random change applied to each starting weight
+START_JITTER = 5
+# Multipliers are kept on a 0.1 grid and never drop below this
+MIN_MULTIPLIER = 1.1
+
+
+def score(stats, target):
+    """
+    Returns how far a machine is from the target (0 means inside every band).
+    RTP misses are measured in units of the RTP tolerance, volatility misses in
+    units of the band width, so both count on the same scale.
+    """
+    rtp_miss = max(abs(stats.rtp - target["rtp"]) - target["rtp_tol"], 0.0) / target["rtp_tol"]
+    band = max(target["std_max"] - target["std_min"], 1e-9)
+    if stats.std_dev < target["std_min"]:
+        std_miss = (target["std_min"] - stats.std_dev) / band
+    elif stats.std_dev > target["std_max"]:
+        std_miss = (stats.std_dev - target["std_max"]) / band
+    else:
+        std_miss = 0.0
+    return rtp_miss ** 2 + std_miss ** 2
+
+
+def mutate(machine, rng, tune_multipliers):
+    """Returns a copy of the machine with one weight (or multiplier) nudged."""
+    candidate = {
+        "reels": [dict(reel) for reel in machine["reels"]],
+        "paytable": {run: dict(pays) for run, pays in machine["paytable"].items()}
+    }
+    if tune_multipliers and rng.random() < 0.25:
+        run = rng.choice(list(candidate["paytable"]))
+        symbol = rng.choice(list(candidate["paytable"][run]))
+        mult = candidate["paytable"][run][symbol] * rng.choice((0.9, 0.95, 1.05, 1.1))
+        candidate["paytable"][run][symbol] = max(MIN_MULTIPLIER, round(mult, 1))
+    else:
+        reel = rng.choice(candidate["reels"])
+        symbol = rng.choice(list(reel))
+        # Weights above MAX_WEIGHT in a loaded machine may shrink but never grow
+        upper = max(MAX_WEIGHT, reel[symbol])
+        reel[symbol] = min(upper, max(MIN_WEIGHT, reel[symbol] + rng.choice((-3, -2, -1, 1, 2, 3))))
+    return candidate
+
+
+def start_weights(reel, rng, jitter):
+    """
+    Returns a reel's starting integer weights. Integer weights are kept as
+    given; coarse or fractional reels (like 7s Frenzy's all-ones reels) are
+    scaled up by a whole factor so the search has room to move them. Each
+    weight is then nudged by up to `jitter`.
+    """
+    factor = 1
+    if any(weight != int(weight) for weight in reel.values()) or max(reel.values()) < START_RESOLUTION:
+        factor = math.ceil(START_RESOLUTION / max(reel.values()))
+    weights = {}
+    for symbol, weight in reel.items():
+        scaled = max(MIN_WEIGHT, round(weight * factor))
+        nudged = scaled + rng.randint(-jitter, jitter) if jitter else scaled
+        weights[symbol] = min(max(MAX_WEIGHT, scaled), max(MIN_WEIGHT, nudged))
+    return weights
+
+
+def search(job):
+    """
+    One simulated-annealing run from the base machine's weights, jittered
+    unless `jitter` is 0. Returns (score, machine, stats dict). Runs inside a
+    worker process.
+    """
+    base, target, seed, iterations, tune_multipliers, jitter = job
+    rng = random.Random(seed)
+
+    current = {
+        "reels": [start_weights(reel, rng, jitter) for reel in base["reels"]],
+        "paytable": base["paytable"]
+    }
+    current_score = score(analyze(current), target)
+    best, best_score = current, current_score
+
+    for step in range(iterations):
+        # Temperature falls linearly so the search settles by the end
+        temperature = max(1e-3, 1.0 - step / iterations)
+        candidate = mutate(current, rng, tune_multipliers)
+        candidate_score = score(analyze(candidate), target)
+        if candidate_score <= current_score or rng.random() < math.exp((current_score - candidate_score) / temperature):
+            current, current_score = candidate, candidate_score
+            if current_score < best_score:
+                best, best_score = current, current_score
+                if best_score == 0.0:
+                    break
+    return best_score, best, analyze(best).as_dict()
+
+
+def tune(base, target, restarts=16, iterations=3000, tune_multipliers=False, workers=None, seed=0):
+    """
+    Runs `restarts` independent searches across a process pool. The first one
+    starts from the base weights unchanged, so a machine that is already on
+    target is kept. Returns (score, machine, stats dict) of the best machine found.
+    """
+    base = normalize_machine(base)
+    jobs = [(base, target, seed + i, iterations, tune_multipliers, START_JITTER if i else 0)
+            for i in range(restarts)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(search, jobs))
+    return min(results, key=lambda result: result[0])
+
+
+def positive_float(text):
+    """argparse type for a tolerance that must be above zero."""
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune slot reel weights to a target RTP and volatility.")
+    parser.add_argument("--machine", help="JSON machine to start from (default: 7s Frenzy)")
+    parser.add_argument("--rtp", type=float, required=True, help="Target RTP, e.g. 0.95")
+    parser.add_argument("--rtp-tol", type=positive_float, default=0.002, help="Allowed RTP error (default 0.002)")
+    parser.add_argument("--std-min", type=float, required=True, help="Lowest acceptable standard deviation per spin")
+    parser.add_argument("--std-max", type=float, required=True, help="Highest acceptable standard deviation per spin")
+    parser.add_argument("--tune-multipliers", action="store_true", help="Also adjust paytable multipliers")
+    parser.add_argument("--restarts", type=int, default=16, help="Independent searches to run (default 16)")
+    parser.add_argument("--iterations", type=int, default=3000, help="Steps per search (default 3000)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first search")
+    parser.add_argument("--out", default="slots_machine.json", help="Where to write the tuned machine")
+    args = parser.parse_args()
+    if args.std_max < args.std_min:
+        parser.error("--std-max must not be below --std-min")
+
+    base = load_machine(args.machine) if args.machine else DEFAULT_MACHINE
+    target = {"rtp": args.rtp, "rtp_tol": args.rtp_tol, "std_min": args.std_min, "std_max": args.std_max}
+    best_score, machine, stats = tune(base, target, args.restarts, args.iterations,
+                                      args.tune_multipliers, args.workers, args.seed)
+
+    save_machine(machine, args.out)
+    status = "on target" if best_score == 0.0 else f"closest found (score {best_score:.4f})"
+    print(f"Wrote {args.out}: {status}")
+    print(f"  RTP {stats['rtp'] * 100:.3f}% | hit rate {stats['hit_frequency'] * 100:.2f}% | std dev {stats['std_dev']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# startup_benchmark.py
+
+"""
+Startup benchmark for the casino app.
+
+Measures, in fresh interpreters, how long it takes from process start until the
+login window has been shown and the event loop has run once, for:
+
+    lazy   the app as shipped (game modules load when their button is clicked)
+    eager  the same, but importing every game module first, as the app used to
+
+It also runs `python -X importtime` on Casino_With_Admin and lists the slowest
+imports, which shows what is still loaded before the login window.
+
+Example:
+    python startup_benchmark.py --runs 5 --offscreen
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Folder holding the app's modules
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# Game modules the app used to import before showing the login window
+GAME_MODULES = ("roulette", "craps", "blackjack", "highlow", "slots", "poker")
+
+# Child program: optionally import the games, show the login window, time it
+_FIRST_WINDOW = """
+import time
+start = time.perf_counter()
+import sys
+sys.path.insert(0, {app_dir!r})
+for module in {preload!r}:
+    __import__(module)
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
+import Casino_With_Admin
+from login_menu import LoginMenu
+app = QApplication(sys.argv)
+login = LoginMenu()
+login.show()
+def shown():
+    print(time.perf_counter() - start)
+    app.quit()
+QTimer.singleShot(0, shown)
+app.exec()
+"""
+
+
+def time_first_window(eager, env):
+    """Returns (seconds to first window inside the process, wall seconds including interpreter start)."""
+    code = _FIRST_WINDOW.format(app_dir=APP_DIR, preload=GAME_MODULES if eager else ())
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - started
+    return float(result.stdout.strip().splitlines()[-1]), wall
+
+
+def import_times(env):
+    """Returns [(cumulative microseconds, module)] from -X importtime for Casino_With_Admin."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import Casino_With_Admin"],
+                            cwd=APP_DIR, env=env, capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        # Lines look like "import time:       123 |       4567 | package.module"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times.append((int(cumulative), module.strip()))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the time until the casino login window appears.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per mode")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list")
+    parser.add_argument("--offscreen", action="store_true", help="Use Qt's offscreen platform (no display needed)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    results = {}
+    for mode in ("eager", "lazy"):
+        runs = [time_first_window(mode == "eager", env) for _ in range(args.runs)]
+        results[mode] = (statistics.median(run[0] for run in runs), statistics.median(run[1] for run in runs))
+        print(f"{mode:>5}: first window after {results[mode][0] * 1000:7.1f} ms "
+              f"({results[mode][1] * 1000:7.1f} ms including interpreter start), median of {args.runs}")
+    saved = results["eager"][0] - results["lazy"][0]
+    print(f"Lazy loading saves {saved * 1000:.1f} ms ({saved / results['eager'][0] * 100:.0f}%)")
+
+    times = import_times(env)
+    top_level = [entry for entry in times if entry[1] == "Casino_With_Admin"]
+    if top_level:
+        print(f"\nimport Casino_With_Admin: {top_level[0][0] / 1000:.1f} ms, {len(times)} modules")
+    print("Slowest imports (cumulative):")
+    for cumulative, module in sorted(times, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+# conftest.py
+
+"""
+Shared test setup. The game modules import each other by bare name (they are
+run from Casino_Final), so that directory is put on the import path here.
+"""
+
+import os
+import sys
+
+# The Casino_Final directory, which holds the modules under test and CasinoDB.db
+CASINO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CASINO_DIR not in sys.path:
+    sys.path.insert(0, CASINO_DIR)
@@ -0,0 +1,60 @@
+# test_account_allocator.py
+
+"""Tests for the keyed ID and password allocation."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from account_allocator import KeyedPermutation, allocate, create_account, create_accounts
+from migrations import run_migrations
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 10, 1000, 4097, 65536])
+def test_permutation_is_a_bijection(size):
+    permutation = KeyedPermutation(bytes(range(16)), size)
+    values = permutation.apply(np.arange(size, dtype=np.uint64))
+    assert sorted(values.tolist()) == list(range(size))
+
+
+def test_keys_give_different_orders():
+    first = KeyedPermutation(b"a" * 16, 100000).apply(np.arange(1000, dtype=np.uint64))
+    second = KeyedPermutation(b"b" * 16, 100000).apply(np.arange(1000, dtype=np.uint64))
+    assert first.tolist() != second.tolist()
+    assert len(set(first.tolist())) == 1000
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = str(tmp_path / "accounts.db")
+    run_migrations(path)
+    connection = sqlite3.connect(path)
+    yield connection
+    connection.close()
+
+
+def test_allocations_never_repeat(conn):
+    values = []
+    for count in (1, 7, 500, 3000):
+        values += allocate(conn, "player_id", count)
+    assert len(set(values)) == len(values) == 3508
+    assert all(10_000_000 <= value < 100_000_000 for value in values)
+
+
+def test_exhausted_sequence_raises(conn):
+    conn.execute("UPDATE ACCOUNT_SEQUENCES SET size = 10 WHERE name = 'password'")
+    assert len(allocate(conn, "password", 10)) == 10
+    with pytest.raises(ValueError):
+        allocate(conn, "password", 1)
+
+
+def test_create_accounts(conn):
+    accounts = create_accounts(conn, [("Ann", "Lee"), ("Bo", "Kim", 25.0)], balance=10.0)
+    player_id, password = create_account(conn, "Cy", "Day")
+    rows = conn.execute("""
+        SELECT p.first_name, p.balance, p.total_deposit, l.Password
+        FROM PLAYERS p JOIN Login l ON l.ID = p.ID
+        WHERE p.ID IN (?, ?, ?) ORDER BY p.first_name
+    """, (accounts[0][0], accounts[1][0], player_id)).fetchall()
+    assert rows == [("Ann", 10.0, 10, accounts[0][1]), ("Bo", 25.0, 25, accounts[1][1]), ("Cy", 0.0, 0, password)]
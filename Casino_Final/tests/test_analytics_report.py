@@ -0,0 +1,74 @@
+# test_analytics_report.py
+
+"""Tests the streamed hold / RTP report on a hand-built journal."""
+
+import sqlite3
+import statistics
+
+import pytest
+
+from analytics_report import stream_report
+
+# (game, player_id, player_name, session_number, bet, payout, won), in journal order.
+# Players 1 and 2 play High/Low at the same time; player 1 opens a second session
+# while player 2's first one is still going. won IS NULL rows are pot cash-outs.
+ROUNDS = [
+    ("HighLow", 1, "Ann", 1, 10.0, 0.0, 1),
+    ("HighLow", 2, "Bob", 1, 5.0, 0.0, 1),
+    ("HighLow", 1, "Ann", 1, 10.0, 0.0, 1),
+    ("HighLow", 1, "Ann", 1, 0.0, 23.0, None),
+    ("HighLow", 2, "Bob", 1, 5.0, 0.0, 0),
+    ("HighLow", 1, "Ann", 2, 20.0, 0.0, 0),
+    ("HighLow", 2, "Bob", 1, 5.0, 0.0, 1),
+    ("Slots", 1, "Ann", 1, 2.0, 5.0, 1),
+    ("HighLow", 2, "Bob", 1, 0.0, 6.5, None),
+    ("Slots", 1, "Ann", 1, 2.0, 0.0, 0),
+]
+
+
+@pytest.fixture
+def journal(tmp_path):
+    path = str(tmp_path / "rounds.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE ROUNDS (
+                id INTEGER PRIMARY KEY, played_at TEXT, game TEXT NOT NULL, player_id INTEGER,
+                player_name TEXT, session_number INTEGER, bet REAL NOT NULL, payout REAL NOT NULL, won INTEGER
+            )
+        """)
+        conn.executemany("""
+            INSERT INTO ROUNDS (game, player_id, player_name, session_number, bet, payout, won)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, ROUNDS)
+    return path
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 10000])
+def test_stream_report(journal, chunk):
+    games, players, names = stream_report(journal, chunk=chunk)
+    assert names == {1: "Ann", 2: "Bob"}
+
+    highlow = games["HighLow"].row()
+    # Cash-outs add to the payouts but are not rounds
+    assert highlow["rounds"] == 6
+    assert highlow["handle"] == 55.0
+    assert highlow["payouts"] == 29.5
+    assert highlow["hold_pct"] == pytest.approx(25.5 / 55 * 100, abs=1e-3)
+    assert highlow["rtp_pct"] == pytest.approx(29.5 / 55 * 100, abs=1e-3)
+    assert highlow["round_net_std"] == pytest.approx(statistics.stdev([-10, -5, -10, -5, -20, -5]), abs=1e-4)
+
+    # Interleaved players keep their own sessions: Ann 1 (2 rounds, +3), Bob 1 (3 rounds, -8.5), Ann 2 (1 round, -20)
+    assert highlow["sessions"] == 3
+    assert highlow["session_rounds_mean"] == pytest.approx(2.0)
+    assert highlow["session_net_std"] == pytest.approx(statistics.stdev([3.0, -8.5, -20.0]), abs=0.01)
+
+    ann = players[("HighLow", 1)].row()
+    assert (ann["rounds"], ann["sessions"], ann["handle"], ann["payouts"]) == (3, 2, 40.0, 23.0)
+    bob = players[("HighLow", 2)].row()
+    assert (bob["rounds"], bob["sessions"], bob["handle"], bob["payouts"]) == (3, 1, 15.0, 6.5)
+    assert bob["sessions_2-5"] == 1
+
+    slots = games["Slots"].row()
+    assert (slots["rounds"], slots["handle"], slots["payouts"], slots["sessions"]) == (2, 4.0, 5.0, 1)
+    assert slots["hold_pct"] == pytest.approx(-25.0)
+    assert slots["rtp_pct"] == pytest.approx(125.0)
@@ -0,0 +1,88 @@
+# test_anomaly_tracker.py
+
+"""Tests for the rolling statistics behind the live anomaly panel."""
+
+import sqlite3
+
+import pytest
+
+import anomaly_tracker
+from anomaly_tracker import AnomalyTracker
+from cheat_detector import GAME_WIN_PROBABILITY
+from migrations import run_migrations
+from round_journal import record_rounds
+
+GAME = "Slots"
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = str(tmp_path / "journal.db")
+    run_migrations(path)
+    connection = sqlite3.connect(path)
+    yield connection
+    connection.close()
+
+
+def journal(conn, player_id, session_number, results):
+    record_rounds(conn.cursor(), GAME, player_id, f"Player {player_id}", session_number,
+                  [(1.0, 2.0 if won else 0.0, won) for won in results])
+    conn.commit()
+
+
+def test_poll_reads_only_new_rounds(conn):
+    tracker = AnomalyTracker()
+    journal(conn, 1, 1, [True, False, False])
+    assert tracker.poll(conn) == 3
+    assert tracker.poll(conn) == 0
+    journal(conn, 1, 1, [False])
+    assert tracker.poll(conn) == 1
+    assert tracker.rounds_tracked() == 4
+    assert tracker.game_stats[GAME].wins.mean == pytest.approx(0.25)
+
+
+def test_lucky_session_is_flagged_and_others_are_not(conn):
+    tracker = AnomalyTracker(z_threshold=3.0, min_rounds=20)
+    journal(conn, 1, 1, [True] * 40)
+    journal(conn, 2, 1, [False] * 40)
+    tracker.poll(conn)
+    games, flagged_changed = tracker.take_changes()
+    assert games == {GAME} and flagged_changed
+    flagged = {(row[2], row[3]): row[0] for row in tracker.flagged_sessions()}
+    assert (1, 1) in flagged and flagged[(1, 1)] > 3.0
+    # Nothing new was journaled, so nothing needs redrawing
+    assert tracker.take_changes() == (set(), False)
+    # A session below the minimum round count is never judged
+    assert tracker.set_thresholds(3.0, 50)
+    assert tracker.flagged_sessions() == []
+
+
+def test_old_rounds_leave_the_window(conn, monkeypatch):
+    monkeypatch.setattr(anomaly_tracker, "SESSION_WINDOW", 30)
+    tracker = AnomalyTracker(z_threshold=3.0, min_rounds=20)
+    p = GAME_WIN_PROBABILITY[GAME]
+    journal(conn, 1, 1, [True] * 30)
+    tracker.poll(conn)
+    tracker.take_changes()
+    assert tracker.flagged
+    # Honest play afterwards pushes the lucky streak out of the session's window
+    honest = int(round(p * 30))
+    journal(conn, 1, 1, [True] * honest + [False] * (30 - honest))
+    tracker.poll(conn)
+    assert tracker.take_changes()[1]
+    assert not tracker.flagged
+    assert tracker.session_stats[(GAME, 1, 1)].rounds == 60
+
+
+def test_least_recent_sessions_are_dropped(conn, monkeypatch):
+    monkeypatch.setattr(anomaly_tracker, "MAX_SESSIONS", 2)
+    tracker = AnomalyTracker(z_threshold=3.0, min_rounds=20)
+    journal(conn, 1, 1, [True] * 40)
+    tracker.poll(conn)
+    tracker.take_changes()
+    journal(conn, 2, 1, [False])
+    journal(conn, 3, 1, [False])
+    tracker.poll(conn)
+    assert list(tracker.session_stats) == [(GAME, 2, 1), (GAME, 3, 1)]
+    assert tracker.take_changes()[1]
+    assert tracker.flagged_sessions() == []
@@ -0,0 +1,81 @@
+# test_casino_totals.py
+
+"""Tests that the incremental casino totals always match a full recompute."""
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from conftest import CASINO_DIR
+from casino_totals import merge_new_rounds, recompute_casino_totals
+from migrations import _incremental_casino_totals, run_migrations
+from round_journal import record_rounds
+
+# (game, player ID, session number, [(bet, payout, won)]) batches, committed one at a time
+BATCHES = [
+    ("Craps", 1001, 1, [(10.0, 20.0, True), (5.0, 0.0, False), (2.5, 2.5, False)]),
+    ("Slots", 1002, 4, [(1.0, 0.0, False)] * 7 + [(1.0, 12.5, True)]),
+    ("HighLow", 1001, 2, [(20.0, 0.0, False), (0.0, 37.5, None)]),
+    ("Roulette", None, 9, [(50.0, 100.0, True), (25.0, 0.0, False)]),
+]
+
+
+@pytest.fixture
+def db_copy(tmp_path):
+    path = tmp_path / "CasinoDB.db"
+    shutil.copyfile(os.path.join(CASINO_DIR, "CasinoDB.db"), path)
+    run_migrations(str(path))
+    return str(path)
+
+
+def journal(path, batch):
+    game, player_id, session_number, rounds = batch
+    with sqlite3.connect(path) as conn:
+        record_rounds(conn.cursor(), game, player_id, f"Player {player_id}", session_number, rounds)
+
+
+def expected_totals(batches):
+    rounds = [r for _, _, _, batch in batches for r in batch if r[2] is not None]
+    wins = sum(1 for r in rounds if r[2])
+    net = sum(payout - bet for _, _, _, batch in batches for bet, payout, _ in batch)
+    return len(rounds), len(rounds) - wins, wins, net
+
+
+def test_migration_keeps_the_history_before_the_journal(db_copy):
+    # The committed database predates the journal: its totals come from the game tables
+    with sqlite3.connect(os.path.join(CASINO_DIR, "CasinoDB.db")) as conn:
+        before = conn.execute("SELECT Bets, Won, Lost, net_profit, total_cash FROM CASINO WHERE id = 7589").fetchone()
+    assert before[0] > 0
+    full = recompute_casino_totals(db_copy)
+    assert full[-1] == 0
+    assert full[2:5] == before[:3]
+    assert full[6:8] == pytest.approx(before[3:5])
+
+
+def test_incremental_merges_equal_full_recompute(db_copy):
+    baseline = merge_new_rounds(db_copy)
+    for batch in BATCHES:
+        journal(db_copy, batch)
+        merged = merge_new_rounds(db_copy)
+        assert merged[-1] == sum(1 for r in batch[3] if r[2] is not None)
+    incremental = merge_new_rounds(db_copy)
+    assert incremental[-1] == 0
+    full = recompute_casino_totals(db_copy)
+    assert incremental[:8] == pytest.approx(full[:8])
+    bets, player_losses, player_wins, net = expected_totals(BATCHES)
+    assert incremental[2:5] == (baseline[2] + bets, baseline[3] + player_losses, baseline[4] + player_wins)
+    assert incremental[6] == pytest.approx(baseline[6] - net)
+
+
+def test_migration_seed_uses_the_same_definitions(db_copy):
+    for batch in BATCHES[:2]:
+        journal(db_copy, batch)
+    # Freeze the baseline again as migration 3 does, then keep merging
+    with sqlite3.connect(db_copy) as conn:
+        _incremental_casino_totals(conn)
+    for batch in BATCHES[2:]:
+        journal(db_copy, batch)
+    incremental = merge_new_rounds(db_copy)
+    assert incremental[:8] == pytest.approx(recompute_casino_totals(db_copy)[:8])
@@ -0,0 +1,67 @@
+# test_cheat_detector.py
+
+"""Tests for the rolling-window binomial cheat detector."""
+
+import random
+from fractions import Fraction
+from math import comb
+
+import pytest
+
+from cheat_detector import CheatDetector, win_thresholds
+
+
+def exact_tail(wins, rounds, p):
+    """P(X >= wins) for X ~ Binomial(rounds, p), in exact arithmetic."""
+    p = Fraction(p)
+    return sum(comb(rounds, k) * p ** k * (1 - p) ** (rounds - k) for k in range(wins, rounds + 1))
+
+
+def test_ring_buffer_keeps_only_the_last_window():
+    rng = random.Random(3)
+    results = [rng.random() < 0.3 for _ in range(500)]
+    detector = CheatDetector(0.3, window=25, min_rounds=1000)
+    for step, won in enumerate(results, 1):
+        detector.record(won)
+        window = results[max(0, step - 25):step]
+        assert detector.rounds == len(window)
+        assert detector.wins == sum(window)
+    assert not detector.flagged
+
+
+def test_min_rounds_gate():
+    detector = CheatDetector(0.1, window=50, min_rounds=20)
+    # Nineteen straight wins are wildly unlikely but too few rounds to judge
+    for _ in range(19):
+        assert not detector.record(True)
+    assert detector.record(True)
+    # The flag stays once raised
+    assert detector.record(False)
+
+
+@pytest.mark.parametrize("p", [0.27, 18 / 37, 0.71])
+def test_thresholds_match_a_direct_binomial_tail(p):
+    alpha = Fraction(1, 10000)
+    thresholds = win_thresholds(p, 50, 1e-4)
+    for rounds in range(1, 51):
+        threshold = thresholds[rounds]
+        if threshold <= rounds:
+            assert exact_tail(threshold, rounds, p) <= alpha
+        if threshold > 0:
+            assert exact_tail(threshold - 1, rounds, p) > alpha
+
+
+def test_record_many_matches_record_and_stops_at_the_flag():
+    results = [False] * 30 + [True] * 40 + [False] * 10
+    single = CheatDetector(0.3)
+    flagged_at = next(step for step, won in enumerate(results) if single.record(won))
+    many = CheatDetector(0.3)
+    assert many.record_many(iter(results))
+    # The window is left as it was when the flag was raised
+    assert many.rounds == min(flagged_at + 1, many.window)
+    assert many.wins == sum(results[max(0, flagged_at + 1 - many.window):flagged_at + 1])
+
+    quiet = [False, True] * 40
+    honest = CheatDetector(0.5)
+    assert not honest.record_many(quiet)
+    assert honest.rounds == 50 and honest.wins == 25
@@ -0,0 +1,60 @@
+# test_cheat_scan.py
+
+"""Tests the offline cheat scan on a database with one planted cheater."""
+
+import os
+import random
+import shutil
+import sqlite3
+
+import pytest
+
+from conftest import CASINO_DIR
+from cheat_detector import GAME_WIN_PROBABILITY
+from cheat_scan import SCAN_PREFIX, run_scan
+from migrations import run_migrations
+
+CHEATER, HONEST = 501, 502
+
+
+@pytest.fixture
+def db_copy(tmp_path):
+    path = str(tmp_path / "CasinoDB.db")
+    shutil.copyfile(os.path.join(CASINO_DIR, "CasinoDB.db"), path)
+    run_migrations(path)
+    rng = random.Random(8)
+    p = GAME_WIN_PROBABILITY["Craps"]
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM Craps")
+        conn.execute("DELETE FROM CHEAT_LOG")
+        conn.execute("INSERT INTO CHEAT_LOG (player_id, event_type, details) VALUES (?, 'Craps', 'Live detector')", (HONEST,))
+        for player_id, win_rate in ((CHEATER, 0.8), (HONEST, p)):
+            conn.execute("INSERT INTO PLAYERS (ID, first_name, last_name, is_flagged) VALUES (?, 'Test', ?, 0)",
+                         (player_id, str(player_id)))
+            for session in range(1, 16):
+                rounds = 20
+                wins = sum(rng.random() < win_rate for _ in range(rounds))
+                conn.execute("""
+                    INSERT INTO Craps (player_id, player_name, number_of_bets, wins, session_number)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (player_id, f"Test {player_id}", rounds, wins, session))
+    return path
+
+
+def scan_rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT player_id, event_type, details FROM CHEAT_LOG ORDER BY id").fetchall()
+
+
+def test_only_the_planted_player_is_flagged_and_rescans_replace_rows(db_copy):
+    assert run_scan(db_copy, games=("Craps",), workers=1, flag_players=True) == 1
+    rows = scan_rows(db_copy)
+    findings = [row for row in rows if row[2].startswith(SCAN_PREFIX)]
+    assert [(row[0], row[1]) for row in findings] == [(CHEATER, "Craps")]
+    with sqlite3.connect(db_copy) as conn:
+        flagged = dict(conn.execute("SELECT ID, is_flagged FROM PLAYERS WHERE ID IN (?, ?)", (CHEATER, HONEST)))
+    assert flagged == {CHEATER: 1, HONEST: 0}
+
+    # A second scan replaces its own rows and leaves the live detector's alone
+    assert run_scan(db_copy, games=("Craps",), workers=1) == 1
+    assert scan_rows(db_copy) == rows
@@ -0,0 +1,53 @@
+# test_craps_bets.py
+
+"""Tests for the precomputed Craps resolution table."""
+
+from craps_bets import (
+    BET_TYPES, POINT_STATES, POINT_INDEX, RESOLUTION, NO_DECISION, WIN, LOSS, PUSH,
+    PASS_LINE, DONT_PASS, FIELD, HARD_8, _resolve, resolve_roll,
+)
+
+
+def test_table_matches_direct_resolution():
+    # Every (point, roll, bet) entry is the result of the rule it was built from
+    for state, point in enumerate(POINT_STATES):
+        for d1 in range(1, 7):
+            for d2 in range(1, 7):
+                row = RESOLUTION[state][(d1 - 1) * 6 + (d2 - 1)]
+                for bet in range(len(BET_TYPES)):
+                    assert row[bet] == _resolve(bet, point, d1, d2)
+
+
+def test_come_out_roll():
+    state, settled = resolve_roll(0, 3, 4, {PASS_LINE: 10.0, DONT_PASS: 5.0})
+    assert state == 0
+    assert [(bet, result) for bet, _, result, _, _ in settled] == [(PASS_LINE, WIN), (DONT_PASS, LOSS)]
+    _, settled = resolve_roll(0, 6, 6, {DONT_PASS: 5.0})
+    assert settled[0][2] == PUSH
+
+
+def test_line_bet_sets_and_clears_the_point():
+    state, settled = resolve_roll(0, 2, 4, {PASS_LINE: 10.0})
+    assert POINT_STATES[state] == 6
+    assert settled[0][2] == NO_DECISION
+    state, settled = resolve_roll(state, 1, 5, {PASS_LINE: 10.0})
+    assert state == 0
+    assert settled[0][2] == WIN
+    state, settled = resolve_roll(POINT_INDEX[8], 3, 4, {PASS_LINE: 10.0})
+    assert state == 0
+    assert settled[0][2] == LOSS
+
+
+def test_field_only_roll_does_not_set_a_point():
+    state, settled = resolve_roll(0, 2, 4, {FIELD: 10.0})
+    assert state == 0
+    assert settled[0][2] == LOSS
+
+
+def test_hardway_stays_up_until_decided():
+    _, settled = resolve_roll(0, 2, 3, {HARD_8: 1.0})
+    assert settled[0][2] == NO_DECISION
+    _, settled = resolve_roll(0, 4, 4, {HARD_8: 1.0})
+    assert settled[0][2:4] == (WIN, 9)
+    _, settled = resolve_roll(0, 2, 6, {HARD_8: 1.0})
+    assert settled[0][2] == LOSS
@@ -0,0 +1,51 @@
+# test_highlow_shoe.py
+
+"""Tests that the High/Low shoe's rank counts follow the cards it deals."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from highlow_shoe import RANK_COUNT, Shoe, card_rank
+
+
+def check_consistent(shoe):
+    """The counts and probabilities must match the cards still in the deal order."""
+    left = Counter(card_rank(card) for card in shoe.order)
+    assert shoe.counts == [left[rank] for rank in range(RANK_COUNT)]
+    assert sum(shoe.counts) == len(shoe)
+    for rank in range(RANK_COUNT):
+        higher, lower, tie = shoe.probabilities(rank * 4)
+        if not len(shoe):
+            assert (higher, lower, tie) == (0.0, 0.0, 0.0)
+            continue
+        assert higher == pytest.approx(sum(left[r] for r in range(rank + 1, RANK_COUNT)) / len(shoe))
+        assert lower == pytest.approx(sum(left[r] for r in range(rank)) / len(shoe))
+        assert tie == pytest.approx(left[rank] / len(shoe))
+        assert higher + lower + tie == pytest.approx(1.0)
+
+
+def test_counts_follow_every_card_dealt():
+    shoe = Shoe(num_decks=2, rng=random.Random(4))
+    assert len(shoe) == 104
+    dealt = []
+    check_consistent(shoe)
+    while len(shoe):
+        dealt.append(shoe.draw())
+        check_consistent(shoe)
+    # Every card of the shoe was dealt exactly once per deck
+    assert Counter(dealt) == Counter({card: 2 for card in range(52)})
+
+
+def test_reshuffle_restores_a_full_shoe():
+    shoe = Shoe(num_decks=4, rng=random.Random(9))
+    for _ in range(150):
+        shoe.draw()
+    shoe.shuffle()
+    assert len(shoe) == 208
+    assert shoe.counts == [16] * RANK_COUNT
+    check_consistent(shoe)
+    for _ in range(30):
+        shoe.draw()
+    check_consistent(shoe)
@@ -0,0 +1,63 @@
+# test_highlow_solver.py
+
+"""Tests the High/Low solver against brute-force enumeration and its own simulation."""
+
+import pytest
+
+from highlow_solver import HighLowSolver, pot_after, simulate
+
+# A 10-card shoe spread over six ranks
+SMALL_SHOE = (2, 0, 1, 0, 2, 0, 0, 1, 0, 2, 0, 0, 2)
+MAX_STREAK = 4
+
+
+def brute_force(streak, rank, comp, growth=1.3):
+    """Optimal (expected net, expected wagered) of a state, enumerating every next card."""
+    pot = pot_after(streak, growth)
+    if streak == MAX_STREAK:
+        return pot, 0.0
+    total = sum(comp)
+    options = []
+    for higher in (True, False):
+        net, wagered = -1.0, 1.0
+        for card, count in enumerate(comp):
+            if count and (card > rank if higher else card < rank):
+                child = comp[:card] + (count - 1,) + comp[card + 1:]
+                child_net, child_wagered = brute_force(streak + 1, card, child, growth)
+                net += count / total * child_net
+                wagered += count / total * child_wagered
+        options.append((net, wagered))
+    best = max(options, key=lambda option: option[0])
+    if streak > 0 and pot >= best[0]:
+        return pot, 0.0
+    return best
+
+
+def brute_force_streak():
+    total = sum(SMALL_SHOE)
+    net = wagered = 0.0
+    for rank, count in enumerate(SMALL_SHOE):
+        if count:
+            comp = SMALL_SHOE[:rank] + (count - 1,) + SMALL_SHOE[rank + 1:]
+            state_net, state_wagered = brute_force(0, rank, comp)
+            net += count / total * state_net
+            wagered += count / total * state_wagered
+    return net, wagered
+
+
+def test_solver_matches_brute_force():
+    # Tracking the exact composition up to the last guess makes the solver exact
+    solver = HighLowSolver(SMALL_SHOE, exact_depth=MAX_STREAK - 1, max_streak=MAX_STREAK)
+    result = solver.solve()
+    net, wagered = brute_force_streak()
+    assert result["expected_net"] == pytest.approx(net)
+    assert result["expected_wagered"] == pytest.approx(wagered)
+    assert result["house_edge"] == pytest.approx(-net / wagered)
+
+
+def test_simulation_agrees_within_its_standard_error():
+    solver = HighLowSolver(SMALL_SHOE, exact_depth=MAX_STREAK - 1, max_streak=MAX_STREAK)
+    edge = solver.solve()["house_edge"]
+    sim = simulate(solver, streaks=200_000, chunk=50_000, seed=3)
+    assert sim["std_error"] > 0
+    assert abs(sim["house_edge"] - edge) < 4 * sim["std_error"]
@@ -0,0 +1,114 @@
+# test_import_players.py
+
+"""Tests for the re-runnable bulk player import."""
+
+import csv
+import io
+import json
+import sqlite3
+import sys
+
+import pytest
+
+import import_players
+from import_players import import_players as run_import
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "import.db")
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("first_name", "last_name", "balance", "external_id"))
+        writer.writerows(rows)
+    return str(path)
+
+
+def credentials(text):
+    return [tuple(row) for row in csv.reader(io.StringIO(text))]
+
+
+def imported_accounts(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return {(key, str(player_id), str(password)) for key, player_id, password in conn.execute("""
+            SELECT i.import_key, l.ID, l.Password FROM IMPORTED_PLAYERS i JOIN Login l ON l.ID = i.player_id
+        """)}
+
+
+def test_rerun_skips_players_already_imported(tmp_path, db_path):
+    path = write_csv(tmp_path / "players.csv",
+                     [(f"First{i}", "Last", i, "") for i in range(25)] + [("", "NoFirst", "", ""), ("A", "B", "-5", "")])
+    out_path, rejects = tmp_path / "accounts.csv", io.StringIO()
+    with open(out_path, "w", newline="", encoding="utf-8") as out:
+        counts = run_import(path, db_path, chunk_size=10, out=out, rejects=rejects)
+    assert counts == {"read": 27, "rejected": 2, "skipped": 0, "created": 25}
+    assert "row 27: missing first_name" in rejects.getvalue()
+
+    again = run_import(path, db_path, chunk_size=7, rejects=io.StringIO())
+    assert again == {"read": 27, "rejected": 2, "skipped": 25, "created": 0}
+    assert set(credentials(out_path.read_text(encoding="utf-8"))) == imported_accounts(db_path)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM PLAYERS WHERE last_name = 'Last'").fetchone()[0] == 25
+        assert conn.execute("SELECT balance, total_deposit FROM PLAYERS WHERE first_name = 'First7'").fetchone() == (7.0, 7)
+
+
+def test_external_ids_are_keys_across_files(tmp_path, db_path):
+    jsonl = tmp_path / "players.jsonl"
+    jsonl.write_text("\n".join(json.dumps(record) for record in [
+        {"first_name": "Ann", "last_name": "Lee", "external_id": "crm-1"},
+        {"first_name": "Bo", "last_name": "Kim", "external_id": "crm-2"},
+        {"first_name": "Ann", "last_name": "Lee", "external_id": "crm-1"},
+    ]) + "\nnot json\n", encoding="utf-8")
+    counts = run_import(str(jsonl), db_path, rejects=io.StringIO())
+    assert counts == {"read": 4, "rejected": 1, "skipped": 1, "created": 2}
+    # The same players exported again as CSV are recognised by their external IDs
+    path = write_csv(tmp_path / "export.csv", [("Ann", "Lee", "", "crm-1"), ("Cy", "Day", "", "crm-3")])
+    assert run_import(path, db_path, rejects=io.StringIO())["created"] == 1
+
+
+def test_credentials_are_written_before_each_commit(tmp_path, db_path, monkeypatch):
+    path = write_csv(tmp_path / "players.csv", [(f"First{i}", "Last", "", "") for i in range(30)])
+    out_path = tmp_path / "accounts.csv"
+    real_import_chunk = import_players.import_chunk
+    calls = []
+
+    def crash_on_second_commit(conn, chunk, before_commit=None):
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            def write_then_crash(created):
+                before_commit(created)
+                raise RuntimeError("crash before COMMIT")
+            return real_import_chunk(conn, chunk, write_then_crash)
+        return real_import_chunk(conn, chunk, before_commit)
+
+    monkeypatch.setattr(import_players, "import_chunk", crash_on_second_commit)
+    with open(out_path, "a", newline="", encoding="utf-8") as out:
+        with pytest.raises(RuntimeError):
+            run_import(path, db_path, chunk_size=10, out=out, rejects=io.StringIO())
+    monkeypatch.setattr(import_players, "import_chunk", real_import_chunk)
+
+    # Every committed account has its credentials on disk; the rolled-back chunk's lines are extra
+    first_run = set(credentials(out_path.read_text(encoding="utf-8")))
+    committed = imported_accounts(db_path)
+    assert len(committed) == 10 and committed <= first_run and len(first_run) == 20
+
+    with open(out_path, "a", newline="", encoding="utf-8") as out:
+        counts = run_import(path, db_path, chunk_size=10, out=out, rejects=io.StringIO())
+    assert counts["created"] == 20 and counts["skipped"] == 10
+    assert imported_accounts(db_path) <= set(credentials(out_path.read_text(encoding="utf-8")))
+
+
+def test_command_line_appends_to_the_credentials_file(tmp_path, db_path, monkeypatch, capsys):
+    first = write_csv(tmp_path / "players.csv", [(f"First{i}", "Last", "", "") for i in range(5)])
+    monkeypatch.setattr(sys, "argv", ["import_players.py", first, "--db", db_path])
+    import_players.main()
+    # A second run over the same file must not truncate the first run's handout
+    import_players.main()
+    with open(tmp_path / "players_accounts.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["import_key", "player_id", "password"]
+    assert len(rows) == 6
+    assert "created 0, skipped 5" in capsys.readouterr().out
@@ -0,0 +1,78 @@
+# test_migrations.py
+
+"""Tests for the schema migrator, run against copies of CasinoDB.db."""
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+from conftest import CASINO_DIR
+from migrations import CASINO_ID, MIGRATIONS, SCHEMA_VERSION, run_migrations, schema_version
+
+
+@pytest.fixture
+def db_copy(tmp_path):
+    """A copy of the shipped database, so the real file is never touched."""
+    path = tmp_path / "CasinoDB.db"
+    shutil.copyfile(os.path.join(CASINO_DIR, "CasinoDB.db"), path)
+    return str(path)
+
+
+def snapshot(path):
+    """Returns the schema and the row count of every table."""
+    with sqlite3.connect(path) as conn:
+        schema = conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+        counts = {name: conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+                  for kind, name, _ in schema if kind == "table"}
+    return schema, counts
+
+
+def test_migrates_shipped_database_once(db_copy):
+    assert run_migrations(db_copy) == [version for version, _, _ in MIGRATIONS]
+    before = snapshot(db_copy)
+    assert run_migrations(db_copy) == []
+    assert snapshot(db_copy) == before
+    with sqlite3.connect(db_copy) as conn:
+        assert schema_version(conn) == SCHEMA_VERSION
+
+
+def test_migrates_empty_database(tmp_path):
+    path = str(tmp_path / "empty.db")
+    run_migrations(path)
+    with sqlite3.connect(path) as conn:
+        assert schema_version(conn) == SCHEMA_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM CASINO WHERE id = ?", (CASINO_ID,)).fetchone()[0] == 1
+        assert conn.execute("SELECT COUNT(*) FROM ACCOUNT_SEQUENCES").fetchone()[0] == 2
+
+
+def test_migrations_can_be_reapplied(db_copy):
+    # A migration interrupted after its changes but before the version bump runs again
+    run_migrations(db_copy)
+    schema, counts = snapshot(db_copy)
+    conn = sqlite3.connect(db_copy, isolation_level=None)
+    try:
+        keys_before = conn.execute("SELECT name, key FROM ACCOUNT_SEQUENCES ORDER BY name").fetchall()
+        conn.execute("BEGIN")
+        for _, _, migrate in MIGRATIONS:
+            migrate(conn)
+        conn.execute("COMMIT")
+        keys = conn.execute("SELECT name, key FROM ACCOUNT_SEQUENCES ORDER BY name").fetchall()
+    finally:
+        conn.close()
+    assert snapshot(db_copy) == (schema, counts)
+    # Existing sequence keys are never replaced, or allocated values could repeat
+    assert keys == keys_before
+
+
+def test_player_ids_only_for_unique_names(db_copy):
+    run_migrations(db_copy)
+    with sqlite3.connect(db_copy) as conn:
+        wrong = conn.execute("""
+            SELECT COUNT(*) FROM Blackjack b
+            WHERE b.player_id IS NOT NULL
+              AND (SELECT COUNT(*) FROM PLAYERS p
+                   WHERE p.first_name || ' ' || p.last_name = b.player_name AND p.ID = b.player_id) != 1
+        """).fetchone()[0]
+    assert wrong == 0
@@ -0,0 +1,114 @@
+# test_net_winnings.py
+
+"""Tests for the cumulative net-winnings series and their downsampling."""
+
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from net_winnings import NET_EXPRESSIONS, SeriesCache, minmax_downsample, session_nets
+
+PLAYER_ID = 7
+
+
+@pytest.mark.parametrize("n, buckets", [(5000, 100), (1601, 800), (999, 13), (40, 20)])
+def test_downsample_keeps_each_bucket_extremes_and_endpoints(n, buckets):
+    rng = np.random.default_rng(n)
+    x = np.arange(n) * 3 + 10
+    y = np.cumsum(rng.normal(size=n))
+    plot_x, plot_y = minmax_downsample(x, y, buckets)
+    assert plot_x[0] == x[0] and plot_x[-1] == x[-1]
+    assert np.all(np.diff(plot_x) > 0)
+    # Every kept point is an original point
+    assert np.array_equal(plot_y, y[(plot_x - 10) // 3])
+    if n <= 2 * buckets:
+        assert len(plot_x) == n
+        return
+    size = -(-n // buckets)
+    for start in range(0, n, size):
+        bucket = y[start:start + size]
+        assert bucket.min() in plot_y and bucket.max() in plot_y
+    assert len(plot_x) <= 2 * buckets + 2
+
+
+def make_tables(conn):
+    conn.execute("CREATE TABLE Slots (player_id INTEGER, session_number INTEGER, bet_amount REAL, money_won REAL)")
+    conn.execute("""
+        CREATE TABLE Roulette (player_id INTEGER, session_number INTEGER, number_of_bets INTEGER,
+                               bet_amount REAL, money_won REAL)
+    """)
+
+
+def add_slots_rows(conn, session, rng, rows):
+    """Slots logs one row per spin batch with gross winnings; returns the session's net."""
+    net = 0.0
+    for _ in range(rows):
+        bet = rng.choice((1.0, 2.5, 5.0))
+        won = rng.choice((0.0, 0.0, bet * 2.2, bet * 50))
+        conn.execute("INSERT INTO Slots VALUES (?, ?, ?, ?)", (PLAYER_ID, session, bet, won))
+        net += won - bet
+    return net
+
+
+def add_roulette_spins(conn, session, rng, spins, start=(0, 0.0, 0.0)):
+    """Roulette logs a row per spin with the session's running totals; returns them."""
+    count, bet_total, net = start
+    for _ in range(spins):
+        bet = rng.choice((5.0, 10.0))
+        count += 1
+        bet_total += bet
+        net += rng.choice((-bet, -bet, bet))
+        conn.execute("INSERT INTO Roulette VALUES (?, ?, ?, ?, ?)", (PLAYER_ID, session, count, bet_total, net))
+    return count, bet_total, net
+
+
+def test_sql_session_nets_match_python_sums():
+    rng = random.Random(11)
+    conn = sqlite3.connect(":memory:")
+    make_tables(conn)
+    slots, roulette = {}, {}
+    for session in range(1, 30):
+        slots[session] = add_slots_rows(conn, session, rng, rng.randint(1, 6))
+        roulette[session] = add_roulette_spins(conn, session, rng, rng.randint(1, 12))[2]
+    # Another player's rows are not part of the series
+    conn.execute("INSERT INTO Slots VALUES (8, 1, 100.0, 0.0)")
+    conn.execute("INSERT INTO Roulette VALUES (8, 1, 1, 100.0, -100.0)")
+
+    for table, expected in (("Slots", slots), ("Roulette", roulette)):
+        sessions, nets = session_nets(conn, PLAYER_ID, table, NET_EXPRESSIONS[table])
+        assert sessions.tolist() == sorted(expected)
+        assert nets == pytest.approx([expected[session] for session in sorted(expected)])
+
+    sessions, totals = SeriesCache().series(conn, PLAYER_ID, [("Slots", NET_EXPRESSIONS["Slots"])])
+    assert totals == pytest.approx(np.cumsum([slots[session] for session in sorted(slots)]))
+
+
+def test_series_cache_refresh_equals_a_full_reload():
+    rng = random.Random(12)
+    conn = sqlite3.connect(":memory:")
+    make_tables(conn)
+    open_session = None
+    for session in range(1, 8):
+        add_slots_rows(conn, session, rng, 3)
+        open_session = add_roulette_spins(conn, session, rng, 4)
+    sources = [("Roulette", NET_EXPRESSIONS["Roulette"]), ("Slots", NET_EXPRESSIONS["Slots"])]
+    cache = SeriesCache()
+    cache.series(conn, PLAYER_ID, sources)
+
+    # The newest sessions keep playing (updated and extended rows), then new sessions start
+    conn.execute("UPDATE Slots SET money_won = money_won + 40 WHERE session_number = 7")
+    add_slots_rows(conn, 7, rng, 2)
+    add_roulette_spins(conn, 7, rng, 5, open_session)
+    add_slots_rows(conn, 8, rng, 2)
+    add_roulette_spins(conn, 8, rng, 3)
+
+    sessions, totals = cache.series(conn, PLAYER_ID, sources)
+    full_sessions, full_totals = SeriesCache().series(conn, PLAYER_ID, sources)
+    assert sessions.tolist() == full_sessions.tolist()
+    assert totals == pytest.approx(full_totals)
+    # The pending session replaces its saved points
+    pending_sessions, pending_totals = cache.series(conn, PLAYER_ID, sources, pending=(8, 25.0))
+    assert pending_sessions[-1] == 8 and pending_sessions.tolist().count(8) == 1
+    assert pending_totals[-1] == pytest.approx(full_totals[full_sessions < 8][-1] + 25.0)
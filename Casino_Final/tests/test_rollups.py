@@ -0,0 +1,35 @@
+# test_rollups.py
+
+"""Tests that the rollups kept up as rounds commit match a rebuild from the journal."""
+
+import sqlite3
+
+import pytest
+
+from migrations import run_migrations
+from rollups import hold_by_game, rebuild_rollups
+from round_journal import record_rounds
+
+
+def rollup_rows(conn):
+    return conn.execute("SELECT * FROM GAME_ROLLUPS ORDER BY grain, bucket, game").fetchall()
+
+
+def test_incremental_rollups_equal_rebuild(tmp_path):
+    path = str(tmp_path / "rollups.db")
+    run_migrations(path)
+    with sqlite3.connect(path) as conn:
+        cur = conn.cursor()
+        record_rounds(cur, "Craps", 1, "A B", 1, [(10.0, 20.0, True), (5.0, 0.0, False)])
+        record_rounds(cur, "Craps", 2, "C D", 1, [(4.0, 0.0, False)])
+        record_rounds(cur, "Craps", 1, "A B", 1, [(1.0, 0.0, False)])
+        record_rounds(cur, "HighLow", 1, "A B", 2, [(8.0, 0.0, False), (0.0, 30.0, None)])
+        incremental = rollup_rows(conn)
+        rebuild_rollups(conn)
+        assert rollup_rows(conn) == incremental
+
+        by_game = {row[1]: row for row in hold_by_game(conn, "day")}
+        assert by_game["Craps"][2:6] == (20.0, 20.0, 4, 2)
+        assert by_game["Craps"][6] == pytest.approx(0.0)
+        # The High/Low cash-out pays out but is not a decided round
+        assert by_game["HighLow"][2:6] == (8.0, 30.0, 1, 1)
@@ -0,0 +1,37 @@
+# test_running_stats.py
+
+"""Tests for the streaming and sliding-window statistics."""
+
+import random
+import statistics
+
+import pytest
+
+from running_stats import RunningStats, WindowedStats
+
+
+def test_running_stats_match_statistics_module():
+    rng = random.Random(1)
+    values = [rng.uniform(-50, 50) for _ in range(1000)]
+    stats = RunningStats()
+    for value in values:
+        stats.update(value)
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance == pytest.approx(statistics.variance(values))
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 100])
+def test_window_matches_the_last_values(size):
+    rng = random.Random(size)
+    values = []
+    stats = WindowedStats(size)
+    for step in range(600):
+        # Long runs of one value, then noise, to exercise the eviction update
+        value = 1.0 if step < 200 else rng.choice((0.0, 1.0)) if step < 400 else rng.uniform(-100, 100)
+        values.append(value)
+        stats.update(value)
+        window = values[-size:]
+        assert stats.n == len(window)
+        assert stats.mean == pytest.approx(statistics.fmean(window), abs=1e-9)
+        expected = statistics.variance(window) if len(window) > 1 else 0.0
+        assert stats.variance == pytest.approx(expected, abs=1e-7)
@@ -0,0 +1,49 @@
+# test_session.py
+
+"""Tests for the logged-in player's session context."""
+
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import update_stats
+from conftest import CASINO_DIR
+from migrations import run_migrations
+from session import load_session, refresh_session
+
+
+@pytest.fixture
+def db_copy(tmp_path):
+    path = tmp_path / "CasinoDB.db"
+    shutil.copyfile(os.path.join(CASINO_DIR, "CasinoDB.db"), path)
+    run_migrations(str(path))
+    return str(path)
+
+
+def any_player(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT ID FROM PLAYERS ORDER BY ID LIMIT 1").fetchone()[0]
+
+
+def test_refresh_follows_the_stats_update(db_copy, monkeypatch):
+    player_id = any_player(db_copy)
+    session = load_session(player_id, db_copy)
+    # A game played on the stale balance would write it back over the recomputed one
+    session.balance = -12345.0
+    monkeypatch.setattr(update_stats, "DATABASE_FILE", db_copy)
+    update_stats.update_player_stats()
+    refresh_session(session, db_copy)
+    with sqlite3.connect(db_copy) as conn:
+        assert session.balance == conn.execute("SELECT balance FROM PLAYERS WHERE ID=?", (player_id,)).fetchone()[0]
+
+
+def test_refresh_never_reuses_session_numbers(db_copy):
+    player_id = any_player(db_copy)
+    session = load_session(player_id, db_copy)
+    before = dict(session.last_sessions)
+    handed_out = session.next_session_number("Craps")
+    refresh_session(session, db_copy)
+    assert session.next_session_number("Craps") == handed_out + 1
+    assert session.last_sessions["Blackjack"] == before["Blackjack"]
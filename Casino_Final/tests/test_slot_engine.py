@@ -0,0 +1,96 @@
+# test_slot_engine.py
+
+"""Tests that the compiled slot engine pays every line as slots_math.line_pay does."""
+
+import itertools
+import random
+
+import pytest
+
+import slot_engine
+from slot_engine import SlotEngine
+from slots_math import DEFAULT_MACHINE, analyze, line_pay
+
+# Three rows, five paylines (rows, then the two diagonals), uneven strips
+MULTI_LINE = {
+    "reels": [[1, 2, 3, 1, 4, 5], [2, 2, 1, 3, 6, 7, 1], [1, 3, 3, 2, 5]],
+    "paytable": DEFAULT_MACHINE["paytable"],
+    "rows": 3,
+    "lines": [[0, 0, 0], [1, 1, 1], [2, 2, 2], [0, 1, 2], [2, 1, 0]],
+}
+
+
+def expected_spin(machine, stops):
+    """Pays every line of a spin directly from the strips with line_pay."""
+    paytable = {int(run): pays for run, pays in machine["paytable"].items()}
+    strips = machine["reels"]
+    wins = []
+    for index, rows in enumerate(machine["lines"]):
+        symbols = [strip[(stop + row) % len(strip)] for strip, stop, row in zip(strips, stops, rows)]
+        mult, run, symbol = line_pay(symbols, paytable)
+        if mult > 0:
+            wins.append((index, mult, run, symbol))
+    return sum(win[1] for win in wins) / len(machine["lines"]), wins
+
+
+def all_stops(engine):
+    return itertools.product(*(range(len(strip)) for strip in engine.strips))
+
+
+def test_evaluate_matches_line_pay_on_every_stop():
+    engine = SlotEngine(MULTI_LINE)
+    stops_list = [list(stops) for stops in all_stops(engine)]
+    for stops in stops_list:
+        total, wins = engine.evaluate(stops)
+        expected_total, expected_wins = expected_spin(MULTI_LINE, stops)
+        assert total == pytest.approx(expected_total)
+        assert wins == expected_wins
+    assert engine.evaluate_many(stops_list) == pytest.approx([engine.evaluate(stops)[0] for stops in stops_list])
+
+
+def test_spin_many_totals_match_evaluate():
+    engine = SlotEngine(MULTI_LINE)
+    stops_list, totals = engine.spin_many(500, random.Random(5))
+    assert totals == pytest.approx([expected_spin(MULTI_LINE, stops)[0] for stops in stops_list])
+
+
+def test_stats_cover_every_line():
+    engine = SlotEngine(MULTI_LINE)
+    totals = [engine.evaluate(stops)[0] for stops in all_stops(engine)]
+    rtp = sum(totals) / len(totals)
+    stats = engine.stats()
+    assert stats.rtp == pytest.approx(rtp)
+    assert stats.hit_frequency == pytest.approx(sum(1 for total in totals if total > 0) / len(totals))
+    assert stats.variance == pytest.approx(sum(total * total for total in totals) / len(totals) - rtp * rtp)
+    # A single line is the exact slots_math analysis
+    assert SlotEngine(DEFAULT_MACHINE).stats().distribution == pytest.approx(analyze(DEFAULT_MACHINE).distribution)
+
+
+def test_large_machines_are_sampled(monkeypatch):
+    exact = SlotEngine(MULTI_LINE).stats()
+    monkeypatch.setattr(slot_engine, "MAX_EXACT_SPINS", 10)
+    monkeypatch.setattr(slot_engine, "STATS_SAMPLE_SPINS", 200_000)
+    sampled = SlotEngine(MULTI_LINE).stats()
+    assert sampled.rtp == pytest.approx(exact.rtp, abs=5 * exact.std_dev / 200_000 ** 0.5)
+    assert sampled.hit_frequency == pytest.approx(exact.hit_frequency, abs=0.01)
+
+
+@pytest.mark.parametrize("change", [
+    {"lines": [[0, 3, 0]]},             # Row past the last visible row
+    {"lines": [[0, -1, 0]]},            # Negative row
+    {"lines": [[0, 1]]},                # Too few reels
+    {"lines": []},                      # No paylines
+    {"rows": 0, "lines": [[0, 0, 0]]},  # No rows
+])
+def test_invalid_paylines_are_rejected(change):
+    with pytest.raises(ValueError):
+        SlotEngine(dict(MULTI_LINE, **change))
+
+
+def test_reel_weights_must_be_whole():
+    machine = dict(DEFAULT_MACHINE, reels=[{1: 2.5, 2: 1}] * 3)
+    with pytest.raises(ValueError):
+        SlotEngine(machine)
+    # Whole weights written as floats (e.g. by JSON tools) are fine
+    engine = SlotEngine(dict(DEFAULT_MACHINE, reels=[{1: 2.0, 2: 1}] * 3))
+    assert engine.strips[0] == [1, 1, 2]
@@ -0,0 +1,56 @@
+# test_slots_math.py
+
+"""Tests for the exact slot machine calculator, checked against brute-force enumeration."""
+
+import itertools
+import math
+
+from slots_math import DEFAULT_MACHINE, analyze, line_pay, normalize_machine
+
+
+def brute_force(machine):
+    """Returns (rtp, hit frequency, variance) by enumerating every reel combination."""
+    machine = normalize_machine(machine)
+    reels = [list(reel.items()) for reel in machine["reels"]]
+    totals = [sum(reel.values()) for reel in machine["reels"]]
+    rtp = hits = second_moment = 0.0
+    for combo in itertools.product(*reels):
+        p = math.prod(weight / total for (_, weight), total in zip(combo, totals))
+        mult = line_pay([symbol for symbol, _ in combo], machine["paytable"])[0]
+        rtp += mult * p
+        second_moment += mult * mult * p
+        hits += p if mult > 0 else 0.0
+    return rtp, hits, second_moment - rtp ** 2
+
+
+def assert_matches_brute_force(machine):
+    stats = analyze(machine)
+    rtp, hits, variance = brute_force(machine)
+    assert math.isclose(stats.rtp, rtp, rel_tol=1e-12)
+    assert math.isclose(stats.hit_frequency, hits, rel_tol=1e-12)
+    assert math.isclose(stats.variance, variance, rel_tol=1e-9)
+    assert math.isclose(sum(stats.distribution.values()), 1.0, rel_tol=1e-12)
+
+
+def test_default_machine():
+    assert_matches_brute_force(DEFAULT_MACHINE)
+
+
+def test_weighted_five_reel_machine():
+    machine = {
+        "reels": [{1: 3, 2: 5, 3: 7, 4: 1}, {1: 2, 2: 2, 3: 9}, {1: 4, 2: 1, 3: 1, 4: 6},
+                  {1: 1, 2: 8, 4: 3}, {1: 5, 3: 5, 4: 2}],
+        "paytable": {2: {1: 1.5, 2: 1.2}, 3: {1: 5.0, 3: 3.0, 4: 4.0}, 4: {2: 20.0}, 5: {1: 100.0}}
+    }
+    assert_matches_brute_force(machine)
+
+
+def test_reel_strips_count_repeats_as_weight():
+    strips = {"reels": [[1, 1, 2], [1, 2, 2], [1, 2]], "paytable": DEFAULT_MACHINE["paytable"]}
+    weights = {"reels": [{1: 2, 2: 1}, {1: 1, 2: 2}, {1: 1, 2: 1}], "paytable": DEFAULT_MACHINE["paytable"]}
+    assert math.isclose(analyze(strips).rtp, analyze(weights).rtp)
+    assert_matches_brute_force(strips)
+
+
+def test_exact_mode_agrees_with_floats():
+    assert math.isclose(analyze(DEFAULT_MACHINE, exact=True).rtp, analyze(DEFAULT_MACHINE).rtp, rel_tol=1e-12)
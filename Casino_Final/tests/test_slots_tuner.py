@@ -0,0 +1,42 @@
+# test_slots_tuner.py
+
+"""Tests for the slot reel-weight tuner's starting point and scoring."""
+
+import argparse
+import random
+
+import pytest
+
+from slots_math import DEFAULT_MACHINE, analyze, normalize_machine
+from slots_tuner import positive_float, score, search, start_weights
+
+
+def test_integer_weights_are_kept():
+    reel = {1: 12, 2: 3, 3: 40, 4: 55}
+    assert start_weights(reel, random.Random(0), 0) == reel
+
+
+def test_coarse_weights_are_scaled_in_proportion():
+    assert start_weights({1: 1, 2: 1}, random.Random(0), 0) == {1: 10, 2: 10}
+    assert start_weights({1: 1, 2: 2}, random.Random(0), 0) == {1: 5, 2: 10}
+    assert start_weights({1: 0.5, 2: 2.5}, random.Random(0), 0) == {1: 2, 2: 10}
+
+
+def test_on_target_machine_is_returned_unchanged():
+    machine = normalize_machine({
+        "reels": [{1: 12, 2: 9, 3: 10, 4: 10, 5: 11, 6: 10, 7: 8} for _ in range(3)],
+        "paytable": DEFAULT_MACHINE["paytable"],
+    })
+    stats = analyze(machine)
+    target = {"rtp": stats.rtp, "rtp_tol": 0.001, "std_min": stats.std_dev - 0.1, "std_max": stats.std_dev + 0.1}
+    assert score(stats, target) == 0.0
+    best_score, best, _ = search((machine, target, 0, 50, False, 0))
+    assert best_score == 0.0
+    assert best["reels"] == machine["reels"]
+
+
+def test_tolerance_must_be_positive():
+    assert positive_float("0.01") == 0.01
+    for text in ("0", "-0.5", "nan"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            positive_float(text)
@@ -61,9 +61,9 @@ def update_player_stats():
                         SUM(CASE WHEN money_won > 0 THEN money_won ELSE 0 END),
                         SUM(CASE WHEN money_won < 0 THEN -money_won ELSE 0 END)
                     FROM {table}
-                    WHERE player_name = ?
+                    WHERE player_id = ?
                 """
-                cursor.execute(query, (full_name,))
+                cursor.execute(query, (player_id,))
                 game_stats = cursor.fetchone()
 
                 if game_stats:
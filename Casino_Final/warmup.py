@@ -0,0 +1,102 @@
+# warmup.py
+
+"""
+Background warm-up after login.
+
+While the player is on the deposit screen, a worker on the global thread pool
+prepares what the first game click would otherwise pay for on the GUI thread:
+
+  * opens the database once, switching it to WAL so game windows can read
+    while another one writes;
+  * ranks the games by the player's session counters (loaded at login with
+    their PlayerSession) and imports the most played ones through
+    game_registry, which builds their lookup tables at import time
+    (craps_bets resolution tables, ...);
+  * compiles the slot machine and the cheat detector's binomial thresholds.
+
+Game images are decoded by asset_cache's own preload worker, started here too.
+Everything the worker builds lives in module-level caches the games already
+use, so nothing has to be handed over. The player's profile and balance come
+with the PlayerSession loaded at login.
+"""
+
+import sqlite3
+from PyQt6.QtCore import QRunnable, QThreadPool
+# Import the shared image cache, whose preload decodes game assets off the GUI thread
+from asset_cache import asset_cache
+# Import the lazy game registry and its game table names
+from game_registry import GAMES, game_class
+
+# Define the database path
+DB_PATH = "CasinoDB.db"
+# How many of the player's most played games are imported ahead of time
+PRELOAD_GAMES = 3
+# Game table of each registry key
+GAME_TABLES = {
+    "roulette": "Roulette", "craps": "Craps", "blackjack": "Blackjack",
+    "highlow": "HighLow", "slots": "Slots", "poker": "Poker",
+}
+
+# The running warm-up, kept referenced after the login window closes
+_current = None
+
+
+def most_played_games(session):
+    """
+    Returns the registry keys of the games a player has sessions in, most played
+    first, ranked by the session counters loaded at login.
+    """
+    counts = [(session.last_sessions.get(table, 0), key) for key, table in GAME_TABLES.items()]
+    return [key for count, key in sorted(counts, reverse=True) if count]
+
+
+def prepare_game(key):
+    """Imports a game module and builds the tables its window needs on open."""
+    game_class(key)
+    if key == "slots":
+        # Compile the machine, its stats across every payline and its hit-frequency thresholds
+        from slot_engine import load_engine
+        from cheat_detector import win_thresholds
+        _, engine = load_engine()
+        win_thresholds(engine.stats().hit_frequency)
+
+
+class _WarmupTask(QRunnable):
+    """Worker that opens the database and imports the player's favourite games."""
+    def __init__(self, session, db_path):
+        super().__init__()
+        self.session = session
+        self.db_path = db_path
+
+    def run(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                # Readers no longer wait on a writer, which matters once several game windows are open
+                conn.execute("PRAGMA journal_mode=WAL")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Warm-up could not configure the database: {e}")
+        favourites = most_played_games(self.session)
+
+        # Every game's cheat detector thresholds (cached for the whole run)
+        from cheat_detector import GAME_WIN_PROBABILITY, win_thresholds
+        for probability in GAME_WIN_PROBABILITY.values():
+            win_thresholds(probability)
+
+        # New players have no history yet, so warm the games in menu order
+        for key in (favourites or list(GAMES))[:PRELOAD_GAMES]:
+            try:
+                prepare_game(key)
+            except Exception as e:
+                print(f"Warm-up could not prepare {key}: {e}")
+
+
+def start_warmup(session, db_path=DB_PATH):
+    """Starts the warm-up for a player who just logged in. Returns the task."""
+    global _current
+    asset_cache().preload()
+    _current = _WarmupTask(session, db_path)
+    QThreadPool.globalInstance().start(_current)
+    return _current